@@ -0,0 +1,219 @@
+# benchmarks/pages.py
+# ---------------------------------------------------------
+# Latence des pages Streamlit, mesurée sans navigateur :
+# - chaque page est pilotée par un scénario d'interactions
+#   (saisies, « Lancer la simulation », curseurs, sections ouvertes)
+#   à l'aide de streamlit.testing.v1.AppTest
+# - durée de chaque réexécution du script (premier passage, caches
+#   vides, puis meilleur temps sur plusieurs passages)
+# - pic de mémoire allouée pendant chaque réexécution (tracemalloc,
+#   mesuré lors d'un passage séparé pour ne pas fausser les durées)
+#
+# AppTest réexécute toujours le script entier : les sections en
+# fragments sont mesurées comme lors d'un chargement complet de page.
+#
+# Usage (depuis la racine du projet) :
+#   python -m benchmarks.pages                    # rapport par page, comparé à la référence
+#   python -m benchmarks.pages -p simulation -o pages.json
+#   python -m benchmarks.pages --update-baseline
+#
+# Les résultats ont le format de benchmarks/suite.py (cas nommés
+# « page.étape ») et se comparent de la même façon.
+# ---------------------------------------------------------
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.suite import CONFIRM, REGRESSION_THRESHOLD, ROOT, confirm, load_json, metadata, save_json
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages_baseline.json")
+REPEAT = 3                    # passages complets de chaque scénario
+TIMEOUT = 300                 # durée maximale d'une réexécution, en secondes
+
+
+def _button(label: str):
+    """Clic sur le bouton `label`, puis réexécution."""
+    return lambda at: next(button for button in at.button if button.label == label).click().run()
+
+
+def _set(kind: str, key: str, value):
+    """Nouvelle valeur du widget `key` (number_input, slider...), puis réexécution."""
+    return lambda at: getattr(at, kind)(key=key).set_value(value).run()
+
+
+def _open(section: str):
+    """Ouverture d'une section repliée de la page Scénarios, puis réexécution."""
+    def action(at):
+        at.session_state[section] = True
+        return at.run()
+    return action
+
+
+def _rerun(at):
+    return at.run()
+
+
+LAUNCH = "Lancer la simulation"
+
+# Scénarios : page -> (fichier, [(étape, libellé, action sur l'AppTest)])
+PAGES = {
+    "simulation": ("1_Simulation.py", [
+        ("load", "Premier affichage", _rerun),
+        ("launch", LAUNCH, _button(LAUNCH)),
+        ("pmt", "Versement modifié puis relance", lambda at: _button(LAUNCH)(_set("number_input", "form_pmt", 75_000)(at))),
+        ("mode", "Mode « Versement Mensuel » (réaffichage)", _set("radio", "calculation_mode", "Versement Mensuel")),
+        ("fees", "Structure de frais « Fonds diversifié »", _set("selectbox", "fee_structure", "Fonds diversifié")),
+        ("fees_launch", "Relance avec frais", _button(LAUNCH)),
+        ("taxes", "Calcul après impôts puis relance", lambda at: _button(LAUNCH)(_set("checkbox", "apply_taxes", True)(at))),
+    ]),
+    "scenarios": ("2_Scénarios_Projections.py", [
+        ("load", "Premier affichage", _rerun),
+        ("rate", "Rendement modifié", _set("number_input", "proj_rate", 7.0)),
+        ("rate_section", "Section sensibilité aux taux", _open("section_rate")),
+        ("rate_slider", "Curseur « Écart de taux »", _set("slider", "rate_range_slider", 3.0)),
+        ("withdrawal", "Section retraits", _open("section_withdrawal")),
+        ("stochastic", "Rendements aléatoires", _set("toggle", "withdrawal_stochastic", True)),
+        ("volatility", "Curseur « Volatilité »", _set("slider", "withdrawal_volatility", 15.0)),
+        ("inflation", "Section inflation", _open("section_inflation")),
+        ("inflation_slider", "Curseur « Inflation »", _set("slider", "inflation_rate", 4.0)),
+        ("taxes", "Section fiscalité", _open("section_taxes")),
+        ("taxes_slider", "Curseur « Part en revenus courants »", _set("slider", "tax_income_share", 100.0)),
+        ("glide_path", "Section cycle de vie", _open("section_glide_path")),
+        ("glide_slider", "Curseur « Part actions au départ »", _set("slider", "glide_start_weight", 60.0)),
+    ]),
+}
+
+
+def run_scenario(page: str, trace_memory: bool = False) -> list:
+    """
+    Un passage complet du scénario de `page`, sur une nouvelle session.
+
+    Returns:
+        list: Par étape, la durée de la réexécution (secondes) ou, avec
+            `trace_memory`, le pic de mémoire allouée (octets)
+
+    Raises:
+        RuntimeError: Si une réexécution lève une exception
+    """
+    filename, steps = PAGES[page]
+    at = AppTest.from_file(os.path.join(ROOT, "pages", filename), default_timeout=TIMEOUT)
+    measures = []
+    for step, _, action in steps:
+        if trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        at = action(at)
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{page}.{step} : {at.exception[0].message}")
+        measures.append(tracemalloc.get_traced_memory()[1] if trace_memory else elapsed)
+    return measures
+
+
+def run(pages, repeat: int = REPEAT) -> dict:
+    """
+    Mesure les scénarios de `pages`.
+
+    Le premier passage part de caches vides (temps « first ») ; le
+    meilleur temps et la médiane portent sur les `repeat` passages. Un
+    dernier passage, sous tracemalloc, donne les pics de mémoire.
+
+    Returns:
+        dict: {"metadata": {...}, "benchmarks": {"page.étape": {"best",
+            "median", "first", "peak_memory", "repeat"}}}
+    """
+    results = {}
+    for page in pages:
+        runs = [run_scenario(page) for _ in range(repeat)]
+        tracemalloc.start()
+        try:
+            peaks = run_scenario(page, trace_memory=True)
+        finally:
+            tracemalloc.stop()
+        for index, (step, _, _) in enumerate(PAGES[page][1]):
+            times = [measures[index] for measures in runs]
+            results[f"{page}.{step}"] = {
+                "best": min(times),
+                "median": statistics.median(times),
+                "first": times[0],
+                "peak_memory": peaks[index],
+                "repeat": repeat,
+            }
+    return {"metadata": metadata(), "benchmarks": results}
+
+
+def format_report(results: dict, rows: list, threshold: float) -> str:
+    """Rapport texte par page : durées (ms), pic de mémoire (Mo), écart à la référence."""
+    comparison = {row[0]: row for row in rows}
+    lines = []
+    for page, (filename, steps) in PAGES.items():
+        names = [f"{page}.{step}" for step, _, _ in steps if f"{page}.{step}" in results["benchmarks"]]
+        if not names:
+            continue
+        width = max(len(label) for _, label, _ in steps)
+        lines.append(f"\n{filename}")
+        lines.append(f"  {'Étape':<{width}}  {'1er passage':>11}  {'Meilleur':>10}  {'Mémoire':>9}  {'Écart':>8}")
+        total = 0.0
+        for step, label, _ in steps:
+            name = f"{page}.{step}"
+            if name not in results["benchmarks"]:
+                continue
+            result = results["benchmarks"][name]
+            _, _, _, change, regression = comparison[name]
+            total += result["best"]
+            change_text = f"{change:+7.1f}%" if change is not None else f"{'-':>8}"
+            flag = "  << régression" if regression else ""
+            lines.append(
+                f"  {label:<{width}}  {result['first'] * 1e3:9.0f}ms  {result['best'] * 1e3:8.0f}ms"
+                f"  {result['peak_memory'] / 2 ** 20:7.1f}Mo  {change_text}{flag}"
+            )
+        lines.append(f"  {'Total':<{width}}  {'':>11}  {total * 1e3:8.0f}ms")
+    regressions = sum(row[4] for row in rows)
+    lines.append(f"\n{regressions} régression(s) au-delà de {threshold:g} %")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Mesure les pages, écrit les résultats et échoue (code 1) en cas de régression."""
+    parser = argparse.ArgumentParser(description="Latence des réexécutions des pages Streamlit.")
+    parser.add_argument("-p", "--page", action="append", choices=list(PAGES),
+                        help="Page à mesurer (option répétable ; par défaut : toutes)")
+    parser.add_argument("-o", "--output", help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Ralentissement toléré en %% (par défaut : {REGRESSION_THRESHOLD:g})")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Passages par scénario (par défaut : {REPEAT})")
+    parser.add_argument("--confirm", type=int, default=CONFIRM,
+                        help=f"Nouveaux passages d'une page en régression (par défaut : {CONFIRM})")
+    parser.add_argument("--update-baseline", action="store_true", help="Remplace la référence par cette mesure")
+    args = parser.parse_args(argv)
+
+    # AppTest exécute les pages hors serveur : avertissements sans objet
+    logging.disable(logging.WARNING)
+    results = run(args.page or list(PAGES), args.repeat)
+    if args.update_baseline:
+        previous = (load_json(args.baseline) or {}).get("benchmarks", {})
+        save_json({"metadata": results["metadata"], "benchmarks": {**previous, **results["benchmarks"]}}, args.baseline)
+        if args.output:
+            save_json(results, args.output)
+        print(f"Référence mise à jour : {args.baseline} ({len(results['benchmarks'])} étapes)")
+        return 0
+
+    # Les étapes dépendant des précédentes, c'est le scénario entier d'une page suspecte qui est rejoué
+    rows = confirm(results, load_json(args.baseline), args.threshold, args.confirm,
+                   lambda names: run(sorted({name.split(".")[0] for name in names}), args.repeat))
+    if args.output:
+        save_json(results, args.output)
+    print(format_report(results, rows, args.threshold))
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,566 @@
+# benchmarks/suite.py
+# ---------------------------------------------------------
+# Banc de mesures des chemins critiques de l'application :
+# - solveurs (FV, PMT, PV, horizon) de l'application, périodiques
+#   (fréquences, frais) et vectorisés
+# - échéanciers de 1 à 100 ans (placement simple, avec frais et impôts)
+# - préparation des données du graphique de simulation
+# - génération du rapport PDF
+# - fonctions de calcul de la page Scénarios
+#
+# Chaque cas est chronométré à la manière de `timeit` : REPEAT séries
+# de n appels, n étant calibré pour qu'une série dure au moins
+# MIN_SERIES_TIME secondes ; on retient le meilleur temps par appel
+# (comparaisons) et la médiane (dispersion). Les résultats sont écrits
+# en JSON et comparés à une référence (benchmarks/baseline.json) : la
+# commande échoue si un cas est plus lent que la référence au-delà du
+# seuil de tolérance (en %). Les cas « charts » relèvent aussi la taille
+# de chaque graphique envoyé au navigateur (rapportée, sans seuil).
+#
+# Usage (depuis la racine du projet) :
+#   python -m benchmarks.suite                    # mesure et compare à la référence
+#   python -m benchmarks.suite -o results.json    # écrit aussi les résultats
+#   python -m benchmarks.suite -k schedule        # seulement les cas contenant « schedule »
+#   python -m benchmarks.suite --update-baseline  # remplace la référence
+#
+# Les temps dépendent de la machine : la référence doit être produite
+# sur la machine qui exécute les comparaisons.
+# ---------------------------------------------------------
+
+import argparse
+import gc
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache, partial
+
+import numpy as np
+
+# Hors serveur Streamlit, les caches et appels d'affichage fonctionnent en
+# mode dégradé : on masque les avertissements correspondants
+logging.disable(logging.WARNING)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.config import (  # noqa: E402
+    DEFAULT_INITIAL_CAPITAL,
+    DEFAULT_MONTHLY_PAYMENT,
+    DEFAULT_TARGET_AMOUNT,
+    DEFAULT_ANNUAL_RATE,
+    DEFAULT_HORIZON_YEARS,
+    FEE_STRUCTURES,
+    HEATMAP_GRID_SIZE,
+)
+from core.calculations import (  # noqa: E402
+    calculate_fv,
+    calculate_pmt,
+    calculate_pv,
+    calculate_n_years,
+    calculate_fv_periodic,
+    calculate_pmt_periodic,
+    calculate_pv_periodic,
+    calculate_n_years_periodic,
+    calculate_fv_batch,
+    calculate_pmt_batch,
+    calculate_pv_batch,
+    calculate_n_years_batch,
+    solve_all,
+)
+from core.fees import (  # noqa: E402
+    calculate_fv_with_fees,
+    calculate_pmt_with_fees,
+    calculate_pv_with_fees,
+    calculate_n_years_with_fees,
+    compare_fee_structures,
+)
+from core.taxes import country_taxes, compare_countries  # noqa: E402
+from core.schedule import build_schedule, yearly_breakdown  # noqa: E402
+from core.results import SimulationResult  # noqa: E402
+from core.stochastic import simulate_withdrawal_paths, ruin_statistics  # noqa: E402
+from core.export import create_pdf_report  # noqa: E402
+from ui.charts import create_simulation_chart  # noqa: E402
+from streamlit import logger as streamlit_logger  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+REGRESSION_THRESHOLD = 25.0   # ralentissement toléré par rapport à la référence, en %
+REPEAT = 7                    # nombre de séries par cas
+CONFIRM = 2                   # nouvelles mesures d'un cas en régression avant d'échouer
+MIN_SERIES_TIME = 0.2         # durée minimale d'une série, en secondes
+
+# Paramètres des cas (valeurs par défaut de l'application)
+PV, PMT, FV = DEFAULT_INITIAL_CAPITAL, DEFAULT_MONTHLY_PAYMENT, DEFAULT_TARGET_AMOUNT
+RATE, N_YEARS = DEFAULT_ANNUAL_RATE, DEFAULT_HORIZON_YEARS
+FEES = FEE_STRUCTURES["Fonds diversifié"]
+TAX_COUNTRY = "Sénégal"
+SCHEDULE_HORIZONS = (1, 10, 30, 100)
+SOLVE_ALL_SIZE = 100_000
+
+# Cas enregistrés : nom -> fonction de préparation retournant l'appel à chronométrer
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Enregistre une fonction de préparation (hors chronométrage) sous `name`."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ---------------------------------------------------------
+# Solveurs
+# ---------------------------------------------------------
+
+# Solveurs de l'application (st.cache_data) : calcul complet, cache vidé à
+# chaque appel, et lecture du cache (coût d'un appel répété à l'identique)
+SCALAR_SOLVERS = {
+    "fv": (calculate_fv, (PV, PMT, RATE, N_YEARS)),
+    "pmt": (calculate_pmt, (FV, PV, RATE, N_YEARS)),
+    "pv": (calculate_pv, (FV, PMT, RATE, N_YEARS)),
+    "n_years": (calculate_n_years, (FV, PV, PMT, RATE)),
+}
+
+
+def _uncached(solver, args):
+    def call():
+        solver.clear()
+        return solver(*args)
+    return call
+
+
+for _name, (_solver, _args) in SCALAR_SOLVERS.items():
+    BENCHMARKS[f"solvers.scalar.{_name}"] = partial(_uncached, _solver, _args)
+    BENCHMARKS[f"solvers.scalar.{_name}.cached"] = partial(partial, _solver, *_args)
+
+
+@benchmark("solvers.periodic.fv")
+def _fv_periodic():
+    return partial(calculate_fv_periodic, PV, PMT, RATE, N_YEARS)
+
+
+@benchmark("solvers.periodic.pmt")
+def _pmt_periodic():
+    return partial(calculate_pmt_periodic, FV, PV, RATE, N_YEARS)
+
+
+@benchmark("solvers.periodic.pv")
+def _pv_periodic():
+    return partial(calculate_pv_periodic, FV, PMT, RATE, N_YEARS)
+
+
+@benchmark("solvers.periodic.n_years")
+def _n_years_periodic():
+    return partial(calculate_n_years_periodic, FV, PV, PMT, RATE)
+
+
+@benchmark("solvers.periodic.fees")
+def _fees_scalar():
+    # Les quatre solveurs nets de frais, tels qu'appelés par la page Simulation
+    def solve():
+        calculate_fv_with_fees(PV, PMT, RATE, N_YEARS, FEES)
+        calculate_pmt_with_fees(FV, PV, RATE, N_YEARS, FEES)
+        calculate_pv_with_fees(FV, PMT, RATE, N_YEARS, FEES)
+        calculate_n_years_with_fees(FV, PV, PMT, RATE, FEES)
+    return solve
+
+
+def _grid():
+    """Grille taux × versements des cartes de sensibilité."""
+    rates = np.linspace(0, 15, HEATMAP_GRID_SIZE)[None, :]
+    pmts = np.linspace(0, 4 * PMT, HEATMAP_GRID_SIZE)[:, None]
+    return rates, pmts
+
+
+@benchmark("solvers.batch.fv")
+def _fv_batch():
+    rates, pmts = _grid()
+    return partial(calculate_fv_batch, PV, pmts, rates, N_YEARS)
+
+
+@benchmark("solvers.batch.pmt")
+def _pmt_batch():
+    rates, pmts = _grid()
+    return partial(calculate_pmt_batch, FV + pmts, PV, rates, N_YEARS)
+
+
+@benchmark("solvers.batch.pv")
+def _pv_batch():
+    rates, pmts = _grid()
+    return partial(calculate_pv_batch, FV, pmts, rates, N_YEARS)
+
+
+@benchmark("solvers.batch.n_years")
+def _n_years_batch():
+    rates, pmts = _grid()
+    return partial(calculate_n_years_batch, FV, PV, pmts, rates)
+
+
+@benchmark("solvers.solve_all")
+def _solve_all():
+    # Simulations de modes mélangés (une inconnue, marquée np.nan, par simulation)
+    mode = np.arange(SOLVE_ALL_SIZE) % 4
+    values = [np.where(mode == index, np.nan, value) for index, value in enumerate((FV, PV, PMT, N_YEARS))]
+    return partial(solve_all, values[0], values[1], values[2], RATE, values[3])
+
+
+# ---------------------------------------------------------
+# Échéanciers
+# ---------------------------------------------------------
+
+SCHEDULE_OPTIONS = {
+    "plain": {},
+    "fees": {"fees": FEES},
+    "taxes": {"fees": FEES, "taxes": country_taxes(TAX_COUNTRY)},
+    "events": {"events": {24: 1_000_000, 60: -500_000}, "pauses": [(13, 6)]},
+}
+
+for _years in SCHEDULE_HORIZONS:
+    for _option, _kwargs in SCHEDULE_OPTIONS.items():
+        BENCHMARKS[f"schedule.{_option}.{_years}y"] = partial(
+            lambda years, kwargs: partial(build_schedule, PV, PMT, RATE, years, **kwargs), _years, _kwargs
+        )
+    BENCHMARKS[f"schedule.yearly.{_years}y"] = partial(
+        lambda years: partial(yearly_breakdown, PV, PMT, RATE, years, fees=FEES), _years
+    )
+
+
+# ---------------------------------------------------------
+# Graphiques et rapport
+# ---------------------------------------------------------
+
+def _result(**options) -> SimulationResult:
+    """Nouveau résultat (échéancier non encore calculé)."""
+    return SimulationResult(PV, PMT, float(calculate_fv_periodic(PV, PMT, RATE, N_YEARS)), RATE, N_YEARS,
+                            calculation_mode="Montant Final", **options)
+
+
+@benchmark("charts.simulation")
+def _simulation_chart():
+    # Échéancier inclus : un nouveau résultat à chaque appel
+    return lambda: create_simulation_chart(_result(), fv_target=FV)
+
+
+@benchmark("charts.simulation.taxes")
+def _simulation_chart_taxes():
+    taxes = country_taxes(TAX_COUNTRY)
+    return lambda: create_simulation_chart(_result(fees=FEES, taxes=taxes, tax_country=TAX_COUNTRY), fv_target=FV)
+
+
+class _PayloadRecorder(logging.Handler):
+    """Relève les tailles journalisées par ui/charts (nom du graphique, octets)."""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.sizes = {}
+
+    def emit(self, record):
+        name, size = record.args
+        self.sizes[name] = size
+
+
+def chart_payloads(names) -> dict:
+    """
+    Taille de la spécification (données incluses) de chaque graphique
+    produit par les cas `names`, journalisée au niveau INFO par ui/charts.
+
+    Returns:
+        dict: {"cas.graphique": octets}
+    """
+    chart_logger = logging.getLogger("ui.charts")
+    recorder = _PayloadRecorder()
+    level = chart_logger.level
+    chart_logger.addHandler(recorder)
+    chart_logger.setLevel(logging.INFO)
+    chart_logger.propagate = False
+    payloads = {}
+    try:
+        for name in names:
+            # Premier appel sous logging.disable (loggers Streamlit créés), puis
+            # appel mesuré : Streamlit réduit aux erreurs, INFO de ui/charts relevé
+            BENCHMARKS[name]()()
+            streamlit_logger.set_log_level("error")
+            logging.disable(logging.NOTSET)
+            recorder.sizes.clear()
+            try:
+                BENCHMARKS[name]()()
+            finally:
+                logging.disable(logging.WARNING)
+            payloads.update({f"{name}.{chart}": size for chart, size in recorder.sizes.items()})
+    finally:
+        chart_logger.propagate = True
+        chart_logger.setLevel(level)
+        chart_logger.removeHandler(recorder)
+    return payloads
+
+
+@benchmark("report.pdf")
+def _pdf_report():
+    info = {"date": "01/01/2025", "interlocuteur": "Conseiller", "client_name": "Client", "country": TAX_COUNTRY}
+    return lambda: create_pdf_report(_result(fees=FEES), "Montant Final", info)
+
+
+# ---------------------------------------------------------
+# Page Scénarios
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def scenarios_page():
+    """Module de la page Scénarios (nom de fichier non importable directement)."""
+    path = os.path.join(ROOT, "pages", "2_Scénarios_Projections.py")
+    spec = importlib.util.spec_from_file_location("scenarios_page", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@benchmark("scenarios.series")
+def _series():
+    return partial(scenarios_page().simulate_series, PV, PMT, RATE, [5, 10, 15, 20])
+
+
+@benchmark("scenarios.rate_sensitivity")
+def _rate_sensitivity():
+    return partial(scenarios_page().simulate_rate_sensitivity, PV, PMT, N_YEARS, np.round(np.linspace(0, 15, 300), 2))
+
+
+@benchmark("scenarios.pmt_sensitivity")
+def _pmt_sensitivity():
+    return partial(scenarios_page().simulate_pmt_sensitivity, PV, RATE, N_YEARS,
+                   [25_000, 50_000, 75_000, 100_000, 150_000, 200_000])
+
+
+@benchmark("scenarios.withdrawal")
+def _withdrawal():
+    return partial(scenarios_page().simulate_withdrawal_scenario, PV, PMT, RATE, 20, 150_000, 25)
+
+
+@benchmark("scenarios.withdrawal_paths")
+def _withdrawal_paths():
+    return lambda: ruin_statistics(simulate_withdrawal_paths(PV, PMT, RATE, 10.0, 20, 150_000, 25))
+
+
+@benchmark("scenarios.inflation")
+def _inflation():
+    return partial(scenarios_page().simulate_inflation_impact, PV, PMT, RATE, 30, 3.0, True)
+
+
+@benchmark("scenarios.fee_structures")
+def _fee_structures():
+    return partial(compare_fee_structures, PV, PMT, RATE, N_YEARS, FEE_STRUCTURES)
+
+
+@benchmark("scenarios.countries")
+def _countries():
+    return partial(compare_countries, PV, PMT, RATE, N_YEARS)
+
+
+# ---------------------------------------------------------
+# Mesure, comparaison, rapport
+# ---------------------------------------------------------
+
+def _series_time(func, number: int) -> float:
+    """Durée totale de `number` appels de `func` (ramasse-miettes suspendu, comme `timeit`)."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def time_call(func, repeat: int = REPEAT, min_time: float = MIN_SERIES_TIME) -> dict:
+    """
+    Chronomètre `func` (sans argument).
+
+    Un premier appel (imports, caches) n'est pas
+    compté ; le nombre d'appels par série est ensuite calibré pour que
+    chaque série dure au moins `min_time` secondes.
+
+    Returns:
+        dict: "best" et "median" (secondes par appel), "number" (appels
+            par série), "repeat" (nombre de séries)
+    """
+    func()
+    number = 1
+    elapsed = _series_time(func, number)
+    while elapsed < min_time:
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+        elapsed = _series_time(func, number)
+
+    times = [elapsed / number] + [_series_time(func, number) / number for _ in range(repeat - 1)]
+    return {"best": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def run(names=None, repeat: int = REPEAT, min_time: float = MIN_SERIES_TIME) -> dict:
+    """
+    Exécute les cas demandés (tous par défaut).
+
+    Returns:
+        dict: {"metadata": {...}, "benchmarks": {nom: résultat de `time_call`}}
+    """
+    results = {}
+    for name in names if names is not None else BENCHMARKS:
+        results[name] = time_call(BENCHMARKS[name](), repeat, min_time)
+    return {"metadata": metadata(), "benchmarks": results}
+
+
+def metadata() -> dict:
+    """Environnement de la mesure (à comparer avant d'interpréter un écart)."""
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Compare des résultats à une référence (même format que `run`).
+
+    Seuls les cas présents des deux côtés sont comparés, sur le meilleur
+    temps par appel.
+
+    Returns:
+        list: Une ligne par cas : (nom, référence, mesure, écart en %,
+            régression ?) ; référence et écart valent None hors référence
+    """
+    reference = baseline.get("benchmarks", {}) if baseline else {}
+    rows = []
+    for name, result in results["benchmarks"].items():
+        if name not in reference:
+            rows.append((name, None, result["best"], None, False))
+            continue
+        change = (result["best"] / reference[name]["best"] - 1) * 100
+        rows.append((name, reference[name]["best"], result["best"], change, change > threshold))
+    return rows
+
+
+def confirm(results: dict, baseline: dict, threshold: float, rounds: int, measure) -> list:
+    """
+    Mesure à nouveau les cas en régression avant de conclure.
+
+    Sur une machine chargée (fréquence variable, autres processus), un
+    écart n'est retenu que s'il se reproduit : chaque cas suspect garde
+    son meilleur résultat sur toutes les mesures.
+
+    Args:
+        results: Résultats de `run`, mis à jour en place
+        baseline: Référence
+        threshold: Ralentissement toléré en %
+        rounds: Nombre maximal de nouvelles mesures
+        measure: Fonction (liste de noms) -> résultats au format de `run`
+
+    Returns:
+        list: Comparaison finale (voir `compare`)
+    """
+    rows = compare(results, baseline, threshold)
+    for _ in range(rounds):
+        suspects = [row[0] for row in rows if row[4]]
+        if not suspects:
+            break
+        for name, result in measure(suspects)["benchmarks"].items():
+            if name in results["benchmarks"] and result["best"] < results["benchmarks"][name]["best"]:
+                results["benchmarks"][name] = result
+        rows = compare(results, baseline, threshold)
+    return rows
+
+
+def format_report(rows: list, threshold: float, payloads: dict = None, reference_payloads: dict = None) -> str:
+    """
+    Tableau texte de la comparaison (temps en millisecondes), suivi le cas
+    échéant de la taille des graphiques (Ko) et de celle de la référence.
+    """
+    width = max([len(row[0]) for row in rows] + [len(name) for name in payloads or ()] + [4])
+    lines = [f"{'Cas':<{width}}  {'Référence':>12}  {'Mesure':>12}  {'Écart':>8}"]
+    for name, reference, best, change, regression in rows:
+        reference_text = f"{reference * 1e3:10.3f}ms" if reference is not None else f"{'-':>12}"
+        change_text = f"{change:+7.1f}%" if change is not None else f"{'-':>8}"
+        flag = "  << régression" if regression else ""
+        lines.append(f"{name:<{width}}  {reference_text}  {best * 1e3:10.3f}ms  {change_text}{flag}")
+    regressions = sum(row[4] for row in rows)
+    lines.append(f"{regressions} régression(s) au-delà de {threshold:g} %")
+    if payloads:
+        reference_payloads = reference_payloads or {}
+        lines.append("\nTaille des graphiques envoyés au navigateur")
+        for name, size in payloads.items():
+            reference = reference_payloads.get(name)
+            reference_text = f"{reference / 1024:10.1f}Ko" if reference is not None else f"{'-':>12}"
+            lines.append(f"{name:<{width}}  {reference_text}  {size / 1024:10.1f}Ko")
+    return "\n".join(lines)
+
+
+def load_json(path: str) -> dict:
+    """Lit un fichier de résultats ; None s'il n'existe pas."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_json(results: dict, path: str) -> None:
+    """Écrit des résultats au format JSON."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+        file.write("\n")
+
+
+def main(argv=None) -> int:
+    """Mesure les cas, écrit les résultats et échoue (code 1) en cas de régression."""
+    parser = argparse.ArgumentParser(description="Banc de mesures des calculs, graphiques et rapports.")
+    parser.add_argument("-o", "--output", help="Fichier JSON des résultats")
+    parser.add_argument("-k", "--filter", default="", help="Seulement les cas dont le nom contient ce texte")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Ralentissement toléré en %% (par défaut : {REGRESSION_THRESHOLD:g})")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Séries par cas (par défaut : {REPEAT})")
+    parser.add_argument("--confirm", type=int, default=CONFIRM,
+                        help=f"Nouvelles mesures d'un cas en régression (par défaut : {CONFIRM})")
+    parser.add_argument("--update-baseline", action="store_true", help="Remplace la référence par cette mesure")
+    parser.add_argument("--list", action="store_true", help="Liste les cas sans les exécuter")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = run(names, args.repeat)
+    charts = [name for name in names if name.startswith("charts.")]
+    if charts:
+        results["payloads"] = chart_payloads(charts)
+    if args.update_baseline:
+        previous = load_json(args.baseline) or {}
+        baseline = {"metadata": results["metadata"],
+                    "benchmarks": {**previous.get("benchmarks", {}), **results["benchmarks"]}}
+        if charts or "payloads" in previous:
+            baseline["payloads"] = {**previous.get("payloads", {}), **results.get("payloads", {})}
+        save_json(baseline, args.baseline)
+        if args.output:
+            save_json(results, args.output)
+        print(f"Référence mise à jour : {args.baseline} ({len(results['benchmarks'])} cas)")
+        return 0
+
+    baseline = load_json(args.baseline)
+    rows = confirm(results, baseline, args.threshold, args.confirm, lambda names: run(names, args.repeat))
+    if args.output:
+        save_json(results, args.output)
+    print(format_report(rows, args.threshold, results.get("payloads"), (baseline or {}).get("payloads")))
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# core/annuity.py
+# ---------------------------------------------------------
+# Conversion d'un capital en rente viagère mensuelle :
+# - table de mortalité embarquée (assets/life_table.npy), lue en
+#   mémoire partagée (memory-map) une seule fois
+# - probabilités de survie mois par mois
+# - prix d'une rente viagère constante ou revalorisée chaque année
+# - revenu mensuel qu'achète un capital, espérance de vie
+#
+# Prix d'une rente de 1 FCFA par mois, versée en fin de mois tant que le
+# rentier est en vie (actualisation au taux mensuel r/12, comme le reste
+# du simulateur) :
+#     a(x) = Σ_m (1 + g)^⌊(m-1)/12⌋ · v^m · _m p_x
+# avec g la revalorisation annuelle. Toutes les fonctions acceptent des
+# tableaux d'âges et de taux (diffusion NumPy) ; les mois forment un
+# dernier axe, sans boucle.
+#
+# La table peut être régénérée avec : python -m core.annuity
+# ---------------------------------------------------------
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from core.config import LIFE_TABLE_FILE, LIFE_TABLE_MAX_AGE, LIFE_TABLE_PARAMETERS
+
+SEXES = list(LIFE_TABLE_PARAMETERS)
+LIFE_TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", LIFE_TABLE_FILE)
+
+
+def build_life_table(parameters: dict = LIFE_TABLE_PARAMETERS, max_age: int = LIFE_TABLE_MAX_AGE) -> np.ndarray:
+    """
+    Probabilités annuelles de décès q_x d'un modèle de Gompertz-Makeham.
+
+    q_x = 1 - exp(-∫_x^(x+1) μ), avec μ(t) = A + B·c^t ; q vaut 1 au
+    dernier âge de la table.
+
+    Returns:
+        np.ndarray: Tableau float32 (n_sexes, max_age + 1), dans l'ordre de `parameters`
+    """
+    ages = np.arange(max_age + 1)
+    table = np.empty((len(parameters), max_age + 1), dtype=np.float32)
+    for row, (a, b, c) in enumerate(parameters.values()):
+        hazard = a + b * c ** ages * (c - 1) / np.log(c)
+        table[row] = -np.expm1(-hazard)
+    table[:, -1] = 1.0
+    return table
+
+
+def save_life_table(path: str = LIFE_TABLE_PATH) -> None:
+    """Écrit la table de mortalité embarquée (format .npy)."""
+    np.save(path, build_life_table())
+
+
+@lru_cache(maxsize=1)
+def load_life_table() -> np.ndarray:
+    """Table q_x (n_sexes, âges) lue en mémoire partagée, en lecture seule."""
+    return np.load(LIFE_TABLE_PATH, mmap_mode="r")
+
+
+@lru_cache(maxsize=len(SEXES))
+def _cumulative_log_survival(sex: str) -> np.ndarray:
+    """
+    log de la probabilité de survivre de la naissance à chaque mois
+    (décès uniformément répartis en force sur l'année), avec une marge
+    nulle au-delà du dernier âge.
+    """
+    death = np.asarray(load_life_table()[SEXES.index(sex)], dtype=float)
+    monthly = np.repeat(np.log(np.maximum(1 - death, 1e-300)) / 12, 12)
+    cumulative = np.concatenate([[0.0], np.cumsum(monthly)])
+    cumulative.flags.writeable = False
+    return cumulative
+
+
+def survival_probabilities(age, sex: str = SEXES[0]) -> np.ndarray:
+    """
+    Probabilités _m p_x de survivre m mois à partir de l'âge `age`.
+
+    Args:
+        age: Âge en années (tableau accepté, arrondi au mois)
+        sex: Sexe (clé de LIFE_TABLE_PARAMETERS)
+
+    Returns:
+        np.ndarray: Forme (..., n_mois) pour m = 1 .. n_mois, n_mois
+            couvrant la table jusqu'au dernier âge
+    """
+    cumulative = _cumulative_log_survival(sex)
+    n_months = len(cumulative) - 1
+    start = np.clip(np.round(np.asarray(age, dtype=float) * 12).astype(int), 0, n_months)
+    index = np.minimum(start[..., None] + np.arange(1, n_months + 1), n_months)
+    alive = start[..., None] + np.arange(1, n_months + 1) <= n_months
+    return np.where(alive, np.exp(cumulative[index] - cumulative[start][..., None]), 0.0)
+
+
+def annuity_factor(age, rate, sex: str = SEXES[0], indexation=0.0) -> np.ndarray:
+    """
+    Prix d'une rente viagère de 1 FCFA par mois (versée en fin de mois).
+
+    Args:
+        age: Âge à la conversion en années (tableau accepté)
+        rate: Taux technique annuel en % (tableau accepté)
+        sex: Sexe (clé de LIFE_TABLE_PARAMETERS)
+        indexation: Revalorisation annuelle de la rente en % (0 : rente constante)
+
+    Returns:
+        np.ndarray: Valeur actuelle de la rente (diffusion de age, rate, indexation)
+    """
+    survival = survival_probabilities(age, sex)
+    months = np.arange(1, survival.shape[-1] + 1)
+    rate = np.expand_dims(np.asarray(rate, dtype=float), -1)
+    indexation = np.expand_dims(np.asarray(indexation, dtype=float), -1)
+    log_weight = np.log1p(indexation / 100) * ((months - 1) // 12) - np.log1p(rate / 1200) * months
+    return np.sum(survival * np.exp(log_weight), axis=-1)
+
+
+def annuity_income(capital, age, rate, sex: str = SEXES[0], indexation=0.0) -> np.ndarray:
+    """
+    Rente viagère mensuelle (première année) qu'achète un capital.
+
+    Returns:
+        np.ndarray: capital / prix de la rente de 1 FCFA par mois
+    """
+    return np.asarray(capital, dtype=float) / annuity_factor(age, rate, sex, indexation)
+
+
+def life_expectancy(age, sex: str = SEXES[0]) -> np.ndarray:
+    """Espérance de vie résiduelle en années (mois entiers vécus + 1/2 mois)."""
+    return np.sum(survival_probabilities(age, sex), axis=-1) / 12 + 1 / 24
+
+
+if __name__ == "__main__":
+    save_life_table()
+    print(f"Table de mortalité écrite dans {LIFE_TABLE_PATH}")
@@ -5,15 +5,22 @@
 # - Versement mensuel (PMT)
 # - Valeur actuelle nécessaire (PV)
 # - Horizon de placement (n_years)
+# - Les quatre à la fois (`solve_all` : quadruplet cohérent et totaux)
 #
 # Chaque fonction est indépendante pour faciliter les tests unitaires
 # et la maintenance de l'application.
+#
+# Les variantes `*_batch` acceptent des tableaux NumPy (diffusion
+# « broadcasting ») et évaluent une grille complète en un seul appel.
+# Scalaires et `*_batch` reposent sur les mêmes formes fermées
+# (`periodic_factors`) : mêmes résultats, horizons fractionnaires compris.
 # ---------------------------------------------------------
 
 import numpy as np
 import streamlit as st
 
 
+
 class CalculationError(Exception):
     """Exception personnalisée pour les erreurs de calcul."""
     pass
@@ -22,6 +29,7 @@ class CalculationError(Exception):
 def validate_inputs(pv: float, pmt: float, rate: float, n_years: float) -> None:
     """
     Valide les paramètres d'entrée des calculs.
+    Accepte des scalaires ou des tableaux NumPy (toutes les valeurs sont vérifiées).
     
     Args:
         pv: Montant initial
@@ -32,15 +40,15 @@ def validate_inputs(pv: float, pmt: float, rate: float, n_years: float) -> None:
     Raises:
         CalculationError: Si les paramètres sont invalides
     """
-    if pv < 0:
+    if np.any(np.asarray(pv) < 0):
         raise CalculationError("Le montant initial ne peut pas être négatif")
-    if pmt < 0:
+    if np.any(np.asarray(pmt) < 0):
         raise CalculationError("Le versement mensuel ne peut pas être négatif")
-    if n_years < 0:
+    if np.any(np.asarray(n_years) < 0):
         raise CalculationError("L'horizon ne peut pas être négatif")
-    if rate < -100:
+    if np.any(np.asarray(rate) < -100):
         raise CalculationError("Le taux ne peut pas être inférieur à -100%")
-    if n_years > 100:
+    if np.any(np.asarray(n_years) > 100):
         raise CalculationError("L'horizon ne peut pas dépasser 100 ans")
 
 
@@ -53,36 +61,16 @@ def calculate_fv(pv: float, pmt: float, rate: float, n_years: float) -> float:
         pv: Montant initial
         pmt: Versement mensuel
         rate: Rendement annuel en %
-        n_years: Durée en années
+        n_years: Durée en années (fractions d'année prises en compte, sans troncature au mois)
         
     Returns:
         float: Valeur future calculée
         
     Raises:
         CalculationError: Si les paramètres sont invalides
-        ValueError: Si une erreur de calcul survient
     """
-    validate_inputs(pv, pmt, rate, n_years)
-    
-    if n_years == 0:
-        return pv
-    
-    try:
-        n_periods = int(n_years * 12)
-        rate_monthly = rate / 100 / 12
-
-        # FV du capital initial
-        fv_pv = pv * (1 + rate_monthly) ** n_periods
-
-        # FV des versements mensuels
-        if rate_monthly == 0:
-            fv_pmt = pmt * n_periods
-        else:
-            fv_pmt = pmt * (((1 + rate_monthly) ** n_periods - 1) / rate_monthly)
-
-        return fv_pv + fv_pmt
-    except (ZeroDivisionError, OverflowError) as e:
-        raise ValueError(f"Erreur de calcul: {e}")
+    # Horizon fractionnaire : versements effectués et capitalisation jusqu'à l'horizon exact
+    return float(calculate_fv_periodic(pv, pmt, rate, n_years))
 
 
 @st.cache_data
@@ -94,39 +82,15 @@ def calculate_pmt(fv: float, pv: float, rate: float, n_years: float) -> float:
         fv: Montant cible à atteindre
         pv: Montant initial
         rate: Rendement annuel en %
-        n_years: Durée en années
+        n_years: Durée en années (fractions d'année prises en compte, sans troncature au mois)
         
     Returns:
         float: Versement mensuel nécessaire
         
     Raises:
         CalculationError: Si les paramètres sont invalides
-        ValueError: Si une erreur de calcul survient
     """
-    validate_inputs(pv, 0, rate, n_years)
-    
-    if n_years == 0:
-        return 0
-    
-    try:
-        n_periods = int(n_years * 12)
-        rate_monthly = rate / 100 / 12
-
-        if rate_monthly == 0:
-            # Cas simple sans rendement
-            return max((fv - pv) / n_periods, 0)
-
-        # FV provenant uniquement du capital initial
-        fv_pv = pv * (1 + rate_monthly) ** n_periods
-
-        fv_required_from_pmt = fv - fv_pv
-
-        if fv_required_from_pmt <= 0:
-            return 0  # Le capital initial suffit déjà
-
-        return fv_required_from_pmt / (((1 + rate_monthly) ** n_periods - 1) / rate_monthly)
-    except (ZeroDivisionError, OverflowError) as e:
-        raise ValueError(f"Erreur de calcul: {e}")
+    return float(calculate_pmt_periodic(fv, pv, rate, n_years))
 
 
 @st.cache_data
@@ -138,46 +102,21 @@ def calculate_pv(fv: float, pmt: float, rate: float, n_years: float) -> float:
         fv: Montant cible à atteindre
         pmt: Versement mensuel
         rate: Rendement annuel en %
-        n_years: Durée en années
+        n_years: Durée en années (fractions d'année prises en compte, sans troncature au mois)
         
     Returns:
         float: Montant initial nécessaire
         
     Raises:
         CalculationError: Si les paramètres sont invalides
-        ValueError: Si une erreur de calcul survient
     """
-    validate_inputs(0, pmt, rate, n_years)
-    
-    if n_years == 0:
-        return max(fv, 0)
-    
-    try:
-        n_periods = int(n_years * 12)
-        rate_monthly = rate / 100 / 12
-
-        # FV des versements
-        if rate_monthly == 0:
-            fv_pmt = pmt * n_periods
-        else:
-            fv_pmt = pmt * (((1 + rate_monthly) ** n_periods - 1) / rate_monthly)
-
-        if fv <= fv_pmt:
-            return 0  # Les versements seuls permettent d'atteindre l'objectif
-
-        if rate_monthly == 0:
-            return fv - fv_pmt
-
-        return (fv - fv_pmt) / ((1 + rate_monthly) ** n_periods)
-    except (ZeroDivisionError, OverflowError) as e:
-        raise ValueError(f"Erreur de calcul: {e}")
+    return float(calculate_pv_periodic(fv, pmt, rate, n_years))
 
 
 @st.cache_data
 def calculate_n_years(fv: float, pv: float, pmt: float, rate: float) -> float:
     """
     Calcule le nombre d'années nécessaires pour atteindre FV.
-    Utilise une simulation mois par mois (robuste et stable).
     
     Args:
         fv: Montant cible à atteindre
@@ -186,36 +125,343 @@ def calculate_n_years(fv: float, pv: float, pmt: float, rate: float) -> float:
         rate: Rendement annuel en %
         
     Returns:
-        float: Nombre d'années nécessaires, ou np.inf si impossible
+        float: Nombre d'années nécessaires (instant exact où FV est atteint,
+        entre deux versements le cas échéant), ou np.inf si impossible
+        en 100 ans
         
     Raises:
         CalculationError: Si les paramètres sont invalides
     """
-    # Valider sans spécifier n_years (car c'est ce qu'on calcule)
-    if pv < 0:
-        raise CalculationError("Le montant initial ne peut pas être négatif")
-    if pmt < 0:
-        raise CalculationError("Le versement mensuel ne peut pas être négatif")
-    if rate < -100:
-        raise CalculationError("Le taux ne peut pas être inférieur à -100%")
-    
-    if rate == 0:
-        if pmt == 0:
-            return np.inf if fv > pv else 0
-        return max((fv - pv) / pmt / 12, 0)
+    return float(calculate_n_years_periodic(fv, pv, pmt, rate))
+
+
+# ---------------------------------------------------------
+# Versions vectorisées (grilles de sensibilité, cartes de chaleur)
+# ---------------------------------------------------------
+
+def growth_factors(rate, n_periods) -> tuple:
+    """
+    Facteurs de capitalisation mensuelle en forme fermée.
+
+    Args:
+        rate: Rendement annuel en % (scalaire ou tableau)
+        n_periods: Nombre de mois (scalaire ou tableau, fractionnaire accepté)
+
+    Returns:
+        tuple: ((1 + r)^n, facteur d'annuité ((1 + r)^n - 1) / r), avec
+        r = rate / 1200, de la forme diffusée des arguments
+    """
+    rate_monthly = np.asarray(rate, dtype=float) / 100 / 12
+    log_growth = n_periods * np.log1p(rate_monthly)
+    growth = np.exp(log_growth)
+
+    # Cas r = 0 : l'annuité vaut simplement n
+    safe_rate = np.where(rate_monthly == 0, 1.0, rate_monthly)
+    annuity = np.where(rate_monthly == 0, n_periods, np.expm1(log_growth) / safe_rate)
+    return growth, annuity
+
+
+def calculate_fv_batch(pv, pmt, rate, n_years) -> np.ndarray:
+    """
+    Version vectorisée de `calculate_fv`.
+
+    Les arguments peuvent être des scalaires ou des tableaux de formes
+    compatibles (broadcasting NumPy), par ex. `rates[None, :]` et
+    `pmts[:, None]` pour une grille complète. Comme la version scalaire,
+    un horizon fractionnaire est pris tel quel (voir `periodic_factors`).
+
+    Returns:
+        np.ndarray: Valeurs futures, de la forme diffusée des arguments
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    return calculate_fv_periodic(pv, pmt, rate, n_years)
+
+
+def calculate_pmt_batch(fv, pv, rate, n_years) -> np.ndarray:
+    """
+    Version vectorisée de `calculate_pmt` (versement mensuel nécessaire).
+
+    Returns:
+        np.ndarray: Versements mensuels (0 si le capital initial suffit
+        ou si aucun versement n'a lieu avant l'horizon)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    return calculate_pmt_periodic(fv, pv, rate, n_years)
+
+
+def calculate_pv_batch(fv, pmt, rate, n_years) -> np.ndarray:
+    """
+    Version vectorisée de `calculate_pv` (montant initial nécessaire).
+
+    Returns:
+        np.ndarray: Montants initiaux (0 si les versements suffisent)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    return calculate_pv_periodic(fv, pmt, rate, n_years)
+
+
+def calculate_n_years_batch(fv, pv, pmt, rate) -> np.ndarray:
+    """
+    Version vectorisée de `calculate_n_years` : horizon exact, en forme
+    fermée (voir `calculate_n_years_periodic`).
+
+    Returns:
+        np.ndarray: Nombre d'années nécessaires (np.inf si impossible)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    return calculate_n_years_periodic(fv, pv, pmt, rate)
+
+
+# ---------------------------------------------------------
+# Fréquences de versement et de capitalisation
+# ---------------------------------------------------------
+#
+# Taux nominal annuel r capitalisé m fois par an (m = np.inf : capitalisation
+# continue), soit un taux instantané équivalent δ = m·ln(1 + r/m) (δ = r en
+# continu). Les versements de P, en fin de période, ont lieu p fois par an.
+# Après t années (t quelconque, périodes fractionnaires comprises) :
+#     FV = pv·e^(δt) + P·e^(δ(t - k/p))·(e^(δk/p) - 1) / (e^(δ/p) - 1)
+# avec k = ⌊p·t⌋ versements effectués. Avec p = m = 12 et t entier en mois,
+# on retrouve exactement les formules mensuelles ci-dessus.
+
+def _force_of_interest(rate, compounding_frequency=12) -> np.ndarray:
+    """
+    Taux instantané annuel δ équivalent à un taux nominal `rate` (en %)
+    capitalisé `compounding_frequency` fois par an (np.inf : en continu).
+    """
+    rate = np.asarray(rate, dtype=float) / 100
+    frequency = np.asarray(compounding_frequency, dtype=float)
+    safe_frequency = np.where(np.isinf(frequency), 1.0, frequency)
+    return np.where(np.isinf(frequency), rate, safe_frequency * np.log1p(rate / safe_frequency))
+
+
+def periodic_factors(rate, n_years, contribution_frequency=12, compounding_frequency=12) -> tuple:
+    """
+    Facteurs de capitalisation pour des fréquences quelconques.
+
+    Args:
+        rate: Rendement nominal annuel en %
+        n_years: Durée en années (fractionnaire acceptée)
+        contribution_frequency: Nombre de versements par an (12, 4, 2, 1)
+        compounding_frequency: Nombre de capitalisations par an (np.inf : continue)
+
+    Returns:
+        tuple: (growth, annuity, n_payments) tels que
+        FV = pv·growth + pmt·annuity, avec n_payments versements effectués
+    """
+    delta = _force_of_interest(rate, compounding_frequency)
+    n_years = np.asarray(n_years, dtype=float)
+    frequency = np.asarray(contribution_frequency, dtype=float)
+    n_payments = np.floor(n_years * frequency + 1e-9)
+
+    growth = np.exp(delta * n_years)
+
+    # Σ e^(δ(t - j/p)) pour j = 1..k, limite k en δ = 0
+    step = np.expm1(delta / frequency)
+    safe_step = np.where(step == 0, 1.0, step)
+    annuity = np.where(
+        step == 0,
+        n_payments,
+        np.exp(delta * (n_years - n_payments / frequency)) * np.expm1(delta * n_payments / frequency) / safe_step,
+    )
+    return growth, annuity, n_payments
+
+
+def calculate_fv_periodic(pv, pmt, rate, n_years, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Valeur future avec versements de `pmt` à la fréquence `contribution_frequency`
+    et capitalisation à la fréquence `compounding_frequency`.
+
+    Returns:
+        np.ndarray: Valeurs futures (diffusion NumPy des arguments)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, pmt, rate, n_years)
+    growth, annuity, _ = periodic_factors(rate, n_years, contribution_frequency, compounding_frequency)
+    return pv * growth + pmt * annuity
+
+
+def calculate_pmt_periodic(fv, pv, rate, n_years, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Versement par période (à la fréquence `contribution_frequency`)
+    nécessaire pour atteindre FV.
+
+    Returns:
+        np.ndarray: Versements (0 si le capital initial suffit ou si aucun
+        versement n'a lieu avant l'horizon)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, 0, rate, n_years)
+    growth, annuity, n_payments = periodic_factors(rate, n_years, contribution_frequency, compounding_frequency)
+    required = np.maximum(fv - pv * growth, 0)
+    safe_annuity = np.where(annuity == 0, 1.0, annuity)
+    return np.where(n_payments == 0, 0.0, required / safe_annuity)
 
-    rate_monthly = rate / 100 / 12
 
-    if fv <= pv:
-        return 0.0
+def calculate_pv_periodic(fv, pmt, rate, n_years, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Montant initial nécessaire pour atteindre FV avec des versements périodiques.
+
+    Returns:
+        np.ndarray: Montants initiaux (0 si les versements suffisent)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(0, pmt, rate, n_years)
+    growth, annuity, _ = periodic_factors(rate, n_years, contribution_frequency, compounding_frequency)
+    return np.maximum(fv - pmt * annuity, 0) / growth
 
-    current_fv = pv
 
-    # On limite à 100 ans (1200 mois)
-    for month in range(1, 1201):
-        current_fv = current_fv * (1 + rate_monthly) + pmt
+def calculate_n_years_periodic(fv, pv, pmt, rate, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Horizon exact (en années, non arrondi) pour atteindre FV.
 
-        if current_fv >= fv:
-            return month / 12
+    Le capital croît continûment entre deux versements : on cherche d'abord
+    le premier versement k après lequel FV est atteint (forme fermée, comme
+    `calculate_n_years_batch`), puis l'instant exact entre les versements
+    k - 1 et k où la seule croissance du capital suffit, s'il existe.
+
+    Returns:
+        np.ndarray: Nombre d'années (np.inf si impossible en 100 ans)
 
-    return np.inf
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, pmt, rate, 0)
+    fv, pv, pmt, rate, frequency = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fv, pv, pmt, rate, contribution_frequency))
+    )
+    delta = _force_of_interest(rate, compounding_frequency)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Valeur juste après le k-ième versement : V_k = (pv + P/s)·g^k - P/s,
+        # avec g = e^(δ/p) et s = g - 1
+        step = np.expm1(delta / frequency)
+        safe_step = np.where(step == 0, 1.0, step)
+        a = pv + pmt / safe_step
+        b = fv + pmt / safe_step
+        k_compound = np.ceil(np.log(b / a) / np.log1p(safe_step) - 1e-9)
+        # Taux négatif : V_k tend vers -P/s, objectif atteignable seulement en deçà
+        k_compound = np.where((b / a > 0) & (k_compound >= 0), k_compound, np.inf)
+        k_linear = np.where(pmt > 0, np.ceil((fv - pv) / pmt - 1e-9), np.inf)
+        k = np.maximum(np.where(step == 0, k_linear, k_compound), 1)
+
+        # Entre les versements k - 1 et k, seule la croissance joue
+        previous = np.where(
+            step == 0,
+            pv + pmt * (k - 1),
+            a * np.exp(delta * (k - 1) / frequency) - pmt / safe_step,
+        )
+        between = (k - 1) / frequency + np.log(fv / previous) / delta
+        years = np.where(
+            (delta > 0) & (previous > 0) & (between < k / frequency),
+            np.maximum(between, (k - 1) / frequency),
+            k / frequency,
+        )
+
+        # Sans versement : croissance pure du capital initial
+        growth_only = np.where((delta > 0) & (pv > 0), np.log(fv / pv) / delta, np.inf)
+        years = np.where(pmt > 0, years, growth_only)
+
+    years = np.where(fv <= pv, 0.0, years)
+    return np.where(years <= 100, years, np.inf)
+
+
+def solve_all(fv, pv, pmt, rate, n_years, contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Résout les quatre modes de calcul (FV, PMT, PV, horizon) en une seule
+    évaluation vectorisée et retourne le quadruplet cohérent complet.
+
+    L'inconnue de chaque simulation est marquée par np.nan (une au plus ;
+    une simulation sans inconnue est retournée telle quelle, avec ses
+    totaux). Les arguments sont diffusés (broadcasting NumPy) : une même
+    grille peut mélanger des simulations de modes différents.
+
+    Args:
+        fv: Montant final (np.nan si inconnu)
+        pv: Montant initial (np.nan si inconnu)
+        pmt: Versement par période (np.nan si inconnu)
+        rate: Rendement nominal annuel en %
+        n_years: Horizon en années (np.nan si inconnu)
+        contribution_frequency: Nombre de versements par an
+        compounding_frequency: Nombre de capitalisations par an (np.inf : continue)
+
+    Returns:
+        dict: Tableaux NumPy de la forme diffusée des arguments :
+            - "fv", "pv", "pmt", "n_years" : quadruplet complet et cohérent
+              (horizon inconnu : "fv" est la valeur acquise à l'horizon
+              trouvé, au moins égale à l'objectif ; horizon np.inf si
+              l'objectif est inatteignable en 100 ans)
+            - "invested" : sommes versées (pv + pmt × nombre de versements,
+              np.nan pour un horizon infini)
+            - "interest" : intérêts générés (fv - invested)
+
+    Raises:
+        CalculationError: Si un paramètre est invalide ou s'il y a plus
+            d'une inconnue pour une même simulation
+    """
+    fv, pv, pmt, rate, n_years = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fv, pv, pmt, rate, n_years))
+    )
+    unknown_fv, unknown_pv, unknown_pmt, unknown_n = (np.isnan(x) for x in (fv, pv, pmt, n_years))
+    if np.any(unknown_fv.astype(int) + unknown_pv + unknown_pmt + unknown_n > 1):
+        raise CalculationError("Une seule inconnue par simulation (FV, PV, PMT ou horizon)")
+    validate_inputs(pv, pmt, rate, n_years)
+
+    # Horizon d'abord : les facteurs de capitalisation en dépendent
+    if np.any(unknown_n):
+        solved = calculate_n_years_periodic(
+            np.where(unknown_n, fv, 0), np.where(unknown_n, pv, 0), np.where(unknown_n, pmt, 0),
+            rate, contribution_frequency, compounding_frequency,
+        )
+        n_years = np.where(unknown_n, solved, n_years)
+
+    finite = np.isfinite(n_years)
+    growth, annuity, n_payments = periodic_factors(
+        rate, np.where(finite, n_years, 0), contribution_frequency, compounding_frequency
+    )
+
+    # Une seule des branches s'applique à chaque simulation (les autres portent sur des NaN)
+    with np.errstate(invalid="ignore"):
+        safe_annuity = np.where(annuity == 0, 1.0, annuity)
+        pmt = np.where(unknown_pmt, np.where(n_payments == 0, 0.0, np.maximum(fv - pv * growth, 0) / safe_annuity), pmt)
+        pv = np.where(unknown_pv, np.maximum(fv - pmt * annuity, 0) / growth, pv)
+        # Horizon inconnu : l'objectif est franchi à une échéance, la valeur
+        # acquise à cet horizon (et non l'objectif) complète le quadruplet
+        fv = np.where(unknown_fv | (unknown_n & finite), pv * growth + pmt * annuity, fv)
+
+    invested = np.where(finite, pv + pmt * n_payments, np.nan)
+    return {
+        "fv": fv,
+        "pv": pv,
+        "pmt": pmt,
+        "n_years": n_years,
+        "invested": invested,
+        "interest": fv - invested,
+    }
+
+
+def equivalent_contribution(pmt, rate, from_frequency=12, to_frequency=4, compounding_frequency=12) -> np.ndarray:
+    """
+    Versement à la fréquence `to_frequency` produisant la même valeur
+    acquise sur un an que `pmt` versé à la fréquence `from_frequency`.
+
+    Contrairement à une simple multiplication (pmt × 3 pour un trimestre),
+    le calcul tient compte des intérêts produits à l'intérieur de l'année.
+    """
+    _, annuity_from, _ = periodic_factors(rate, 1, from_frequency, compounding_frequency)
+    _, annuity_to, _ = periodic_factors(rate, 1, to_frequency, compounding_frequency)
+    return pmt * annuity_from / annuity_to
@@ -17,9 +17,11 @@ APP_NAME = "Simulateur d'Investissement - CGF Gestion"
 # - PRIMARY_COLOR : couleur principale (titres, accents forts)
 # - SECONDARY_COLOR : couleur secondaire (widgets, bordures, tracés secondaires)
 # - ACCENT_COLOR : couleur d'accent / background léger (cartes, badges)
+# - TAX_COLOR : impôts payés dans les graphiques
 PRIMARY_COLOR   = "#114B80"  # Bleu profond — bon pour titres, boutons principaux
 SECONDARY_COLOR = "#567389"  # Bleu-gris — idéal pour widgets, lignes, icônes
 ACCENT_COLOR    = "#ACC7DF"  # Bleu clair — pour fonds de cartes, hover, petites touches
+TAX_COLOR       = "#C0762F"  # Orange cuivré — impôts payés (distincts des tracés bleus)
 
 # Autres variables globales utiles
 TEXT_COLOR = "#1f2a33"       # couleur de texte par défaut (suffisamment contrastée)
@@ -33,15 +35,115 @@ DEFAULT_TARGET_AMOUNT = 10_000_000
 DEFAULT_ANNUAL_RATE = 5.0
 DEFAULT_HORIZON_YEARS = 10
 
+# Modes de calcul : libellé -> grandeur calculée (les trois autres sont saisies)
+CALCULATION_MODES = {
+    "Montant Final": "fv",
+    "Versement Mensuel": "pmt",
+    "Montant Initial": "pv",
+    "Horizon de Placement": "n_years",
+}
+
+# Fréquences de versement / de capitalisation (nombre par an)
+CONTRIBUTION_FREQUENCIES = {
+    "Mensuel": 12,
+    "Trimestriel": 4,
+    "Semestriel": 2,
+    "Annuel": 1,
+}
+COMPOUNDING_FREQUENCIES = {
+    "Mensuelle": 12,
+    "Trimestrielle": 4,
+    "Semestrielle": 2,
+    "Annuelle": 1,
+    "Continue": float("inf"),
+}
+
+# Mois de l'année (versements exceptionnels récurrents)
+MONTH_NAMES = [
+    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
+    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre",
+]
+
+# Structures de frais (en %) : droits d'entrée sur chaque versement, frais de
+# gestion annuels prélevés mensuellement, commission de performance au-delà
+# d'un taux plancher (hurdle)
+FEE_STRUCTURES = {
+    "Sans frais": {"entry_fee": 0.0, "management_fee": 0.0, "performance_fee": 0.0, "hurdle_rate": 0.0},
+    "Fonds monétaire": {"entry_fee": 0.0, "management_fee": 0.5, "performance_fee": 0.0, "hurdle_rate": 0.0},
+    "Fonds obligataire": {"entry_fee": 1.0, "management_fee": 1.0, "performance_fee": 0.0, "hurdle_rate": 0.0},
+    "Fonds diversifié": {"entry_fee": 2.0, "management_fee": 1.5, "performance_fee": 10.0, "hurdle_rate": 4.0},
+    "Fonds actions": {"entry_fee": 3.0, "management_fee": 2.0, "performance_fee": 20.0, "hurdle_rate": 6.0},
+}
+
 # Constraints
 MIN_RATE = -100
 MAX_RATE = 100
 MIN_HORIZON = 1
 MAX_HORIZON = 100
 
+# Stochastic simulations (rendements aléatoires)
+DEFAULT_VOLATILITY = 10.0    # volatilité annuelle par défaut en %
+SIMULATION_PATHS = 5_000     # nombre de trajectoires simulées par défaut
+SIMULATION_SEED = 42         # graine fixe : résultats reproductibles d'une exécution à l'autre
+DEFAULT_TARGET_PROBABILITY = 90.0  # probabilité (%) d'atteindre l'objectif visée par défaut
+
+# Classes d'actifs du portefeuille (hypothèses indicatives, en %) : rendement
+# annuel moyen et volatilité annuelle, puis corrélations dans le même ordre
+ASSET_CLASSES = {
+    "Actions BRVM": {"rate": 10.0, "volatility": 18.0},
+    "Obligations régionales": {"rate": 6.5, "volatility": 4.0},
+    "Monétaire": {"rate": 3.5, "volatility": 0.5},
+}
+ASSET_CORRELATIONS = [
+    [1.0, 0.2, 0.0],
+    [0.2, 1.0, 0.3],
+    [0.0, 0.3, 1.0],
+]
+# Allocations cibles (poids en %, même ordre que ASSET_CLASSES)
+PORTFOLIO_PROFILES = {
+    "Prudent": [15.0, 45.0, 40.0],
+    "Équilibré": [40.0, 45.0, 15.0],
+    "Dynamique": [70.0, 25.0, 5.0],
+}
+# Trajectoires d'allocation (« glide paths ») : la part de l'actif risqué (la
+# première classe d'actifs) décroît à l'approche de l'échéance ; le reste est
+# réparti selon GLIDE_DEFENSIVE_MIX. Forme de la courbe : exposant k appliqué à
+# la part du parcours restant (1 : linéaire, > 1 : baisse précoce, < 1 : tardive)
+GLIDE_PATH_SHAPES = {
+    "Linéaire": 1.0,
+    "Baisse précoce": 2.0,
+    "Baisse tardive": 0.5,
+}
+GLIDE_DEFENSIVE_MIX = [0.0, 75.0, 25.0]   # poids relatifs de la poche défensive (%)
+DEFAULT_GLIDE_PATH = {"start_weight": 80.0, "end_weight": 20.0, "glide_years": 20, "shape": "Linéaire"}
+
+# Rééquilibrage vers l'allocation cible : période en mois (0 : jamais)
+REBALANCING_PERIODS = {
+    "Mensuel": 1,
+    "Trimestriel": 3,
+    "Annuel": 12,
+    "Jamais": 0,
+}
+
+# Table de mortalité embarquée (rentes viagères) : probabilités annuelles de
+# décès q_x de 0 à LIFE_TABLE_MAX_AGE ans, stockées dans assets/life_table.npy.
+# Table indicative issue d'un modèle de Gompertz-Makeham μ(x) = A + B·c^x
+# (espérance de vie à 60 ans d'environ 15,5 ans pour les hommes et 18,5 ans
+# pour les femmes) ; à remplacer par une table réglementaire si disponible.
+LIFE_TABLE_FILE = "life_table.npy"
+LIFE_TABLE_MAX_AGE = 120
+LIFE_TABLE_PARAMETERS = {
+    "Homme": (0.003, 6e-5, 1.1),
+    "Femme": (0.0025, 4e-5, 1.1),
+}
+DEFAULT_RETIREMENT_AGE = 60
+
 # UI Configuration
 CHART_HEIGHT = 350
 PIE_CHART_HEIGHT = 400
+CHART_MAX_POINTS = 240       # points max par série envoyés au navigateur (courbes mensuelles)
+HEATMAP_GRID_SIZE = 200      # résolution (par axe) des cartes de sensibilité
+RATE_CURVE_POINTS = 300      # points de la courbe continue de sensibilité au taux
 EXPANDER_EXPANDED_BY_DEFAULT = True
 
 # Countries for dropdown
@@ -56,6 +158,22 @@ UEMOA_COUNTRIES = [
     "Togo"
 ]
 
+# Fiscalité des revenus de placement des particuliers, par pays (taux indicatifs en %,
+# à tenir à jour avec la réglementation en vigueur) :
+# - withholding : retenue à la source sur les revenus courants (intérêts, dividendes)
+# - capital_gains : imposition des plus-values constatées à la sortie
+UEMOA_TAX_RULES = {
+    "Côte d'Ivoire": {"withholding": 15.0, "capital_gains": 0.0},
+    "Bénin": {"withholding": 10.0, "capital_gains": 0.0},
+    "Burkina Faso": {"withholding": 12.5, "capital_gains": 10.0},
+    "Guinée-Bissau": {"withholding": 10.0, "capital_gains": 0.0},
+    "Mali": {"withholding": 10.0, "capital_gains": 0.0},
+    "Niger": {"withholding": 10.0, "capital_gains": 0.0},
+    "Sénégal": {"withholding": 10.0, "capital_gains": 15.0},
+    "Togo": {"withholding": 13.0, "capital_gains": 0.0},
+}
+DEFAULT_INCOME_SHARE = 50.0  # part (%) du rendement perçue sous forme de revenus courants
+
 def get_theme_css() -> str:
     """
     Retourne une chaîne CSS à injecter dans Streamlit via st.markdown(..., unsafe_allow_html=True).
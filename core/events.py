@@ -0,0 +1,328 @@
+# core/events.py
+# ---------------------------------------------------------
+# Flux irréguliers superposés au modèle d'annuité :
+# - versements exceptionnels (primes, apports) et retraits ponctuels,
+#   sous forme d'un dictionnaire creux {mois: montant}
+# - pauses des versements réguliers : liste de (premier mois, durée)
+# - valeur, frais, impôts et solveurs des quatre modes avec ces flux
+#
+# Chaque flux ponctuel se comporte comme un capital initial placé à son
+# mois : sa contribution est le facteur de capitalisation sur la durée
+# restante. La valeur d'un plan est donc la forme fermée de l'annuité
+# plus une somme sur les seuls événements, en O(événements) et non en
+# O(mois). Un versement suspendu est un événement de -pmt, linéaire en
+# pmt : le solveur du versement reste exact.
+#
+# Conventions : mois 1 = fin du premier mois (le plan démarre en
+# janvier) ; flux en fin de mois, après le versement régulier éventuel.
+# Frais (core/fees) et fiscalité (core/taxes) s'appliquent aux événements
+# comme au capital initial, sauf les droits d'entrée, que les retraits ne
+# supportent pas. Un retrait ne peut dépasser l'encours du mois où il
+# intervient (voir `check_withdrawals`).
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.config import MAX_HORIZON
+from core.calculations import CalculationError, validate_inputs
+from core.taxes import _after_tax_factors, _tax_terms, solve_after_tax
+from core.fees import _fee_terms
+from core.utils import fmt_money
+
+LINEAR_KEYS = ("value", "gain", "withholding", "balance")
+
+
+def annual_events(amount: float, month_of_year: int = 12, n_years: int = MAX_HORIZON) -> dict:
+    """
+    Événement répété chaque année (ex. prime de fin d'année en décembre).
+
+    Args:
+        amount: Montant de chaque événement (négatif pour un retrait)
+        month_of_year: Mois de l'année (1 = janvier, 12 = décembre)
+        n_years: Nombre d'années couvertes (les événements au-delà de
+            l'horizon du plan sont ignorés)
+
+    Returns:
+        dict: {mois: montant}
+    """
+    return {12 * year + month_of_year: amount for year in range(n_years)}
+
+
+def merge_events(*events: dict) -> dict:
+    """Fusionne plusieurs listes d'événements (montants additionnés par mois)."""
+    merged = {}
+    for items in events:
+        for month, amount in (items or {}).items():
+            merged[int(month)] = merged.get(int(month), 0.0) + amount
+    return {month: amount for month, amount in merged.items() if amount != 0}
+
+
+def skipped_months(pauses, contribution_frequency=12) -> np.ndarray:
+    """
+    Mois des versements réguliers supprimés par des pauses.
+
+    Args:
+        pauses: Liste de (premier mois suspendu, nombre de mois)
+        contribution_frequency: Versements par an (un versement tous les
+            12 / fréquence mois)
+
+    Returns:
+        np.ndarray: Mois (triés, sans doublon) dont le versement est suspendu
+    """
+    step = 12 / contribution_frequency
+    months = set()
+    for first, length in pauses or ():
+        payment = np.arange(np.ceil(first / step), np.floor((first + length - 1) / step) + 1) * step
+        months.update(payment[payment >= 1])
+    return np.array(sorted(months), dtype=float)
+
+
+def _event_flows(events: dict = None, pauses=None, contribution_frequency=12) -> tuple:
+    """
+    Tableaux (months, amounts, units) des flux ponctuels : un flux vaut
+    amounts + units·pmt (units = -1 pour un versement suspendu).
+    """
+    events = events or {}
+    skipped = skipped_months(pauses, contribution_frequency)
+    months = np.concatenate([np.fromiter(events, dtype=float, count=len(events)), skipped])
+    amounts = np.concatenate([np.fromiter(events.values(), dtype=float, count=len(events)), np.zeros(len(skipped))])
+    units = np.concatenate([np.zeros(len(events)), -np.ones(len(skipped))])
+    return months, amounts, units
+
+
+def _with_event_axis(options: dict = None):
+    """Ajoute un axe final (événements) aux paramètres d'un dict de frais ou d'impôts."""
+    if not options:
+        return options
+    return {key: np.expand_dims(np.asarray(value, dtype=float), -1) for key, value in options.items()}
+
+
+def _plan_coefficients(rate, n_years, events: dict = None, pauses=None, taxes: dict = None, fees: dict = None,
+                       contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Coefficients linéaires d'un plan avec événements.
+
+    Pour chaque grandeur Q de core/taxes (valeur, plus-value, retenues,
+    somme des encours) : Q = pv·Q_pv + pmt·Q_pmt + Q_fixed, où les
+    événements ajoutent Σ montant·Q_pv(durée restante) à Q_fixed et
+    Σ unités·Q_pv(durée restante) à Q_pmt.
+
+    Returns:
+        dict: {Q: (Q_pv, Q_pmt, Q_fixed)} pour Q dans LINEAR_KEYS,
+            "invested" (sommes versées, retraits déduits) et "charged"
+            (sommes soumises aux droits d'entrée), plus "ongoing_fee_rate"
+    """
+    factors = _after_tax_factors(rate, n_years, taxes, fees, contribution_frequency, compounding_frequency)
+    months, amounts, units = _event_flows(events, pauses, contribution_frequency)
+
+    # Durée restante de chaque événement, sur un axe final ; ceux postérieurs à l'horizon ne comptent pas
+    remaining = np.expand_dims(np.asarray(n_years, dtype=float), -1) - months / 12
+    active = remaining >= -1e-9
+
+    # Les retraits sortent en totalité : pas de droits d'entrée sur ces flux
+    event_fees = _with_event_axis(fees)
+    if event_fees:
+        event_fees["entry_fee"] = event_fees.get("entry_fee", 0.0) * (amounts >= 0)
+    event_factors = _after_tax_factors(
+        np.expand_dims(np.asarray(rate, dtype=float), -1), np.maximum(remaining, 0),
+        _with_event_axis(taxes), event_fees,
+        np.expand_dims(np.asarray(contribution_frequency, dtype=float), -1), compounding_frequency,
+    )
+
+    coefficients = {}
+    for key in LINEAR_KEYS:
+        per_event = np.where(active, event_factors[key][0], 0.0)
+        coefficients[key] = (
+            factors[key][0],
+            factors[key][1] + np.sum(per_event * units, axis=-1),
+            np.sum(per_event * amounts, axis=-1),
+        )
+    coefficients["invested"] = (
+        1.0,
+        factors["n_payments"] + np.sum(np.where(active, units, 0.0), axis=-1),
+        np.sum(np.where(active, amounts, 0.0), axis=-1),
+    )
+    coefficients["charged"] = (
+        1.0,
+        coefficients["invested"][1],
+        np.sum(np.where(active, np.maximum(amounts, 0.0), 0.0), axis=-1),
+    )
+    coefficients["ongoing_fee_rate"] = factors["ongoing_fee_rate"]
+    return coefficients
+
+
+def plan_breakdown(pv, pmt, rate, n_years, events: dict = None, pauses=None, taxes: dict = None,
+                   fees: dict = None, contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Valeur et décomposition d'un plan avec flux irréguliers.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement par période
+        rate: Rendement annuel brut en %
+        n_years: Durée en années
+        events: Flux ponctuels {mois: montant} (négatif pour un retrait)
+        pauses: Pauses des versements [(premier mois, nombre de mois), ...]
+        taxes: Règles fiscales optionnelles (voir core/taxes)
+        fees: Structure de frais optionnelle (voir core/fees)
+        contribution_frequency: Versements par an (12 : mensuels)
+        compounding_frequency: Capitalisations par an (np.inf : continue)
+
+    Returns:
+        dict: Mêmes clés que `core.taxes.after_tax_breakdown` ("value",
+            "gross_value", "withholding", "capital_gains_tax", "taxes",
+            "fees", "invested")
+    """
+    coefficients = _plan_coefficients(rate, n_years, events, pauses, taxes, fees,
+                                      contribution_frequency, compounding_frequency)
+    total = {
+        key: pv * coefficients[key][0] + pmt * coefficients[key][1] + coefficients[key][2]
+        for key in LINEAR_KEYS + ("invested", "charged")
+    }
+    capital_gains_tax = _tax_terms(taxes)[1] * np.maximum(total["gain"], 0)
+    fees_paid = _fee_terms(fees)[0] / 100 * total["charged"] + coefficients["ongoing_fee_rate"] * total["balance"]
+
+    return {
+        "value": total["value"] - capital_gains_tax,
+        "gross_value": total["value"],
+        "withholding": total["withholding"],
+        "capital_gains_tax": capital_gains_tax,
+        "taxes": total["withholding"] + capital_gains_tax,
+        "fees": fees_paid,
+        "invested": total["invested"],
+    }
+
+
+def check_withdrawals(pv, pmt, rate, n_years, events: dict = None, pauses=None, taxes: dict = None,
+                      fees: dict = None, contribution_frequency=12, compounding_frequency=12) -> None:
+    """
+    Vérifie que chaque retrait ponctuel antérieur à l'horizon est couvert
+    par l'encours du mois où il intervient (l'encours ne redevient pas
+    négatif après le retrait).
+
+    Raises:
+        CalculationError: Si un retrait dépasse l'encours disponible
+    """
+    withdrawals = {month: amount for month, amount in (events or {}).items() if amount < 0}
+    if not withdrawals:
+        return
+    months = np.array(sorted(withdrawals), dtype=float)
+    amounts = np.array([withdrawals[month] for month in sorted(withdrawals)])
+    pv, pmt, rate, n_years = (np.expand_dims(np.asarray(x, dtype=float), -1) for x in (pv, pmt, rate, n_years))
+
+    # Encours juste après chaque retrait (le flux du mois est compté à son horizon)
+    balance = plan_breakdown(pv, pmt, rate, months / 12, events, pauses, _with_event_axis(taxes),
+                             _with_event_axis(fees), contribution_frequency, compounding_frequency)["gross_value"]
+    overdrawn = (balance < 1e-9 * amounts) & (months / 12 <= n_years + 1e-9)
+    if np.any(overdrawn):
+        month = int(months[np.argmax(overdrawn.reshape(-1, len(months)).any(axis=0))])
+        raise CalculationError(
+            f"Le retrait de {fmt_money(-withdrawals[month])} au mois {month} dépasse l'encours disponible"
+        )
+
+
+def calculate_fv_with_events(pv, pmt, rate, n_years, events: dict = None, pauses=None, taxes: dict = None,
+                             fees: dict = None, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Valeur future d'un plan avec flux irréguliers (nette de frais et d'impôts).
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide ou si un
+            retrait dépasse l'encours
+    """
+    validate_inputs(pv, pmt, rate, n_years)
+    check_withdrawals(pv, pmt, rate, n_years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    return plan_breakdown(pv, pmt, rate, n_years, events, pauses, taxes, fees,
+                          contribution_frequency, compounding_frequency)["value"]
+
+
+def calculate_pmt_with_events(fv, pv, rate, n_years, events: dict = None, pauses=None, taxes: dict = None,
+                              fees: dict = None, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Versement régulier nécessaire pour atteindre FV, événements compris.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide ou si un
+            retrait dépasse l'encours
+    """
+    validate_inputs(pv, 0, rate, n_years)
+    c = _plan_coefficients(rate, n_years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    pmt = solve_after_tax(
+        fv,
+        pv * c["value"][0] + c["value"][2], pv * c["gain"][0] + c["gain"][2],
+        c["value"][1], c["gain"][1], _tax_terms(taxes)[1],
+    )
+    check_withdrawals(pv, pmt, rate, n_years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    return pmt
+
+
+def calculate_pv_with_events(fv, pmt, rate, n_years, events: dict = None, pauses=None, taxes: dict = None,
+                             fees: dict = None, contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Montant initial nécessaire pour atteindre FV, événements compris.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide ou si un
+            retrait dépasse l'encours
+    """
+    validate_inputs(0, pmt, rate, n_years)
+    c = _plan_coefficients(rate, n_years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    pv = solve_after_tax(
+        fv,
+        pmt * c["value"][1] + c["value"][2], pmt * c["gain"][1] + c["gain"][2],
+        c["value"][0], c["gain"][0], _tax_terms(taxes)[1],
+    )
+    check_withdrawals(pv, pmt, rate, n_years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    return pv
+
+
+def calculate_n_years_with_events(fv, pv, pmt, rate, events: dict = None, pauses=None, taxes: dict = None,
+                                  fees: dict = None, contribution_frequency=12, compounding_frequency=12,
+                                  iterations: int = 40) -> np.ndarray:
+    """
+    Premier horizon auquel FV est atteint, événements compris.
+
+    Avec des retraits ponctuels, la valeur peut baisser d'un mois à
+    l'autre : l'objectif peut être atteint, perdu puis de nouveau atteint.
+    On repère la première fin d'année où il est atteint (une passe
+    vectorisée sur 0 .. 100 ans), puis le premier mois où il l'est
+    (passe mensuelle jusqu'à cette fin d'année), et on affine par
+    dichotomie dans le mois précédent, où aucun flux ponctuel n'intervient.
+
+    Returns:
+        np.ndarray: Nombre d'années (np.inf si impossible en 100 ans)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide ou si un
+            retrait dépasse l'encours
+    """
+    validate_inputs(pv, pmt, rate, 0)
+    fv, pv, pmt, rate = (np.asarray(x, dtype=float) for x in (fv, pv, pmt, rate))
+    frequencies = (contribution_frequency, compounding_frequency)
+    pv_y, pmt_y, rate_y, fv_y = (np.expand_dims(x, -1) for x in (pv, pmt, rate, fv))
+    taxes_y, fees_y = _with_event_axis(taxes), _with_event_axis(fees)
+
+    # Fins d'année 0 .. 100 sur un axe final
+    year_ends = np.arange(MAX_HORIZON + 1, dtype=float)
+    reached_yearly = plan_breakdown(pv_y, pmt_y, rate_y, year_ends, events, pauses, taxes_y, fees_y,
+                                    *frequencies)["value"] >= fv_y
+    reachable = reached_yearly.any(axis=-1)
+    first_year = np.where(reachable, np.argmax(reached_yearly, axis=-1), 0)
+
+    # Fins de mois jusqu'à la dernière de ces fins d'année : premier passage au-dessus de FV
+    month_ends = np.arange(12 * int(first_year.max(initial=0)) + 1) / 12
+    reached_monthly = plan_breakdown(pv_y, pmt_y, rate_y, month_ends, events, pauses, taxes_y, fees_y,
+                                     *frequencies)["value"] >= fv_y
+    first_month = np.argmax(reached_monthly, axis=-1).astype(float)
+
+    low = np.maximum(first_month - 1, 0) / 12
+    high = first_month / 12
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        hit = plan_breakdown(pv, pmt, rate, middle, events, pauses, taxes, fees, *frequencies)["value"] >= fv
+        low = np.where(hit, low, middle)
+        high = np.where(hit, middle, high)
+
+    years = np.where(reachable, np.where(first_month == 0, 0.0, high), np.inf)
+    check_withdrawals(pv, pmt, rate, years, events, pauses, taxes, fees, contribution_frequency, compounding_frequency)
+    return years
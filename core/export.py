@@ -23,8 +23,10 @@ from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
-from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR
+from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR, TAX_COLOR, CONTRIBUTION_FREQUENCIES, COMPOUNDING_FREQUENCIES
+from core.calculations import equivalent_contribution
 from core.utils import fmt_money
+from core.results import SimulationResult
 
 
 def _hex_to_rgb(hex_color: str) -> tuple:
@@ -33,33 +35,15 @@ def _hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i+2], 16) / 255 for i in (0, 2, 4))
 
 
-def _create_portfolio_evolution_chart(pv: float, pmt: float, rate: float, n_years: float) -> io.BytesIO:
+def _create_portfolio_evolution_chart(schedule: dict) -> io.BytesIO:
     """
-    Crée un graphique matplotlib de l'évolution du portefeuille.
+    Crée un graphique matplotlib de l'évolution du portefeuille à partir
+    de l'échéancier (avec les frais et impôts payés cumulés s'ils y figurent).
     Retourne un buffer BytesIO contenant l'image PNG.
     """
-    months = int(n_years * 12)
-    rate_m = rate / 100 / 12
-    
-    # Génération des données
-    years_list = []
-    portfolio_values = []
-    invested_values = []
-    
-    value = pv
-    capital = pv
-    
-    years_list.append(0)
-    portfolio_values.append(pv)
-    invested_values.append(pv)
-    
-    for m in range(1, months + 1):
-        value = value * (1 + rate_m) + pmt
-        capital += pmt
-        
-        years_list.append(m / 12)
-        portfolio_values.append(value)
-        invested_values.append(capital)
+    years_list = schedule["year"]
+    portfolio_values = schedule["value"]
+    invested_values = schedule["invested"]
     
     # Création du graphique
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -69,6 +53,10 @@ def _create_portfolio_evolution_chart(pv: float, pmt: float, rate: float, n_year
     
     ax.plot(years_list, portfolio_values, color=primary_rgb, linewidth=2.5, label='Valeur Totale')
     ax.plot(years_list, invested_values, color=secondary_rgb, linewidth=2, linestyle='--', label='Capital Investi')
+    if "fees" in schedule:
+        ax.plot(years_list, schedule["fees"], color=_hex_to_rgb(ACCENT_COLOR), linewidth=2, linestyle=':', label='Frais Payés')
+    if "taxes" in schedule:
+        ax.plot(years_list, schedule["taxes"], color=_hex_to_rgb(TAX_COLOR), linewidth=2, linestyle='-.', label='Impôts Payés')
     
     ax.set_xlabel('Années', fontsize=11, fontweight='bold')
     ax.set_ylabel('Montant (FCFA)', fontsize=11, fontweight='bold')
@@ -143,17 +131,19 @@ def _create_pie_chart(total_invested: float, total_interest: float) -> io.BytesI
     return buf
 
 
-def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict = None) -> io.BytesIO:
+def create_pdf_report(inputs, calculation_mode: str, commercial_info: dict = None) -> io.BytesIO:
     """
     Génère un rapport PDF complet avec:
     - En-tête CGF GESTION
     - Informations commerciales
     - Paramètres de simulation
     - Résultats financiers
+    - Répartition annuelle Capital Investi / Intérêts
     - Graphiques
     
     Args:
-        inputs: Dictionnaire avec pv, pmt, fv, rate, n_years
+        inputs: Résultat de la simulation (core.results.SimulationResult, dont
+            l'échéancier est réutilisé) ou dictionnaire avec pv, pmt, fv, rate, n_years
         calculation_mode: Mode de calcul utilisé
         commercial_info: Dictionnaire avec interlocuteur, client_name, country, date
     
@@ -231,20 +221,46 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
     story.append(Paragraph(f"<b>Mode de calcul:</b> {calculation_mode}", normal_style))
     story.append(Spacer(1, 0.3*cm))
     
-    pv = inputs.get('pv', 0)
-    pmt = inputs.get('pmt', 0)
-    fv = inputs.get('fv', 0)
-    rate = inputs.get('rate', 0)
-    n_years = inputs.get('n_years', 0)
+    result = inputs if isinstance(inputs, SimulationResult) else SimulationResult.from_inputs(inputs, calculation_mode)
+    pv, pmt, fv, rate, n_years = result.pv, result.pmt, result.fv, result.rate, result.n_years
+    contribution_frequency, compounding_frequency = result.frequencies
+    fees = result.fees
+    has_fees = result.has_fees
+    taxes = result.taxes
+    events = result.events
+    pauses = result.pauses
+    period_label = {v: k for k, v in CONTRIBUTION_FREQUENCIES.items()}.get(contribution_frequency, "Périodique")
+    compounding_label = {v: k for k, v in COMPOUNDING_FREQUENCIES.items()}.get(compounding_frequency, "Mensuelle")
     
     params_data = [
         ["Paramètre", "Valeur"],
         ["Montant Initial", fmt_money(pv)],
-        ["Versement Mensuel", fmt_money(pmt)],
+        [f"Versement {period_label}", fmt_money(pmt)],
         ["Rendement Annuel", f"{rate:.2f} %"],
+        ["Capitalisation des intérêts", compounding_label],
         ["Horizon de Placement", f"{n_years:.1f} ans"],
         ["Objectif (Montant Final)", fmt_money(fv)],
     ]
+    if has_fees:
+        params_data += [
+            ["Droits d'entrée", f"{fees.get('entry_fee', 0):.2f} %"],
+            ["Frais de gestion annuels", f"{fees.get('management_fee', 0):.2f} %"],
+            ["Commission de performance", f"{fees.get('performance_fee', 0):.1f} % au-delà de {fees.get('hurdle_rate', 0):.2f} %"],
+        ]
+    if taxes:
+        params_data += [
+            ["Fiscalité", result.tax_country or ''],
+            ["Retenue à la source sur les revenus", f"{taxes['withholding']:.1f} % ({taxes['income_share']:.0f} % du rendement)"],
+            ["Imposition des plus-values", f"{taxes['capital_gains']:.1f} %"],
+        ]
+    # Seuls les flux antérieurs à l'horizon comptent (une prime annuelle couvre 100 ans)
+    events_in_plan = [amount for month, amount in events.items() if month <= n_years * 12]
+    if events_in_plan:
+        params_data.append(
+            ["Versements exceptionnels", f"{len(events_in_plan)} opération(s), total {fmt_money(sum(events_in_plan))}"]
+        )
+    for first, length in pauses:
+        params_data.append(["Pause des versements", f"{int(length)} mois à partir du mois {int(first)}"])
     
     params_table = Table(params_data, colWidths=[8*cm, 8*cm])
     params_table.setStyle(TableStyle([
@@ -267,9 +283,11 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
     # ====== RÉSULTATS FINANCIERS ======
     story.append(Paragraph("Résultats Financiers", heading_style))
     
-    total_capital = fv
-    total_invested = pv + (pmt * n_years * 12)
-    total_interest = total_capital - total_invested
+    totals = result.totals
+    total_capital = totals["capital"]
+    total_invested = totals["invested"]
+    total_interest = totals["interest"]
+    total_fees, total_taxes = totals["fees"], totals["taxes"]
     
     results_data = [
         ["Métrique", "Montant", "% du Total"],
@@ -277,6 +295,14 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
         ["Capital Investi", fmt_money(total_invested), f"{(total_invested/total_capital*100) if total_capital > 0 else 0:.1f}%"],
         ["Intérêts Générés", fmt_money(total_interest), f"{(total_interest/total_capital*100) if total_capital > 0 else 0:.1f}%"],
     ]
+    if has_fees:
+        results_data.append(
+            ["Frais Payés", fmt_money(total_fees), f"{(total_fees/total_capital*100) if total_capital > 0 else 0:.1f}%"]
+        )
+    if taxes:
+        results_data.append(
+            ["Impôts Payés", fmt_money(total_taxes), f"{(total_taxes/total_capital*100) if total_capital > 0 else 0:.1f}%"]
+        )
     
     results_table = Table(results_data, colWidths=[6*cm, 6*cm, 4*cm])
     results_table.setStyle(TableStyle([
@@ -296,15 +322,12 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
     story.append(results_table)
     story.append(Spacer(1, 0.5*cm))
     
-    # Équivalents du versement mensuel si applicable
+    # Équivalents du versement aux autres fréquences (même valeur acquise sur un an)
     if pmt > 0:
-        story.append(Paragraph("Équivalents du Versement Mensuel", heading_style))
-        equiv_data = [
-            ["Période", "Montant"],
-            ["Mensuel", fmt_money(pmt)],
-            ["Trimestriel", fmt_money(pmt * 3)],
-            ["Semestriel", fmt_money(pmt * 6)],
-            ["Annuel", fmt_money(pmt * 12)],
+        story.append(Paragraph(f"Équivalents du Versement {period_label}", heading_style))
+        equiv_data = [["Période", "Montant"]] + [
+            [label, fmt_money(float(equivalent_contribution(pmt, rate, contribution_frequency, frequency, compounding_frequency)))]
+            for label, frequency in CONTRIBUTION_FREQUENCIES.items()
         ]
         
         equiv_table = Table(equiv_data, colWidths=[8*cm, 8*cm])
@@ -321,6 +344,35 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
         story.append(equiv_table)
         story.append(Spacer(1, 0.5*cm))
     
+    # ====== RÉPARTITION ANNUELLE ======
+    yearly = result.yearly
+    if len(yearly["year"]) > 0:
+        story.append(Paragraph("Répartition Annuelle", heading_style))
+        # Colonnes optionnelles (frais, impôts) selon les options de la simulation
+        columns = [("invested", "Capital Investi"), ("interest", "Intérêts Générés"),
+                   ("fees", "Frais Payés"), ("taxes", "Impôts Payés"), ("value", "Valeur en Fin d'Année")]
+        columns = [(key, title) for key, title in columns if key in yearly]
+        yearly_data = [["Année"] + [title for _, title in columns]]
+        yearly_data += [
+            [str(year)] + [fmt_money(yearly[key][i]) for key, _ in columns]
+            for i, year in enumerate(yearly["year"])
+        ]
+        col_widths = [2.5*cm] + [13.5*cm / len(columns)] * len(columns)
+        
+        yearly_table = Table(yearly_data, colWidths=col_widths, repeatRows=1)
+        yearly_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY_COLOR)),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+        ]))
+        story.append(yearly_table)
+        story.append(Spacer(1, 0.5*cm))
+    
     # ====== GRAPHIQUES ======
     story.append(PageBreak())
     story.append(Paragraph("Visualisations", heading_style))
@@ -328,7 +380,7 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
     
     # Graphique d'évolution
     story.append(Paragraph("Évolution du Portefeuille", normal_style))
-    chart_buffer = _create_portfolio_evolution_chart(pv, pmt, rate, n_years)
+    chart_buffer = _create_portfolio_evolution_chart(result.schedule)
     chart_img = Image(chart_buffer, width=16*cm, height=9.6*cm)
     story.append(chart_img)
     story.append(Spacer(1, 0.5*cm))
@@ -347,7 +399,7 @@ def create_pdf_report(inputs: dict, calculation_mode: str, commercial_info: dict
     roi = ((total_interest / total_invested) * 100) if total_invested > 0 else 0
     comment = f"""
     Cette simulation montre qu'avec un investissement initial de {fmt_money(pv)} 
-    et des versements mensuels de {fmt_money(pmt)} sur une période de {n_years:.1f} ans 
+    et des versements ({period_label.lower()}s) de {fmt_money(pmt)} sur une période de {n_years:.1f} ans 
     avec un rendement annuel de {rate:.2f}%, vous pouvez atteindre un capital total de {fmt_money(total_capital)}.
     <br/><br/>
     Le capital investi total s'élève à {fmt_money(total_invested)}, 
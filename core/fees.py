@@ -0,0 +1,235 @@
+# core/fees.py
+# ---------------------------------------------------------
+# Prise en compte des frais dans les projections :
+# - droits d'entrée prélevés sur chaque versement (et le capital initial)
+# - frais de gestion annuels, prélevés mensuellement sur l'encours
+# - commission de performance sur le rendement au-delà d'un plancher
+#
+# Les frais courants se traduisent par un taux instantané net
+# δ_net = 12·ln(g), g étant le facteur mensuel net de frais :
+#     g = (G - c·max(G - H, 0))·(1 - f/12)
+# avec G et H les facteurs mensuels du rendement brut et du plancher,
+# c la commission de performance et f les frais de gestion. Tous les
+# solveurs réutilisent alors ceux de core/calculations (forme fermée)
+# avec le taux net en capitalisation continue.
+#
+# `fees` est un dict {"entry_fee", "management_fee", "performance_fee",
+# "hurdle_rate"} (en %, clés absentes = 0). Ses valeurs peuvent être des
+# tableaux NumPy : plusieurs structures de frais sont alors évaluées côte
+# à côte en un seul appel.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import (
+    _force_of_interest,
+    periodic_factors,
+    calculate_fv_periodic,
+    calculate_pmt_periodic,
+    calculate_pv_periodic,
+    calculate_n_years_periodic,
+    solve_all,
+)
+
+FEE_KEYS = ("entry_fee", "management_fee", "performance_fee", "hurdle_rate")
+
+
+def _fee_terms(fees: dict = None) -> tuple:
+    """Retourne (entry_fee, management_fee, performance_fee, hurdle_rate) en %."""
+    fees = fees or {}
+    return tuple(np.asarray(fees.get(key, 0.0), dtype=float) for key in FEE_KEYS)
+
+
+def net_force_of_interest(rate, fees: dict = None, compounding_frequency=12) -> np.ndarray:
+    """
+    Taux instantané annuel net de frais courants (gestion et performance).
+
+    Args:
+        rate: Rendement brut annuel en %
+        fees: Structure de frais (voir en-tête du module)
+        compounding_frequency: Capitalisations par an du rendement brut
+
+    Returns:
+        np.ndarray: δ_net (en fraction, non en %)
+    """
+    _, management_fee, performance_fee, hurdle_rate = _fee_terms(fees)
+    gross = np.exp(_force_of_interest(rate, compounding_frequency) / 12)
+    hurdle = np.exp(_force_of_interest(hurdle_rate, compounding_frequency) / 12)
+
+    after_performance = gross - performance_fee / 100 * np.maximum(gross - hurdle, 0)
+    return 12 * np.log(after_performance * (1 - management_fee / 1200))
+
+
+def net_effective_rate(rate, fees: dict = None, compounding_frequency=12) -> np.ndarray:
+    """Rendement annuel effectif net de frais courants, en %."""
+    return np.expm1(net_force_of_interest(rate, fees, compounding_frequency)) * 100
+
+
+def _net_terms(rate, fees, compounding_frequency) -> tuple:
+    """(part investie après droits d'entrée, taux net en % capitalisé en continu)."""
+    entry_fee = _fee_terms(fees)[0]
+    return 1 - entry_fee / 100, net_force_of_interest(rate, fees, compounding_frequency) * 100
+
+
+def calculate_fv_with_fees(pv, pmt, rate, n_years, fees: dict = None,
+                           contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Valeur future nette de tous les frais.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    return calculate_fv_periodic(pv * kept, pmt * kept, rate_net, n_years, contribution_frequency, np.inf)
+
+
+def calculate_pmt_with_fees(fv, pv, rate, n_years, fees: dict = None,
+                            contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Versement (frais d'entrée inclus) nécessaire pour atteindre FV net de frais.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    return calculate_pmt_periodic(fv, pv * kept, rate_net, n_years, contribution_frequency, np.inf) / kept
+
+
+def calculate_pv_with_fees(fv, pmt, rate, n_years, fees: dict = None,
+                           contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Montant initial (frais d'entrée inclus) nécessaire pour atteindre FV net de frais.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    return calculate_pv_periodic(fv, pmt * kept, rate_net, n_years, contribution_frequency, np.inf) / kept
+
+
+def calculate_n_years_with_fees(fv, pv, pmt, rate, fees: dict = None,
+                                contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Horizon nécessaire pour atteindre FV net de frais.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    return calculate_n_years_periodic(fv, pv * kept, pmt * kept, rate_net, contribution_frequency, np.inf)
+
+
+def solve_all_with_fees(fv, pv, pmt, rate, n_years, fees: dict = None,
+                        contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Version nette de frais de `core.calculations.solve_all` : quadruplet
+    complet (inconnue marquée par np.nan) et totaux, en une évaluation.
+
+    Les sommes versées incluent les droits d'entrée ; les intérêts sont
+    nets de tous les frais.
+
+    Raises:
+        CalculationError: Si un paramètre est invalide ou s'il y a plus
+            d'une inconnue pour une même simulation
+    """
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    solved = solve_all(fv, np.asarray(pv) * kept, np.asarray(pmt) * kept, rate_net, n_years,
+                       contribution_frequency, np.inf)
+    invested = solved["invested"] / kept
+    return {
+        "fv": solved["fv"],
+        "pv": solved["pv"] / kept,
+        "pmt": solved["pmt"] / kept,
+        "n_years": solved["n_years"],
+        "invested": invested,
+        "interest": solved["fv"] - invested,
+    }
+
+
+def balance_factors(rate_net, n_years, contribution_frequency=12) -> tuple:
+    """
+    Facteurs de la somme des encours mensuels Σ V_j (mois 0 à N - 1) d'un
+    placement au taux `rate_net` (en %, capitalisation continue) :
+    Σ V_j = pv·pv_sum + pmt·pmt_sum.
+
+    Comme V_N = pv + pmt·k + (g - 1)·Σ V_j (g : facteur mensuel), on a
+    pv_sum = (Gn - 1) / (g - 1) et pmt_sum = (A - k) / (g - 1), avec une
+    limite linéaire si le taux est nul.
+
+    Returns:
+        tuple: (growth, annuity, n_payments, pv_sum, pmt_sum)
+    """
+    growth, annuity, n_payments = periodic_factors(rate_net, n_years, contribution_frequency, np.inf)
+    monthly_step = np.expm1(np.asarray(rate_net, dtype=float) / 100 / 12)
+    n_years = np.asarray(n_years, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_step = np.where(monthly_step == 0, 1.0, monthly_step)
+        pv_sum = np.where(monthly_step == 0, 12 * n_years, (growth - 1) / safe_step)
+        pmt_sum = np.where(
+            monthly_step == 0,
+            12 * (n_payments * n_years - n_payments * (n_payments + 1) / (2 * contribution_frequency)),
+            (annuity - n_payments) / safe_step,
+        )
+    return growth, annuity, n_payments, pv_sum, pmt_sum
+
+
+def fees_paid(pv, pmt, rate, n_years, fees: dict = None,
+              contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Frais effectivement payés jusqu'à l'horizon (forme fermée).
+
+    Chaque mois, les frais courants prélèvent (G - g)·V sur l'encours V
+    (G, g : facteurs mensuels brut et net). Leur cumul vaut donc
+    (G - g)·Σ V_j (voir `balance_factors`).
+
+    Returns:
+        dict: Tableaux NumPy (diffusés) :
+            - "entry" : droits d'entrée cumulés
+            - "ongoing" : frais de gestion et de performance cumulés
+            - "total" : total des frais payés
+    """
+    entry_fee = _fee_terms(fees)[0]
+    kept, rate_net = _net_terms(rate, fees, compounding_frequency)
+    monthly_gross = np.exp(_force_of_interest(rate, compounding_frequency) / 12)
+    monthly_step = np.expm1(rate_net / 100 / 12)
+
+    _, _, n_payments, pv_sum, pmt_sum = balance_factors(rate_net, n_years, contribution_frequency)
+    balances = pv * kept * pv_sum + pmt * kept * pmt_sum
+
+    entry = entry_fee / 100 * (pv + pmt * n_payments)
+    ongoing = (monthly_gross - 1 - monthly_step) * balances
+    return {"entry": entry, "ongoing": ongoing, "total": entry + ongoing}
+
+
+def compare_fee_structures(pv, pmt, rate, n_years, structures: dict,
+                           contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Compare plusieurs structures de frais en un seul appel vectorisé.
+
+    Args:
+        structures: {nom: dict de frais}, par ex. `config.FEE_STRUCTURES`
+
+    Returns:
+        dict: Tableaux NumPy alignés sur l'ordre des structures :
+            - "name" : noms des structures
+            - "fv" : valeur future nette de frais
+            - "fees_paid" : total des frais payés
+            - "cost" : manque à gagner total (valeur sans frais - valeur nette),
+              frais payés + rendement perdu sur ces frais
+            - "net_rate" : rendement effectif annuel net de frais courants (%)
+    """
+    names = list(structures)
+    fees = {key: np.array([structures[name].get(key, 0.0) for name in names]) for key in FEE_KEYS}
+    frequencies = (contribution_frequency, compounding_frequency)
+
+    fv = calculate_fv_with_fees(pv, pmt, rate, n_years, fees, *frequencies)
+    gross_fv = calculate_fv_periodic(pv, pmt, rate, n_years, *frequencies)
+
+    return {
+        "name": names,
+        "fv": fv,
+        "fees_paid": fees_paid(pv, pmt, rate, n_years, fees, *frequencies)["total"],
+        "cost": gross_fv - fv,
+        "net_rate": net_effective_rate(rate, fees, compounding_frequency),
+    }
@@ -0,0 +1,206 @@
+# core/glidepath.py
+# ---------------------------------------------------------
+# Allocation « cycle de vie » (glide path) : la part de l'actif risqué
+# diminue à mesure que l'échéance (départ à la retraite, par ex.)
+# approche, selon une courbe paramétrable.
+#
+# Avec un rééquilibrage mensuel, le facteur de croissance du portefeuille
+# au mois m vaut g_m = Σ_a w_(m,a)·g_(m,a) : la distribution des
+# rendements effectifs mois par mois ne dépend que de la trajectoire
+# d'allocation et de l'échéance, pas du client. Elle est calculée une
+# seule fois (en cache) et partagée par tous les clients de même
+# échéance (une « cohorte »).
+#
+# La valeur d'une trajectoire est linéaire en (pv, pmt) :
+#     V_m = pv·P_m + pmt·S_m
+# avec P_m (capitalisation de 1 FCFA initial) et S_m (de 1 FCFA versé
+# chaque mois) par trajectoire. Seuls les facteurs finaux P_N et S_N sont
+# conservés en cache : projeter des milliers de clients revient alors à
+# un produit extérieur, sans nouvelle simulation.
+# ---------------------------------------------------------
+
+from functools import lru_cache
+
+import numpy as np
+
+from core.config import (
+    ASSET_CLASSES,
+    ASSET_CORRELATIONS,
+    GLIDE_PATH_SHAPES,
+    GLIDE_DEFENSIVE_MIX,
+    SIMULATION_PATHS,
+    SIMULATION_SEED,
+)
+from core.portfolio import simulate_asset_returns
+from core.stochastic import _path_values, contribution_factors, path_percentiles
+
+# Mémoire maximale (nombre de valeurs) d'un bloc clients × trajectoires
+COHORT_BLOCK_SIZE = 5_000_000
+
+
+def glide_weights(years_to_target, start_weight: float, end_weight: float, glide_years: float,
+                  shape: str = "Linéaire", defensive_mix=GLIDE_DEFENSIVE_MIX) -> np.ndarray:
+    """
+    Allocation cible en fonction du temps restant avant l'échéance.
+
+    La part risquée vaut `start_weight` tant que l'échéance est à plus de
+    `glide_years` ans, puis décroît jusqu'à `end_weight` à l'échéance :
+        risqué = fin + (début - fin)·x^k,  x = min(restant / glide_years, 1)
+
+    Args:
+        years_to_target: Années restantes avant l'échéance (tableau accepté)
+        start_weight: Part de l'actif risqué en début de parcours (%)
+        end_weight: Part de l'actif risqué à l'échéance (%)
+        glide_years: Durée de la décroissance en années
+        shape: Forme de la courbe (clé de GLIDE_PATH_SHAPES)
+        defensive_mix: Poids relatifs des autres actifs (le premier, l'actif
+            risqué, est ignoré)
+
+    Returns:
+        np.ndarray: Poids en % de forme (..., n_actifs), de somme 100
+    """
+    remaining = np.maximum(np.asarray(years_to_target, dtype=float), 0)
+    progress = np.minimum(remaining / glide_years, 1.0) if glide_years > 0 else (remaining > 0).astype(float)
+    risky = end_weight + (start_weight - end_weight) * progress ** GLIDE_PATH_SHAPES[shape]
+
+    defensive = np.asarray(defensive_mix, dtype=float)[1:]
+    defensive = defensive / defensive.sum()
+    return np.concatenate([risky[..., None], (100 - risky)[..., None] * defensive], axis=-1)
+
+
+@lru_cache(maxsize=1)
+def _glide_path_growth(n_months: int, start_weight: float, end_weight: float, glide_years: float,
+                       shape: str, rates: tuple, volatilities: tuple, correlations: tuple,
+                       n_paths: int, seed: int) -> tuple:
+    """
+    Simulation d'une trajectoire d'allocation : (poids, facteurs de croissance).
+
+    La matrice (n_paths, n_mois) pèse jusqu'à ~50 Mo à 100 ans : seule la
+    dernière simulation est conservée, le temps que facteurs et
+    percentiles d'une même réexécution de page la réutilisent.
+    """
+    # Allocation de chaque mois, fixée en début de mois (rééquilibrage mensuel)
+    weights = glide_weights((n_months - np.arange(n_months)) / 12, start_weight, end_weight, glide_years, shape)
+    asset_growth = simulate_asset_returns(rates, volatilities, correlations, n_months, n_paths, seed)
+    growth = np.einsum("pma,ma->pm", asset_growth, weights / 100)
+    weights.flags.writeable = False
+    growth.flags.writeable = False
+    return weights, growth
+
+
+@lru_cache(maxsize=16)
+def _glide_path_factors(*key) -> dict:
+    """Calcul effectif (en cache, quelques centaines de Ko par entrée) de `glide_path_factors`."""
+    weights, growth = _glide_path_growth(*key)
+    finals = contribution_factors(growth)
+    factors = {
+        "month": np.arange(growth.shape[1] + 1),
+        "weights": weights,
+        "initial": finals[:, 0].copy(),
+        "contributions": finals[:, 1].copy(),
+    }
+    for array in factors.values():
+        array.flags.writeable = False
+    return factors
+
+
+@lru_cache(maxsize=16)
+def _glide_path_percentiles(pv: float, pmt: float, percentiles: tuple, *key) -> dict:
+    """Calcul effectif (en cache) de `glide_path_percentiles`."""
+    _, growth = _glide_path_growth(*key)
+    return path_percentiles(_path_values(pv, np.full((1, growth.shape[1]), pmt), growth), percentiles)
+
+
+def _cache_key(n_years: float, glide_path: dict, assets: dict, correlations, n_paths: int, seed: int) -> tuple:
+    """Arguments hachables de la simulation (clé des caches)."""
+    return (
+        int(round(n_years * 12)),
+        float(glide_path["start_weight"]), float(glide_path["end_weight"]),
+        float(glide_path["glide_years"]), glide_path["shape"],
+        tuple(asset["rate"] for asset in assets.values()),
+        tuple(asset["volatility"] for asset in assets.values()),
+        tuple(map(tuple, np.asarray(correlations, dtype=float))),
+        n_paths, seed,
+    )
+
+
+def glide_path_factors(n_years: float, glide_path: dict, assets: dict = ASSET_CLASSES,
+                       correlations=ASSET_CORRELATIONS, n_paths: int = SIMULATION_PATHS,
+                       seed: int = SIMULATION_SEED) -> dict:
+    """
+    Allocation et facteurs de capital final d'une trajectoire
+    d'allocation, pour une échéance dans `n_years` ans.
+
+    Le résultat est mis en cache : tous les clients de même échéance et
+    de même trajectoire réutilisent la même simulation. Seuls les
+    facteurs finaux sont conservés (pas les trajectoires mois par mois).
+
+    Args:
+        n_years: Années restantes avant l'échéance
+        glide_path: {"start_weight", "end_weight", "glide_years", "shape"}
+            (voir `glide_weights` et config.DEFAULT_GLIDE_PATH)
+        assets: Classes d'actifs {nom: {"rate", "volatility"}}, l'actif
+            risqué en premier
+        correlations: Matrice de corrélation des actifs
+        n_paths: Nombre de trajectoires
+        seed: Graine du générateur
+
+    Returns:
+        dict (tableaux en lecture seule) :
+            - "month" : mois 0 .. n_mois
+            - "weights" : allocation (n_mois, n_actifs) en %
+            - "initial" : P_N, valeur finale de 1 FCFA placé au mois 0 (n_paths,)
+            - "contributions" : S_N, valeur finale de 1 FCFA versé chaque mois (n_paths,)
+    """
+    return _glide_path_factors(*_cache_key(n_years, glide_path, assets, correlations, n_paths, seed))
+
+
+def glide_path_percentiles(pv: float, pmt: float, n_years: float, glide_path: dict,
+                           assets: dict = ASSET_CLASSES, correlations=ASSET_CORRELATIONS,
+                           n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED,
+                           percentiles=(5, 25, 50, 75, 95)) -> dict:
+    """
+    Percentiles du capital d'un client, mois par mois et au terme (voir
+    `core.stochastic.path_percentiles`), sur la simulation de
+    `glide_path_factors` (mêmes arguments).
+
+    Les trajectoires V_m = pv·P_m + pmt·S_m ne sont pas conservées :
+    seules les bandes de percentiles sont mises en cache.
+    """
+    key = _cache_key(n_years, glide_path, assets, correlations, n_paths, seed)
+    return _glide_path_percentiles(float(pv), float(pmt), tuple(percentiles), *key)
+
+
+def cohort_projection(pv, pmt, factors: dict, percentiles=(5, 25, 50, 75, 95)) -> dict:
+    """
+    Capital final de chaque client d'une cohorte (même échéance, même
+    trajectoire d'allocation), à partir des facteurs partagés.
+
+    Les percentiles portent sur des combinaisons pv·P + pmt·S propres à
+    chaque client : ils sont calculés par blocs de clients pour borner la
+    mémoire, sans nouvelle simulation.
+
+    Args:
+        pv: Montants initiaux des clients (tableau (n_clients,))
+        pmt: Versements mensuels des clients (tableau (n_clients,))
+        factors: Résultat de `glide_path_factors`
+
+    Returns:
+        dict:
+            - "mean" : capital final moyen de chaque client
+            - "final_percentiles" : {p: capital final au p-ième percentile, par client}
+    """
+    pv, pmt = np.broadcast_arrays(np.atleast_1d(np.asarray(pv, dtype=float)), np.asarray(pmt, dtype=float))
+    initial, contributions = factors["initial"], factors["contributions"]
+    block = max(COHORT_BLOCK_SIZE // len(initial), 1)
+
+    bands = np.empty((len(percentiles), len(pv)))
+    for start in range(0, len(pv), block):
+        clients = slice(start, start + block)
+        finals = pv[clients, None] * initial + pmt[clients, None] * contributions
+        bands[:, clients] = np.percentile(finals, percentiles, axis=1)
+
+    return {
+        "mean": pv * initial.mean() + pmt * contributions.mean(),
+        "final_percentiles": dict(zip(percentiles, bands)),
+    }
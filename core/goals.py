@@ -0,0 +1,201 @@
+# core/goals.py
+# ---------------------------------------------------------
+# Planification de plusieurs objectifs financés par un même flux de
+# versements (frais de scolarité, logement, retraite...) :
+# - versement minimal qui finance tous les objectifs (forme fermée)
+# - objectifs finançables avec un budget donné, par ordre de priorité
+# - répartition du versement entre les objectifs
+# - échéancier de chaque objectif, tous calculés en une seule passe
+#
+# Modèle : un compte commun reçoit le capital initial et les versements
+# réguliers jusqu'au dernier objectif ; chaque objectif est un retrait de
+# son montant à sa date. Le plan est réalisable si le solde reste positif
+# après chaque retrait : une contrainte par objectif,
+#     pv·G(t_j) + pmt·A(t_j) >= Σ_(t_k <= t_j) montant_k·G(t_j - t_k),
+# linéaire en pmt. Toutes les contraintes sont évaluées d'un coup sous
+# forme de matrice (objectifs × objectifs), en O(K²) pour K objectifs.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import periodic_factors
+
+
+def _goal_arrays(goals: list) -> tuple:
+    """
+    Tableaux (names, amounts, years, priorities) triés par date.
+
+    `goals` : liste de dicts {"name", "amount", "year", "priority"}
+    (priorité 1 = la plus importante ; par défaut l'ordre de la liste).
+    """
+    goals = sorted(enumerate(goals), key=lambda item: (item[1]["year"], item[0]))
+    names = [goal.get("name", f"Objectif {index + 1}") for index, goal in goals]
+    amounts = np.array([goal["amount"] for _, goal in goals], dtype=float)
+    years = np.array([goal["year"] for _, goal in goals], dtype=float)
+    priorities = np.array([goal.get("priority", index + 1) for index, goal in goals], dtype=float)
+    return names, amounts, years, priorities
+
+
+def _constraints(pv, amounts, years, rate, included, contribution_frequency=12, compounding_frequency=12) -> tuple:
+    """
+    Contraintes de solde aux dates des objectifs, pour un ou plusieurs
+    sous-ensembles d'objectifs retenus.
+
+    Args:
+        included: Masque booléen (..., K) des objectifs retenus
+
+    Returns:
+        tuple: (need, annuity) de forme (..., K) : le plan est réalisable
+            ssi pmt·annuity[j] >= need[j] pour tout objectif j
+    """
+    growth, annuity, _ = periodic_factors(rate, years, contribution_frequency, compounding_frequency)
+    # G(t_j - t_k) pour t_k <= t_j : matrice triangulaire (j, k)
+    elapsed = years[:, None] - years[None, :]
+    carried = np.where(
+        elapsed >= 0,
+        periodic_factors(rate, np.maximum(elapsed, 0), contribution_frequency, compounding_frequency)[0],
+        0.0,
+    )
+    withdrawals = (np.asarray(included, dtype=float) * amounts) @ carried.T
+    return withdrawals - pv * growth, annuity
+
+
+def _minimal_pmt(need, annuity) -> np.ndarray:
+    """Versement minimal satisfaisant toutes les contraintes (0 si le capital suffit)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        required = np.where(annuity > 0, need / annuity, np.where(need > 0, np.inf, 0.0))
+    return required.max(axis=-1, initial=0.0)
+
+
+def plan_goals(pv: float, goals: list, rate: float, pmt: float = None,
+               contribution_frequency: float = 12, compounding_frequency: float = 12) -> dict:
+    """
+    Planifie plusieurs objectifs financés par un même compte.
+
+    Args:
+        pv: Capital initial
+        goals: Liste de dicts {"name", "amount", "year", "priority"}
+        rate: Rendement annuel en %
+        pmt: Budget de versement ; None pour retenir le versement minimal
+        contribution_frequency: Versements par an (12 : mensuels)
+        compounding_frequency: Capitalisations par an (np.inf : continue)
+
+    Returns:
+        dict (objectifs triés par date) :
+            - "name", "amount", "year", "priority" : description des objectifs
+            - "minimal_pmt" : versement minimal finançant tous les objectifs
+            - "pmt" : versement retenu (budget ou versement minimal)
+            - "feasible" : True si le versement retenu finance tous les objectifs
+            - "funded" : booléens, objectifs financés (par ordre de priorité)
+            - "fundable_amount" : montant finançable pour chaque objectif
+              (son montant s'il est financé ; sinon la part finançable avec
+              la marge restante, servie par ordre de priorité)
+            - "allocation" : part du versement minimal attribuable à chaque
+              objectif (hausse du versement minimal quand on l'ajoute, par
+              ordre de priorité) ; la somme vaut "minimal_pmt"
+    """
+    names, amounts, years, priorities = _goal_arrays(goals)
+    n_goals = len(amounts)
+    frequencies = (contribution_frequency, compounding_frequency)
+
+    # Sous-ensembles emboîtés par priorité : ligne i = les i + 1 objectifs les plus prioritaires
+    rank = np.argsort(np.argsort(priorities, kind="stable"), kind="stable")
+    prefixes = rank[None, :] <= np.arange(n_goals)[:, None]
+    need, annuity = _constraints(pv, amounts, years, rate, prefixes, *frequencies)
+    prefix_pmt = _minimal_pmt(need, annuity)
+    minimal_pmt = float(prefix_pmt[-1]) if n_goals else 0.0
+    allocation = np.diff(prefix_pmt, prepend=0.0)[rank]
+
+    pmt = minimal_pmt if pmt is None else float(pmt)
+
+    # Objectifs retenus un à un par priorité, tant que le budget suffit
+    funded = np.zeros(n_goals, dtype=bool)
+    for goal in np.argsort(priorities, kind="stable"):
+        candidate = funded.copy()
+        candidate[goal] = True
+        need, annuity = _constraints(pv, amounts, years, rate, candidate, *frequencies)
+        if np.all(pmt * annuity >= need - 1e-6):
+            funded = candidate
+
+    # Montant finançable : marge restante aux dates postérieures, ramenée à la date de l'objectif
+    fundable = amounts.copy()
+    need, annuity = _constraints(pv, amounts, years, rate, funded, *frequencies)
+    slack = pmt * annuity - need
+    elapsed = years[:, None] - years[None, :]
+    carried = periodic_factors(rate, np.maximum(elapsed, 0), *frequencies)[0]
+    for goal in np.argsort(priorities, kind="stable"):
+        if funded[goal]:
+            continue
+        later = years >= years[goal]
+        fundable[goal] = max(0.0, float(np.min(slack[later] / carried[later, goal])))
+        slack[later] -= fundable[goal] * carried[later, goal]
+
+    return {
+        "name": names,
+        "amount": amounts,
+        "year": years,
+        "priority": priorities,
+        "minimal_pmt": minimal_pmt,
+        "pmt": pmt,
+        "feasible": bool(funded.all()),
+        "funded": funded,
+        "fundable_amount": fundable,
+        "allocation": allocation,
+    }
+
+
+def goal_schedules(pv: float, goals: list, rate: float, pmt: float,
+                   contribution_frequency: float = 12, compounding_frequency: float = 12) -> dict:
+    """
+    Échéancier mensuel du compte commun et de la part réservée à chaque
+    objectif, calculés en une seule passe (matrice objectifs × mois).
+
+    La réserve d'un objectif est le montant qu'il faudrait détenir
+    aujourd'hui pour le financer à sa date (valeur actuelle de son
+    montant). Le solde du compte est affecté aux réserves par ordre de
+    priorité ; le taux de couverture indique la part financée.
+
+    Returns:
+        dict :
+            - "name" : objectifs triés par date
+            - "month", "year" : grille mensuelle jusqu'au dernier objectif
+            - "balance" : solde du compte (après les retraits)
+            - "required" : matrice (objectifs, mois) des réserves nécessaires
+            - "reserved" : matrice (objectifs, mois) du solde affecté
+            - "coverage" : matrice (objectifs, mois) du taux de couverture
+              (1 = objectif entièrement provisionné, nan après sa date)
+    """
+    names, amounts, years, priorities = _goal_arrays(goals)
+    frequencies = (contribution_frequency, compounding_frequency)
+    months = np.arange(int(np.ceil(years.max() * 12 - 1e-9)) + 1) if len(years) else np.arange(1)
+    t = months / 12
+
+    growth, annuity, _ = periodic_factors(rate, t, *frequencies)
+    elapsed = t[None, :] - years[:, None]
+    paid = elapsed >= -1e-9
+    carried = periodic_factors(rate, np.maximum(elapsed, 0), *frequencies)[0]
+    balance = pv * growth + pmt * annuity - np.sum(np.where(paid, amounts[:, None] * carried, 0.0), axis=0)
+
+    # Réserves : montant actualisé tant que l'objectif n'est pas atteint
+    discount = 1 / periodic_factors(rate, np.maximum(-elapsed, 0), *frequencies)[0]
+    required = np.where(paid, 0.0, amounts[:, None] * discount)
+
+    # Affectation du solde par ordre de priorité (sommes cumulées, sans boucle)
+    order = np.argsort(priorities, kind="stable")
+    cumulative = np.cumsum(required[order], axis=0)
+    covered = np.minimum(cumulative, np.maximum(balance, 0)[None, :])
+    reserved = np.empty_like(required)
+    reserved[order] = np.diff(covered, axis=0, prepend=0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = np.where(paid, np.nan, reserved / required)
+
+    return {
+        "name": names,
+        "month": months,
+        "year": t,
+        "balance": balance,
+        "required": required,
+        "reserved": reserved,
+        "coverage": coverage,
+    }
@@ -0,0 +1,227 @@
+# core/inflation.py
+# ---------------------------------------------------------
+# Raisonnement en termes réels (FCFA constants, pouvoir d'achat
+# d'aujourd'hui) :
+# - taux réel exact (relation de Fisher mensuelle)
+# - déflateurs mois par mois
+# - échéancier nominal / réel
+# - solveurs en termes réels pour les quatre modes de calcul
+#   (FV, PMT, PV, horizon), avec ou sans indexation des versements
+# - bilan d'un plan sous plusieurs hypothèses d'inflation
+#
+# Conventions : capitalisation mensuelle comme dans core/calculations,
+# inflation mensuelle = inflation annuelle / 12. Un versement « indexé »
+# de pmt FCFA d'aujourd'hui vaut pmt·(1 + i)^m FCFA courants au mois m.
+# Tous les arguments acceptent des tableaux NumPy (broadcasting) : un
+# tableau d'inflations évalue plusieurs hypothèses en un seul appel.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import (
+    calculate_fv_batch,
+    calculate_pmt_batch,
+    calculate_pv_batch,
+    calculate_n_years_batch,
+    growth_factors,
+)
+
+
+def real_rate(rate, inflation) -> np.ndarray:
+    """
+    Taux réel annuel (en %) équivalent à un rendement nominal sous inflation.
+
+    Relation de Fisher exacte au pas mensuel :
+    1 + ρ = (1 + r) / (1 + i), exprimé en taux annuel ρ·1200.
+
+    Args:
+        rate: Rendement nominal annuel en %
+        inflation: Inflation annuelle en %
+
+    Returns:
+        np.ndarray: Rendement réel annuel en %
+    """
+    rate_monthly = np.asarray(rate, dtype=float) / 1200
+    inflation_monthly = np.asarray(inflation, dtype=float) / 1200
+    return ((1 + rate_monthly) / (1 + inflation_monthly) - 1) * 1200
+
+
+def nominal_rate(real, inflation) -> np.ndarray:
+    """
+    Rendement nominal annuel (en %) nécessaire pour obtenir un taux réel donné.
+    Inverse exact de `real_rate`.
+    """
+    real_monthly = np.asarray(real, dtype=float) / 1200
+    inflation_monthly = np.asarray(inflation, dtype=float) / 1200
+    return ((1 + real_monthly) * (1 + inflation_monthly) - 1) * 1200
+
+
+def deflators(inflation, months) -> np.ndarray:
+    """
+    Déflateurs (1 + i)^m pour chaque hypothèse d'inflation et chaque mois.
+
+    Args:
+        inflation: Inflation annuelle en % (scalaire ou tableau)
+        months: Mois (tableau 1D)
+
+    Returns:
+        np.ndarray: Tableau de forme `inflation.shape + months.shape`
+    """
+    log_inflation = np.log1p(np.asarray(inflation, dtype=float) / 1200)
+    return np.exp(np.multiply.outer(log_inflation, np.asarray(months, dtype=float)))
+
+
+def real_schedule(pv, pmt, rate, n_years, inflation, indexed: bool = False) -> dict:
+    """
+    Échéancier mensuel en FCFA courants et en FCFA constants.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel (en FCFA d'aujourd'hui si `indexed`)
+        rate: Rendement nominal annuel en %
+        n_years: Durée en années
+        inflation: Inflation annuelle en % (scalaire ou tableau d'hypothèses)
+        indexed: Versements revalorisés chaque mois au rythme de l'inflation
+
+    Returns:
+        dict:
+            - "month", "year" : tableaux 1D (mois 0 inclus)
+            - "nominal" : valeur en FCFA courants
+            - "real" : valeur en FCFA constants
+            Les deux derniers ont la forme `inflation.shape + month.shape`.
+    """
+    months = np.arange(int(n_years * 12) + 1)
+    deflator = deflators(inflation, months)
+
+    if indexed:
+        # En termes réels, un versement indexé est constant et capitalise au taux réel
+        rho = np.expand_dims(real_rate(rate, inflation), -1)
+        growth, annuity = growth_factors(rho, months)
+        real = pv * growth + pmt * annuity
+        nominal = real * deflator
+    else:
+        growth, annuity = growth_factors(rate, months)
+        nominal = np.broadcast_to(pv * growth + pmt * annuity, deflator.shape)
+        real = nominal / deflator
+
+    return {
+        "month": months,
+        "year": months / 12,
+        "nominal": nominal,
+        "real": real,
+    }
+
+
+def _final_deflator(inflation, n_years) -> np.ndarray:
+    """Déflateur à l'horizon exact (fractions de mois comprises, comme les versions `*_batch`)."""
+    return growth_factors(inflation, np.asarray(n_years, dtype=float) * 12)[0]
+
+
+def calculate_real_fv(pv, pmt, rate, n_years, inflation, indexed: bool = False) -> np.ndarray:
+    """
+    Valeur future exprimée en FCFA d'aujourd'hui.
+
+    Returns:
+        np.ndarray: Valeur future réelle
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    if indexed:
+        return calculate_fv_batch(pv, pmt, real_rate(rate, inflation), n_years)
+    return calculate_fv_batch(pv, pmt, rate, n_years) / _final_deflator(inflation, n_years)
+
+
+def calculate_real_pmt(fv, pv, rate, n_years, inflation, indexed: bool = False) -> np.ndarray:
+    """
+    Versement mensuel nécessaire pour atteindre un objectif exprimé en
+    FCFA d'aujourd'hui (premier versement en FCFA d'aujourd'hui si `indexed`).
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    if indexed:
+        return calculate_pmt_batch(fv, pv, real_rate(rate, inflation), n_years)
+    return calculate_pmt_batch(fv * _final_deflator(inflation, n_years), pv, rate, n_years)
+
+
+def calculate_real_pv(fv, pmt, rate, n_years, inflation, indexed: bool = False) -> np.ndarray:
+    """
+    Montant initial nécessaire pour atteindre un objectif exprimé en
+    FCFA d'aujourd'hui.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    if indexed:
+        return calculate_pv_batch(fv, pmt, real_rate(rate, inflation), n_years)
+    return calculate_pv_batch(fv * _final_deflator(inflation, n_years), pmt, rate, n_years)
+
+
+def calculate_real_n_years(fv, pv, pmt, rate, inflation, indexed: bool = False) -> np.ndarray:
+    """
+    Horizon nécessaire pour atteindre un objectif exprimé en FCFA d'aujourd'hui.
+
+    Avec versements indexés, le problème se ramène au solveur nominal au
+    taux réel (forme fermée). Sans indexation, la valeur réelle n'est pas
+    forcément monotone : on évalue tous les mois jusqu'à 100 ans en une
+    passe et on retient le premier mois où l'objectif est atteint.
+
+    Returns:
+        np.ndarray: Nombre d'années (exact avec versements indexés, arrondi
+            au mois sinon ; np.inf si impossible)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    if indexed:
+        return calculate_n_years_batch(fv, pv, pmt, real_rate(rate, inflation))
+
+    calculate_n_years_batch(fv, pv, pmt, rate)  # validation des paramètres
+    fv, pv, pmt, rate, inflation = (
+        np.expand_dims(np.asarray(x, dtype=float), -1) for x in (fv, pv, pmt, rate, inflation)
+    )
+    months = np.arange(1201)
+    growth, annuity = growth_factors(rate, months)
+    reached = (pv * growth + pmt * annuity) / growth_factors(inflation, months)[0] >= fv
+
+    first = np.argmax(reached, axis=-1)
+    return np.where(np.any(reached, axis=-1), first / 12, np.inf)
+
+
+def real_terms_plan(pv, pmt, rate, n_years, inflation, indexed: bool = False) -> dict:
+    """
+    Bilan d'un plan d'épargne sous une ou plusieurs hypothèses d'inflation.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel
+        rate: Rendement nominal annuel en %
+        n_years: Durée en années
+        inflation: Inflation annuelle en % (tableau d'hypothèses accepté)
+        indexed: Versements indexés sur l'inflation
+
+    Returns:
+        dict: Tableaux NumPy de la forme diffusée des arguments :
+            - "real_rate" : rendement réel annuel en %
+            - "nominal_fv" : valeur finale en FCFA courants
+            - "real_fv" : valeur finale en FCFA d'aujourd'hui
+            - "purchasing_power_loss" : perte de pouvoir d'achat en %
+            - "preserving_pmt" : versement (indexé) nécessaire pour que la
+              valeur finale réelle égale la valeur nominale sans inflation
+    """
+    rho = real_rate(rate, inflation)
+    real_fv = calculate_real_fv(pv, pmt, rate, n_years, inflation, indexed)
+    nominal_fv = real_fv * _final_deflator(inflation, n_years)
+    target = calculate_fv_batch(pv, pmt, rate, n_years)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loss = np.where(nominal_fv > 0, (1 - real_fv / nominal_fv) * 100, 0.0)
+
+    return {
+        "real_rate": rho,
+        "nominal_fv": nominal_fv,
+        "real_fv": real_fv,
+        "purchasing_power_loss": loss,
+        "preserving_pmt": calculate_pmt_batch(target, pv, rho, n_years),
+    }
@@ -0,0 +1,160 @@
+# core/portfolio.py
+# ---------------------------------------------------------
+# Portefeuille multi-actifs (actions BRVM, obligations régionales,
+# monétaire...) :
+# - allocation cible, rendement et volatilité par classe d'actifs,
+#   matrice de corrélation (factorisée une seule fois, en cache)
+# - rendements mensuels corrélés, log-normaux par classe d'actifs
+# - rééquilibrage périodique vers l'allocation cible
+# - mêmes sorties (percentiles) que les simulations de core/stochastic
+#
+# Entre deux rééquilibrages, chaque ligne évolue seule ; la valeur du
+# portefeuille au mois j d'une période vaut donc V_début·a_j + b_j, où
+# a_j et b_j (produits cumulés des rendements de chaque actif) se
+# calculent pour toutes les trajectoires et toutes les périodes par des
+# opérations matricielles. L'enchaînement des périodes est une
+# récurrence linéaire V_b = a·V_(b-1) + b, résolue en forme fermée par
+# `core.stochastic._path_values` : aucune boucle sur les mois.
+# ---------------------------------------------------------
+
+from functools import lru_cache
+
+import numpy as np
+
+from core.config import SIMULATION_PATHS, SIMULATION_SEED
+from core.calculations import CalculationError
+from core.stochastic import _path_values
+
+
+@lru_cache(maxsize=32)
+def _cholesky(correlations: tuple) -> np.ndarray:
+    """Facteur de Cholesky (en cache) d'une matrice de corrélation donnée en tuples."""
+    try:
+        factor = np.linalg.cholesky(np.array(correlations, dtype=float))
+    except np.linalg.LinAlgError:
+        raise CalculationError("La matrice de corrélation doit être symétrique définie positive")
+    factor.flags.writeable = False
+    return factor
+
+
+def correlation_factor(correlations) -> np.ndarray:
+    """
+    Facteur de Cholesky L (C = L·Lᵀ) de la matrice de corrélation.
+
+    La factorisation n'est faite qu'une fois par matrice : les appels
+    suivants (autres clients, autres paramètres) réutilisent le cache.
+
+    Raises:
+        CalculationError: Si la matrice n'est pas définie positive
+    """
+    return _cholesky(tuple(map(tuple, np.asarray(correlations, dtype=float))))
+
+
+def portfolio_moments(weights, rates, volatilities, correlations) -> tuple:
+    """
+    Rendement moyen et volatilité annuels (en %) d'une allocation.
+
+    Args:
+        weights: Poids des classes d'actifs (en %, normalisés à 100)
+        rates: Rendements annuels moyens en %
+        volatilities: Volatilités annuelles en %
+        correlations: Matrice de corrélation
+
+    Returns:
+        tuple: (rendement moyen, volatilité) en %
+    """
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum(axis=-1, keepdims=True)
+    scaled = weights * np.asarray(volatilities, dtype=float)
+    variance = np.einsum("...i,ij,...j->...", scaled, np.asarray(correlations, dtype=float), scaled)
+    return weights @ np.asarray(rates, dtype=float), np.sqrt(variance)
+
+
+def simulate_asset_returns(rates, volatilities, correlations, n_months: int,
+                           n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED) -> np.ndarray:
+    """
+    Facteurs de croissance mensuels corrélés (1 + r_m) de chaque classe d'actifs.
+
+    Comme `core.stochastic.simulate_monthly_returns`, les rendements
+    logarithmiques sont gaussiens et centrés pour que l'espérance du
+    facteur mensuel de chaque actif vaille 1 + rate/1200.
+
+    Returns:
+        np.ndarray: Tableau (n_paths, n_months, n_actifs)
+    """
+    sigma = np.asarray(volatilities, dtype=float) / 100 / np.sqrt(12)
+    mu = np.log1p(np.asarray(rates, dtype=float) / 100 / 12) - sigma ** 2 / 2
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_paths, n_months, len(sigma))) @ correlation_factor(correlations).T
+    return np.exp(mu + sigma * shocks)
+
+
+def simulate_portfolio_paths(pv: float, pmt: float, weights, rates, volatilities, correlations,
+                             n_years: float, rebalancing_months: int = 12,
+                             n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED) -> dict:
+    """
+    Simule un placement multi-actifs avec versements mensuels et rééquilibrage.
+
+    Les versements sont répartis selon l'allocation cible ; tous les
+    `rebalancing_months` mois, le portefeuille est ramené à l'allocation
+    cible (0 : jamais, les lignes dérivent librement).
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel
+        weights: Allocation cible en % : vecteur (n_actifs,) ou matrice
+            (n_mois, n_actifs) si l'allocation évolue dans le temps
+        rates: Rendements annuels moyens des actifs en %
+        volatilities: Volatilités annuelles des actifs en %
+        correlations: Matrice de corrélation des actifs
+        n_years: Durée en années
+        rebalancing_months: Période de rééquilibrage en mois (0 : jamais)
+        n_paths: Nombre de trajectoires
+        seed: Graine du générateur
+
+    Returns:
+        dict:
+            - "month" : mois 0 .. n_mois
+            - "values" : matrice (n_paths, n_mois + 1) du capital
+            - "final" : capital final de chaque trajectoire
+
+    Raises:
+        CalculationError: Si l'allocation ou les corrélations sont invalides
+    """
+    n_months = int(round(n_years * 12))
+    n_assets = len(rates)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), (n_months, n_assets))
+    if np.any(weights < 0) or np.any(weights.sum(axis=1) <= 0):
+        raise CalculationError("L'allocation doit comporter des poids positifs")
+    weights = weights / weights.sum(axis=1, keepdims=True)
+
+    # Périodes de rééquilibrage de même durée (dernière complétée par des mois neutres)
+    period = rebalancing_months or max(n_months, 1)
+    n_periods = -(-n_months // period)
+    padding = n_periods * period - n_months
+    growth = simulate_asset_returns(rates, volatilities, correlations, n_months, n_paths, seed)
+    growth = np.pad(growth, ((0, 0), (0, padding), (0, 0)), constant_values=1.0)
+    weights = np.pad(weights, ((0, padding), (0, 0)), mode="edge")
+    flows = np.where(np.arange(n_periods * period) < n_months, float(pmt), 0.0)[:, None] * weights
+    start_weights = weights[::period]
+
+    # V = V_début·a + b, mois par mois dans chaque période (une passe par classe d'actifs)
+    shape = (n_paths, n_periods, period)
+    a = np.zeros(shape)
+    b = np.zeros(shape)
+    for asset in range(n_assets):
+        log_cum = np.cumsum(np.log(growth[..., asset]).reshape(shape), axis=2)
+        cum_growth = np.exp(log_cum)
+        a += start_weights[None, :, asset, None] * cum_growth
+        b += cum_growth * np.cumsum(flows[:, asset].reshape(shape[1:]) * np.exp(-log_cum), axis=2)
+
+    # Valeur en début de chaque période : récurrence linéaire en forme fermée
+    starts = _path_values(pv, b[:, :, -1], a[:, :, -1])
+    values = (starts[:, :-1, None] * a + b).reshape(n_paths, -1)[:, :n_months]
+    values = np.hstack([np.full((n_paths, 1), float(pv)), values])
+
+    return {
+        "month": np.arange(n_months + 1),
+        "values": values,
+        "final": values[:, -1],
+    }
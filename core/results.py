@@ -0,0 +1,206 @@
+# core/results.py
+# ---------------------------------------------------------
+# Résultat d'une simulation, partagé par toutes les pages :
+# - paramètres saisis et valeur calculée (mode de calcul)
+# - échéancier mensuel et répartition annuelle (tableaux NumPy),
+#   calculés à la première demande puis conservés
+# - totaux au terme (capital investi, intérêts, frais, impôts)
+#
+# Un seul objet est rangé dans st.session_state.simulation_results :
+# le graphique, le rapport PDF et la page Scénarios réutilisent la
+# même trajectoire au lieu de la reconstruire à partir des paramètres.
+# ---------------------------------------------------------
+
+import copy
+import math
+
+import numpy as np
+
+from core.config import CALCULATION_MODES
+from core.schedule import build_schedule, yearly_breakdown
+
+
+class SimulationResult:
+    """
+    Paramètres et résultats d'une simulation (attributs fixes, `__slots__`).
+
+    Les tableaux de l'échéancier sont en lecture seule : ils sont partagés
+    entre les pages et ne doivent pas être modifiés en place.
+    """
+
+    __slots__ = (
+        "pv", "pmt", "fv", "rate", "n_years",
+        "contribution_frequency", "compounding_frequency",
+        "fees", "taxes", "tax_country", "events", "pauses",
+        "calculation_mode", "calculated_value", "target_probability",
+        "_schedule", "_yearly",
+    )
+
+    def __init__(self, pv: float, pmt: float, fv: float, rate: float, n_years: float,
+                 contribution_frequency: float = 12, compounding_frequency: float = 12,
+                 fees: dict = None, taxes: dict = None, tax_country: str = None,
+                 events: dict = None, pauses=None, calculation_mode: str = None,
+                 calculated_value: float = None, target_probability: dict = None):
+        self.pv = pv
+        self.pmt = pmt
+        self.fv = fv
+        self.rate = rate
+        self.n_years = n_years
+        self.contribution_frequency = contribution_frequency
+        self.compounding_frequency = compounding_frequency
+        self.fees = fees or {}
+        self.taxes = taxes
+        self.tax_country = tax_country
+        self.events = events or {}
+        self.pauses = pauses or []
+        self.calculation_mode = calculation_mode
+        self.calculated_value = calculated_value
+        self.target_probability = target_probability
+        self._schedule = None
+        self._yearly = None
+
+    @classmethod
+    def from_inputs(cls, inputs: dict, calculation_mode: str = None) -> "SimulationResult":
+        """Construit un résultat à partir d'un dictionnaire de paramètres (voir `display_results`)."""
+        return cls(
+            inputs.get("pv", 0), inputs.get("pmt", 0), inputs.get("fv", 0),
+            inputs.get("rate", 0), inputs.get("n_years", 0),
+            inputs.get("contribution_frequency", 12), inputs.get("compounding_frequency", 12),
+            inputs.get("fees"), inputs.get("taxes"), inputs.get("tax_country"),
+            inputs.get("events"), inputs.get("pauses"),
+            calculation_mode or inputs.get("calculation_mode"),
+            inputs.get("calculated_value"), inputs.get("target_probability"),
+        )
+
+    @property
+    def frequencies(self) -> tuple:
+        """(versements par an, capitalisations par an)."""
+        return self.contribution_frequency, self.compounding_frequency
+
+    @property
+    def has_fees(self) -> bool:
+        """Vrai si au moins un frais est non nul."""
+        return any(value > 0 for value in self.fees.values())
+
+    @property
+    def options(self) -> dict:
+        """Options (frais, impôts, flux irréguliers) des fonctions de core/schedule."""
+        return {
+            "fees": self.fees if self.has_fees else None,
+            "taxes": self.taxes,
+            "events": self.events,
+            "pauses": self.pauses,
+        }
+
+    @property
+    def is_plain(self) -> bool:
+        """Vrai pour un placement mensuel simple (sans frais, impôts ni flux irréguliers)."""
+        return self.frequencies == (12, 12) and not any(self.options.values())
+
+    @property
+    def schedule(self) -> dict:
+        """Échéancier mensuel (voir `core.schedule.build_schedule`), calculé une fois."""
+        if self._schedule is None:
+            self._schedule = _read_only(build_schedule(
+                self.pv, self.pmt, self.rate, self.n_years, *self.frequencies, **self.options
+            ))
+        return self._schedule
+
+    @property
+    def yearly(self) -> dict:
+        """Répartition annuelle (voir `core.schedule.yearly_breakdown`), calculée une fois."""
+        if self._yearly is None:
+            self._yearly = _read_only(yearly_breakdown(
+                self.pv, self.pmt, self.rate, self.n_years, *self.frequencies, **self.options
+            ))
+        return self._yearly
+
+    @property
+    def totals(self) -> dict:
+        """
+        Totaux au terme, lus sur le dernier point de l'échéancier.
+
+        Returns:
+            dict: "capital" (montant final), "invested", "interest", "fees",
+                "taxes" (0 sans frais / impôts ; horizon infini : seul
+                "capital" est renseigné, le reste vaut 0)
+        """
+        if not math.isfinite(self.n_years):
+            return {"capital": self.fv, "invested": 0.0, "interest": 0.0, "fees": 0.0, "taxes": 0.0}
+        schedule = self.schedule
+        invested = float(schedule["invested"][-1])
+        return {
+            "capital": self.fv,
+            "invested": invested,
+            "interest": self.fv - invested,
+            "fees": float(schedule["fees"][-1]) if "fees" in schedule else 0.0,
+            "taxes": float(schedule["taxes"][-1]) if "taxes" in schedule else 0.0,
+        }
+
+    @property
+    def is_consistent(self) -> bool:
+        """
+        Vrai si le quadruplet est cohérent : le placement (pv, pmt, n_years)
+        atteint exactement fv, à 1 FCFA près. Faux lorsque le solveur a
+        borné la solution (capital initial suffisant, objectif inatteignable...).
+        """
+        return math.isfinite(self.n_years) and abs(float(self.schedule["value"][-1]) - self.fv) <= 1.0
+
+    def with_mode(self, calculation_mode: str) -> "SimulationResult":
+        """
+        Même simulation vue depuis un autre mode de calcul : le quadruplet
+        (fv, pv, pmt, n_years) étant cohérent, seule la grandeur présentée
+        comme calculée change. L'échéancier déjà calculé est partagé.
+        """
+        result = copy.copy(self)
+        result.calculation_mode = calculation_mode
+        result.calculated_value = getattr(self, CALCULATION_MODES[calculation_mode])
+        return result
+
+    def matches_inputs(self, inputs: dict, calculation_mode: str) -> bool:
+        """
+        Vrai si `inputs` (voir `display_results`) décrit cette simulation,
+        la grandeur calculée dans `calculation_mode` mise à part : le
+        résultat peut alors être réaffiché sans nouveau calcul.
+
+        Les montants sont comparés à 1 FCFA près (saisies arrondies), et
+        seul un quadruplet cohérent est réutilisé (jamais un versement
+        probabiliste, calculé pour une probabilité d'atteindre l'objectif).
+        """
+        if self.target_probability or inputs.get("target_probability") or not self.is_consistent:
+            return False
+        solved = CALCULATION_MODES[calculation_mode]
+        for field in ("fv", "pv", "pmt", "n_years"):
+            tolerance = 1.0 if field != "n_years" else 1e-9
+            if field != solved and not abs(inputs.get(field, 0) - getattr(self, field)) <= tolerance:
+                return False
+        return (
+            inputs.get("rate", 0) == self.rate
+            and (inputs.get("contribution_frequency", 12), inputs.get("compounding_frequency", 12)) == self.frequencies
+            and (inputs.get("fees") or {}) == self.fees
+            and inputs.get("taxes") == self.taxes
+            and (inputs.get("events") or {}) == self.events
+            and list(inputs.get("pauses") or []) == list(self.pauses)
+        )
+
+    def matches(self, pv: float, pmt: float, rate: float, n_years: float) -> bool:
+        """Vrai si ce résultat décrit le placement mensuel simple (pv, pmt, rate, n_years)."""
+        return self.is_plain and (self.pv, self.pmt, self.rate, self.n_years) == (pv, pmt, rate, n_years)
+
+
+def _read_only(arrays: dict) -> dict:
+    """Rend les tableaux d'un dictionnaire non modifiables (partagés entre pages)."""
+    for array in arrays.values():
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+    return arrays
+
+
+def schedule_for(pv: float, pmt: float, rate: float, n_years: float, result: SimulationResult = None) -> dict:
+    """
+    Échéancier mensuel simple de (pv, pmt, rate, n_years) : celui de
+    `result` s'il décrit le même placement, sinon un nouveau calcul.
+    """
+    if result is not None and result.matches(pv, pmt, rate, n_years):
+        return result.schedule
+    return build_schedule(pv, pmt, rate, n_years)
@@ -0,0 +1,216 @@
+# core/schedule.py
+# ---------------------------------------------------------
+# Échéancier d'un placement :
+# - trajectoire mois par mois (valeur, capital investi, intérêts)
+# - répartition annuelle Capital Investi / Intérêts
+#
+# Le calcul est vectorisé (forme fermée de l'annuité) : aucune
+# boucle Python, quel que soit l'horizon. Les fréquences de versement
+# et de capitalisation sont paramétrables (mensuelles par défaut) et
+# un horizon fractionnaire est évalué exactement à son terme. Une
+# structure de frais (core/fees) et des règles fiscales (core/taxes)
+# peuvent être appliquées : la valeur est alors nette de frais et
+# d'impôts (valeur de rachat) et les séries des frais et impôts payés
+# sont ajoutées. Les flux irréguliers (core/events : primes, retraits
+# ponctuels, pauses des versements) s'ajoutent à la forme fermée.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import periodic_factors
+from core.fees import calculate_fv_with_fees, fees_paid
+from core.events import plan_breakdown
+
+
+def _values_at(pv: float, pmt: float, rate: float, months: np.ndarray,
+               contribution_frequency: float = 12, compounding_frequency: float = 12,
+               fees: dict = None) -> tuple:
+    """
+    Évalue la valeur totale et le capital investi aux mois demandés
+    (versements en fin de période).
+
+    Returns:
+        tuple: (value, invested) sous forme de tableaux NumPy
+    """
+    months = np.asarray(months, dtype=float)
+
+    if fees:
+        frequencies = (contribution_frequency, compounding_frequency)
+        n_payments = periodic_factors(rate, months / 12, *frequencies)[2]
+        return calculate_fv_with_fees(pv, pmt, rate, months / 12, fees, *frequencies), pv + pmt * n_payments
+
+    if contribution_frequency != 12 or compounding_frequency != 12 or np.any(months != np.floor(months)):
+        growth, annuity, n_payments = periodic_factors(
+            rate, months / 12, contribution_frequency, compounding_frequency
+        )
+        return pv * growth + pmt * annuity, pv + pmt * n_payments
+
+    rate_m = rate / 100 / 12
+
+    if rate_m == 0:
+        growth = np.ones(len(months))
+        annuity = months
+    else:
+        log_growth = months * np.log1p(rate_m)
+        growth = np.exp(log_growth)
+        annuity = np.expm1(log_growth) / rate_m
+
+    value = pv * growth + pmt * annuity
+    invested = pv + pmt * months
+    return value, invested
+
+
+def _series_at(pv: float, pmt: float, rate: float, months: np.ndarray,
+               contribution_frequency: float = 12, compounding_frequency: float = 12,
+               fees: dict = None, taxes: dict = None, events: dict = None, pauses=None) -> dict:
+    """
+    Valeur, capital investi et, selon les options, frais et impôts payés
+    cumulés aux mois demandés.
+
+    Returns:
+        dict: "value", "invested", plus "fees" si `fees` et "taxes" si `taxes`
+    """
+    frequencies = (contribution_frequency, compounding_frequency)
+
+    if taxes or events or pauses:
+        breakdown = plan_breakdown(pv, pmt, rate, np.asarray(months) / 12, events, pauses, taxes, fees, *frequencies)
+        series = {"value": breakdown["value"], "invested": breakdown["invested"]}
+        for key, option in (("fees", fees), ("taxes", taxes)):
+            if option:
+                series[key] = breakdown[key]
+        return series
+
+    value, invested = _values_at(pv, pmt, rate, months, *frequencies, fees=fees)
+    series = {"value": value, "invested": invested}
+    if fees:
+        series["fees"] = fees_paid(pv, pmt, rate, np.asarray(months) / 12, fees, *frequencies)["total"]
+    return series
+
+
+def _month_grid(n_years: float) -> np.ndarray:
+    """Mois 0, 1, 2, ... jusqu'à l'horizon, terme fractionnaire inclus."""
+    n_months = n_years * 12
+    months = np.arange(int(n_months + 1e-9) + 1, dtype=float)
+    if n_months - months[-1] > 1e-9:
+        months = np.append(months, n_months)
+    return months
+
+
+def build_schedule(pv: float, pmt: float, rate: float, n_years: float,
+                   contribution_frequency: float = 12, compounding_frequency: float = 12,
+                   fees: dict = None, taxes: dict = None, events: dict = None, pauses=None) -> dict:
+    """
+    Construit l'échéancier mensuel d'un placement (versements en fin de période).
+
+    Équivalent à la récurrence `value = value * (1 + rate_m) + pmt`,
+    mais évalué en une seule passe NumPy.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement par période
+        rate: Rendement annuel en %
+        n_years: Durée en années (un terme fractionnaire ajoute un dernier point)
+        contribution_frequency: Versements par an (12 : mensuels)
+        compounding_frequency: Capitalisations par an (np.inf : continue)
+        fees: Structure de frais optionnelle (voir core/fees)
+        taxes: Règles fiscales optionnelles (voir core/taxes)
+        events: Flux ponctuels {mois: montant} (voir core/events)
+        pauses: Pauses des versements [(premier mois, nombre de mois), ...]
+
+    Returns:
+        dict: Tableaux NumPy, un point par mois (mois 0 inclus) :
+            - "month" : numéro du mois
+            - "year" : horizon en années (month / 12)
+            - "value" : valeur totale du portefeuille (valeur de rachat
+              après impôts si `taxes` est fourni)
+            - "invested" : capital investi cumulé
+            - "interest" : intérêts cumulés nets de frais et d'impôts (value - invested)
+            - "fees" : frais payés cumulés (seulement si `fees` est fourni)
+            - "taxes" : impôts payés en cas de rachat à ce mois (seulement
+              si `taxes` est fourni)
+    """
+    months = _month_grid(n_years)
+    series = _series_at(pv, pmt, rate, months, contribution_frequency, compounding_frequency, fees, taxes,
+                        events, pauses)
+
+    schedule = {
+        "month": months,
+        "year": months / 12,
+        "value": series["value"],
+        "invested": series["invested"],
+        "interest": series["value"] - series["invested"],
+    }
+    for key in ("fees", "taxes"):
+        if key in series:
+            schedule[key] = series[key]
+    return schedule
+
+
+def yearly_breakdown(pv: float, pmt: float, rate: float, n_years: float,
+                     contribution_frequency: float = 12, compounding_frequency: float = 12,
+                     fees: dict = None, taxes: dict = None, events: dict = None, pauses=None) -> dict:
+    """
+    Répartition annuelle du capital investi et des intérêts générés.
+
+    Seules les fins d'année (mois 0, 12, 24, ... et le dernier mois) sont
+    évaluées en forme fermée, puis différenciées : le coût est proportionnel
+    au nombre d'années et non au nombre de mois. Une dernière année
+    incomplète (horizon fractionnaire) forme sa propre barre.
+
+    Le capital initial est compté dans la première année, de sorte que la
+    somme des montants annuels égale les totaux finaux de l'échéancier.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement par période
+        rate: Rendement annuel en %
+        n_years: Durée en années
+        contribution_frequency: Versements par an (12 : mensuels)
+        compounding_frequency: Capitalisations par an (np.inf : continue)
+        fees: Structure de frais optionnelle (voir core/fees)
+        taxes: Règles fiscales optionnelles (voir core/taxes)
+        events: Flux ponctuels {mois: montant} (voir core/events)
+        pauses: Pauses des versements [(premier mois, nombre de mois), ...]
+
+    Returns:
+        dict: Tableaux NumPy de longueur égale au nombre d'années entamées :
+            - "year" : numéro de l'année (1, 2, ...)
+            - "invested" : capital investi pendant l'année
+            - "interest" : intérêts générés pendant l'année (nets de frais)
+            - "value" : valeur totale en fin d'année
+            - "fees" : frais payés pendant l'année (seulement si `fees` est fourni)
+            - "taxes" : retenues de l'année et variation de l'impôt latent sur
+              la plus-value (seulement si `taxes` est fourni)
+    """
+    n_months = n_years * 12
+    year_ends = np.arange(0, n_months + 1e-9, 12)
+    if n_months - year_ends[-1] > 1e-9:
+        year_ends = np.append(year_ends, n_months)
+
+    series = _series_at(pv, pmt, rate, year_ends, contribution_frequency, compounding_frequency, fees, taxes,
+                        events, pauses)
+    value, invested = series["value"], series["invested"]
+    interest = value - invested
+
+    invested_yearly = np.diff(invested)
+    interest_yearly = np.diff(interest)
+    if len(invested_yearly) > 0:
+        invested_yearly[0] += pv
+        # Droits d'entrée sur le capital initial (intérêts négatifs au mois 0)
+        interest_yearly[0] += interest[0]
+
+    breakdown = {
+        "year": np.arange(1, len(year_ends)),
+        "invested": invested_yearly,
+        "interest": interest_yearly,
+        "value": value[1:],
+    }
+    for key in ("fees", "taxes"):
+        if key in series:
+            # Comme le capital initial, les montants du mois 0 (droits d'entrée) comptent dans la première année
+            paid = series[key]
+            paid_yearly = np.diff(paid)
+            if len(paid_yearly) > 0:
+                paid_yearly[0] += paid[0]
+            breakdown[key] = paid_yearly
+    return breakdown
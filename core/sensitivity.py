@@ -0,0 +1,130 @@
+# core/sensitivity.py
+# ---------------------------------------------------------
+# Sensibilités analytiques des calculs financiers :
+# - gradient de la valeur future (pv, pmt, taux, horizon)
+# - dérivées partielles du versement requis, du montant initial
+#   requis et de l'horizon (théorème des fonctions implicites)
+# - élasticités au taux
+#
+# Les dérivées sont obtenues en forme fermée (pas de différences
+# finies) et acceptent des tableaux NumPy.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import calculate_fv_batch, growth_factors
+
+
+def _fv_gradient(pv, pmt, rate, n_years) -> dict:
+    """
+    Dérivées partielles de FV = pv·G + pmt·A, avec G = (1 + r)^N,
+    A = (G - 1) / r, r = rate / 1200 et N = 12·n_years (traité comme continu).
+
+    Unités : taux en points de %, horizon en années.
+    """
+    rate_monthly = np.asarray(rate, dtype=float) / 100 / 12
+    n_periods = np.asarray(n_years, dtype=float) * 12
+    growth, annuity = growth_factors(rate, n_periods)
+    growth_prev = growth / (1 + rate_monthly)
+
+    safe_rate = np.where(rate_monthly == 0, 1.0, rate_monthly)
+
+    # dA/dr = (N·G/(1+r) - A) / r, de limite N·(N-1)/2 en r = 0
+    d_annuity_d_r = np.where(
+        rate_monthly == 0,
+        n_periods * (n_periods - 1) / 2,
+        (n_periods * growth_prev - annuity) / safe_rate,
+    )
+    d_fv_d_r = pv * n_periods * growth_prev + pmt * d_annuity_d_r
+
+    # dFV/dN = ln(1+r)·G·(pv + pmt/r), de limite pmt en r = 0
+    log_growth = np.log1p(rate_monthly)
+    d_fv_d_n = np.where(
+        rate_monthly == 0,
+        pmt,
+        log_growth * growth * (pv + pmt / safe_rate),
+    )
+
+    return {
+        "pv": growth,
+        "pmt": annuity,
+        "rate": d_fv_d_r / 1200,
+        "n_years": d_fv_d_n * 12,
+    }
+
+
+def tvm_sensitivities(pv, pmt, rate, n_years) -> dict:
+    """
+    Dérivées partielles exactes des quatre résultats du simulateur.
+
+    Le point d'évaluation est le quadruplet cohérent (pv, pmt, rate, n_years)
+    et fv = FV(pv, pmt, rate, n_years). Chaque résultat résolu (versement
+    requis, montant initial requis, horizon) vérifie FV(...) = fv ; ses
+    dérivées découlent donc du gradient de FV :
+        dX/dy = -(dFV/dy) / (dFV/dX)   et   dX/dfv = 1 / (dFV/dX)
+
+    Tous les arguments peuvent être des tableaux NumPy (broadcasting).
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel
+        rate: Rendement annuel en %
+        n_years: Durée en années (traitée comme continue)
+
+    Returns:
+        dict: {résultat: {paramètre: dérivée}} avec
+            - "fv" : par rapport à "pv", "pmt", "rate", "n_years"
+            - "pmt" : par rapport à "fv", "pv", "rate", "n_years"
+            - "pv" : par rapport à "fv", "pmt", "rate", "n_years"
+            - "n_years" : par rapport à "fv", "pv", "pmt", "rate"
+        Les dérivées par rapport au taux sont exprimées par point de %,
+        celles par rapport à l'horizon par année. Une dérivée non définie
+        (ex. horizon nul pour le versement requis) vaut NaN ou ±inf.
+    """
+    grad = _fv_gradient(pv, pmt, rate, n_years)
+
+    def implicit(solved: str, others: tuple) -> dict:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            derivatives = {"fv": 1 / grad[solved]}
+            for name in others:
+                derivatives[name] = -grad[name] / grad[solved]
+        return derivatives
+
+    return {
+        "fv": grad,
+        "pmt": implicit("pmt", ("pv", "rate", "n_years")),
+        "pv": implicit("pv", ("pmt", "rate", "n_years")),
+        "n_years": implicit("n_years", ("pv", "pmt", "rate")),
+    }
+
+
+def fv_rate_sensitivity(pv, pmt, rate, n_years) -> dict:
+    """
+    Sensibilité exacte de la valeur future au taux de rendement.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel
+        rate: Rendement annuel en % (scalaire ou tableau)
+        n_years: Durée en années
+
+    Returns:
+        dict:
+            - "fv" : valeur future
+            - "derivative" : variation de FV pour +1 point de taux (FCFA)
+            - "semi_elasticity" : variation de FV pour +1 point de taux (en %)
+            - "elasticity" : variation de FV (en %) pour +1 % relatif du taux
+    """
+    fv = calculate_fv_batch(pv, pmt, rate, n_years)
+    derivative = _fv_gradient(pv, pmt, rate, n_years)["rate"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        semi_elasticity = np.where(fv != 0, derivative / fv * 100, 0.0)
+        elasticity = np.where(fv != 0, derivative * rate / fv, 0.0)
+
+    return {
+        "fv": fv,
+        "derivative": derivative,
+        "semi_elasticity": semi_elasticity,
+        "elasticity": elasticity,
+    }
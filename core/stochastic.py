@@ -0,0 +1,253 @@
+# core/stochastic.py
+# ---------------------------------------------------------
+# Simulations à rendements aléatoires (risque de séquence) :
+# - génération de rendements mensuels log-normaux
+# - trajectoires accumulation + retraits sous forme de matrices
+#   (trajectoires × mois), sans boucle sur les mois
+# - détection vectorisée de l'épuisement du capital
+# - probabilité de ruine et distribution de la durée tenue
+# - versement qui atteint un objectif avec une probabilité donnée
+#
+# Toutes les trajectoires partagent la même graine : les résultats
+# sont reproductibles et deux scénarios comparés voient les mêmes
+# aléas (nombres aléatoires communs).
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.config import SIMULATION_PATHS, SIMULATION_SEED
+
+
+def simulate_monthly_returns(rate: float, volatility: float, n_months: int,
+                             n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED) -> np.ndarray:
+    """
+    Facteurs de croissance mensuels (1 + r_m) aléatoires.
+
+    Les rendements logarithmiques sont gaussiens, centrés de sorte que
+    l'espérance du facteur mensuel vaille 1 + rate/1200 : en moyenne, on
+    retrouve le taux déterministe du simulateur.
+
+    Args:
+        rate: Rendement annuel moyen en %
+        volatility: Volatilité annuelle en %
+        n_months: Nombre de mois simulés
+        n_paths: Nombre de trajectoires
+        seed: Graine du générateur
+
+    Returns:
+        np.ndarray: Matrice (n_paths, n_months) de facteurs de croissance
+    """
+    sigma = volatility / 100 / np.sqrt(12)
+    mu = np.log1p(rate / 100 / 12) - sigma ** 2 / 2
+    rng = np.random.default_rng(seed)
+    return np.exp(mu + sigma * rng.standard_normal((n_paths, n_months)))
+
+
+def _path_values(pv: float, flows: np.ndarray, growth: np.ndarray) -> np.ndarray:
+    """
+    Valeur de chaque trajectoire pour V_m = V_(m-1)·g_m + c_m (non bornée).
+
+    Forme fermée : V_m = P_m·(pv + Σ_(k<=m) c_k / P_k) avec P_m = Π g_k,
+    calculée en espace logarithmique par sommes cumulées.
+
+    Returns:
+        np.ndarray: Matrice (n_paths, n_months + 1), mois 0 inclus
+    """
+    log_cum = np.cumsum(np.log(growth), axis=1)
+    cum_growth = np.exp(log_cum)
+    discounted = np.cumsum(flows * np.exp(-log_cum), axis=1)
+    values = cum_growth * (pv + discounted)
+    return np.hstack([np.full((growth.shape[0], 1), float(pv)), values])
+
+
+def simulate_withdrawal_paths(pv: float, pmt: float, rate: float, volatility: float,
+                              accumulation_years: float, withdrawal: float, withdrawal_years: float,
+                              n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED) -> dict:
+    """
+    Simule des trajectoires aléatoires d'accumulation puis de retraits.
+
+    Même schéma que le scénario déterministe (versements puis retraits en
+    fin de mois), mais chaque mois a son propre rendement. Une trajectoire
+    est ruinée au premier mois où le capital devient négatif ; elle reste
+    ensuite à 0.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement mensuel pendant l'accumulation
+        rate: Rendement annuel moyen en %
+        volatility: Volatilité annuelle en %
+        accumulation_years: Durée d'accumulation en années
+        withdrawal: Retrait mensuel
+        withdrawal_years: Durée des retraits en années
+        n_paths: Nombre de trajectoires
+        seed: Graine du générateur
+
+    Returns:
+        dict:
+            - "month" : mois 0 .. accumulation + retraits
+            - "values" : matrice (n_paths, n_mois + 1) du capital (>= 0)
+            - "accumulated" : capital de chaque trajectoire en début de retraits
+            - "depletion_month" : mois de retrait où le capital s'épuise
+              (1 = premier retrait, np.inf si jamais)
+            - "ruined" : booléens, capital épuisé avant le terme
+    """
+    accumulation_months = int(accumulation_years * 12)
+    withdrawal_months = int(withdrawal_years * 12)
+    n_months = accumulation_months + withdrawal_months
+
+    growth = simulate_monthly_returns(rate, volatility, n_months, n_paths, seed)
+    flows = np.where(np.arange(1, n_months + 1) <= accumulation_months, pmt, -withdrawal)
+    values = _path_values(pv, flows[None, :], growth)
+
+    # Premier mois sous zéro par trajectoire (argmax sur le masque booléen)
+    below = values[:, accumulation_months + 1:] < 0
+    ruined = below.any(axis=1)
+    first = np.argmax(below, axis=1) + 1
+    depletion = np.where(ruined, first, np.inf)
+
+    # Capital ramené à 0 à partir de l'épuisement
+    exhausted = np.maximum.accumulate(values < 0, axis=1)
+    values = np.where(exhausted, 0.0, values)
+
+    return {
+        "month": np.arange(n_months + 1),
+        "values": values,
+        "accumulated": values[:, accumulation_months],
+        "depletion_month": depletion,
+        "ruined": ruined,
+    }
+
+
+def ruin_statistics(paths: dict, percentiles=(5, 25, 50, 75, 95)) -> dict:
+    """
+    Synthèse d'une simulation `simulate_withdrawal_paths`.
+
+    Args:
+        paths: Résultat de `simulate_withdrawal_paths`
+        percentiles: Percentiles à calculer sur le capital
+
+    Returns:
+        dict:
+            - "probability_of_ruin" : part des trajectoires épuisées (0-1)
+            - "depletion_years" : durées tenues (en années de retraits) des
+              seules trajectoires ruinées
+            - "median_depletion_years" : médiane de ces durées (np.nan si aucune)
+            - "percentiles" : {p: capital au p-ième percentile, mois par mois}
+            - "final_percentiles" : {p: capital final au p-ième percentile}
+            - "accumulated_percentiles" : {p: capital en début de retraits}
+    """
+    ruined = paths["ruined"]
+    depletion_years = paths["depletion_month"][ruined] / 12
+    accumulated = np.percentile(paths["accumulated"], percentiles)
+
+    return {
+        "probability_of_ruin": float(ruined.mean()),
+        "depletion_years": depletion_years,
+        "median_depletion_years": float(np.median(depletion_years)) if len(depletion_years) else np.nan,
+        **path_percentiles(paths["values"], percentiles),
+        "accumulated_percentiles": dict(zip(percentiles, accumulated)),
+    }
+
+
+def path_percentiles(values: np.ndarray, percentiles=(5, 25, 50, 75, 95)) -> dict:
+    """
+    Percentiles du capital simulé, mois par mois et au terme.
+
+    Args:
+        values: Matrice (n_paths, n_mois + 1) de trajectoires
+
+    Returns:
+        dict:
+            - "percentiles" : {p: capital au p-ième percentile, mois par mois}
+            - "final_percentiles" : {p: capital final au p-ième percentile}
+    """
+    bands = np.percentile(values, percentiles, axis=0)
+    return {
+        "percentiles": dict(zip(percentiles, bands)),
+        "final_percentiles": dict(zip(percentiles, bands[:, -1])),
+    }
+
+
+def contribution_factors(growth: np.ndarray, contribution_frequency: float = 12) -> np.ndarray:
+    """
+    Facteurs linéaires de la valeur finale de chaque trajectoire.
+
+    Pour des rendements fixés, la valeur finale est linéaire en (pv, pmt) :
+    FV = pv·P_N + pmt·S_N, avec P_N le produit des facteurs mensuels et
+    S_N la valeur finale de 1 FCFA versé à chaque échéance (tous les
+    12 / fréquence mois, en fin de mois).
+
+    Args:
+        growth: Matrice (n_paths, n_months) de facteurs de croissance
+        contribution_frequency: Versements par an
+
+    Returns:
+        np.ndarray: Matrice (n_paths, 2) [P_N, S_N] : FV = factors @ [pv, pmt]
+    """
+    log_cum = np.cumsum(np.log(growth), axis=1)
+    months = np.arange(1, growth.shape[1] + 1)
+    paid = np.isclose(np.mod(months, 12 / contribution_frequency), 0)
+    initial = np.exp(log_cum[:, -1])
+    contributions = np.sum(np.exp(log_cum[:, -1:] - log_cum[:, paid]), axis=1)
+    return np.column_stack([initial, contributions])
+
+
+def probability_of_target(fv, pv, pmt, rate: float, volatility: float, n_years: float,
+                          contribution_frequency: float = 12, n_paths: int = SIMULATION_PATHS,
+                          seed: int = SIMULATION_SEED) -> np.ndarray:
+    """
+    Probabilité d'atteindre `fv` pour un ou plusieurs versements.
+
+    Tous les versements sont évalués sur les mêmes trajectoires (nombres
+    aléatoires communs) par un seul produit matrice × matrice.
+
+    Returns:
+        np.ndarray: Probabilités (0-1), de la forme de `pmt`
+    """
+    factors = contribution_factors(
+        simulate_monthly_returns(rate, volatility, int(round(n_years * 12)), n_paths, seed), contribution_frequency
+    )
+    pmt = np.asarray(pmt, dtype=float)
+    finals = factors @ np.vstack([np.full(pmt.size, float(pv)), pmt.ravel()])
+    return np.mean(finals >= fv, axis=0).reshape(pmt.shape)
+
+
+def calculate_pmt_probability(fv: float, pv: float, rate: float, volatility: float, n_years: float,
+                              probability=90.0, contribution_frequency: float = 12,
+                              n_paths: int = SIMULATION_PATHS, seed: int = SIMULATION_SEED) -> np.ndarray:
+    """
+    Versement qui atteint `fv` avec la probabilité demandée.
+
+    Sur chaque trajectoire, FV = pv·P_N + pmt·S_N est linéaire et
+    croissant en pmt : le versement qui atteint tout juste l'objectif vaut
+    (fv - pv·P_N) / S_N. Un versement atteint l'objectif avec probabilité
+    p ssi il dépasse ce seuil sur une part p des trajectoires : la
+    recherche se réduit donc au quantile p des seuils, calculé sur une
+    seule simulation (nombres aléatoires communs), sans itération.
+
+    Args:
+        fv: Objectif à atteindre
+        pv: Montant initial
+        rate: Rendement annuel moyen en %
+        volatility: Volatilité annuelle en %
+        n_years: Durée en années
+        probability: Probabilité visée en % (tableau accepté)
+        contribution_frequency: Versements par an
+        n_paths: Nombre de trajectoires
+        seed: Graine du générateur
+
+    Returns:
+        np.ndarray: Versement par période (0 si le capital initial suffit
+            avec cette probabilité ; np.inf sans versement possible)
+    """
+    factors = contribution_factors(
+        simulate_monthly_returns(rate, volatility, int(round(n_years * 12)), n_paths, seed), contribution_frequency
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        thresholds = np.where(
+            factors[:, 1] > 0,
+            (fv - pv * factors[:, 0]) / factors[:, 1],
+            np.where(pv * factors[:, 0] >= fv, -np.inf, np.inf),
+        )
+    required = np.quantile(thresholds, np.asarray(probability, dtype=float) / 100, method="inverted_cdf")
+    return np.maximum(required, 0.0)
@@ -0,0 +1,284 @@
+# core/taxes.py
+# ---------------------------------------------------------
+# Fiscalité des placements dans les pays de l'UEMOA :
+# - table compacte des règles par pays (construite une fois à l'import)
+# - retenue à la source sur les revenus courants, prélevée chaque mois
+#   sur la part « revenus » du rendement puis réinvestie nette
+# - imposition des plus-values à la sortie (valeur de rachat nette)
+# - solveurs après impôts pour les quatre modes de calcul
+# - comparaison des huit pays en un seul appel vectorisé
+#
+# `taxes` est un dict {"withholding", "capital_gains", "income_share"}
+# (en %, clés absentes = 0), typiquement obtenu par `country_taxes`.
+# Ses valeurs peuvent être des tableaux NumPy : avec `country_taxes()`
+# (sans pays), chaque résultat a un élément par pays de l'UEMOA.
+#
+# Les frais (core/fees) sont prélevés avant impôts : la retenue porte
+# sur le rendement net de frais courants, et la plus-value se mesure par
+# rapport aux sommes versées (droits d'entrée compris).
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.config import UEMOA_COUNTRIES, UEMOA_TAX_RULES, DEFAULT_INCOME_SHARE
+from core.calculations import validate_inputs, calculate_fv_periodic, _force_of_interest
+from core.fees import net_force_of_interest, balance_factors, _fee_terms
+
+TAX_RULE_KEYS = ("withholding", "capital_gains")
+
+# Table (pays × règles) dans l'ordre de UEMOA_COUNTRIES
+TAX_TABLE = np.array([[UEMOA_TAX_RULES[country][key] for key in TAX_RULE_KEYS] for country in UEMOA_COUNTRIES])
+
+
+def country_taxes(country: str = None, income_share: float = DEFAULT_INCOME_SHARE) -> dict:
+    """
+    Règles fiscales d'un pays, ou de tous les pays de l'UEMOA.
+
+    Args:
+        country: Pays de UEMOA_COUNTRIES ; None pour tous les pays à la fois
+        income_share: Part (%) du rendement perçue sous forme de revenus courants
+
+    Returns:
+        dict: {"withholding", "capital_gains", "income_share"} en % ; scalaires
+            pour un pays, tableaux alignés sur UEMOA_COUNTRIES sinon
+
+    Raises:
+        ValueError: Si le pays ne fait pas partie de l'UEMOA
+    """
+    rows = TAX_TABLE if country is None else TAX_TABLE[UEMOA_COUNTRIES.index(country)]
+    taxes = dict(zip(TAX_RULE_KEYS, rows.T if country is None else rows))
+    taxes["income_share"] = np.full(len(UEMOA_COUNTRIES), income_share) if country is None else income_share
+    return taxes
+
+
+def _tax_terms(taxes: dict = None) -> tuple:
+    """Retourne (withholding, capital_gains, income_share) en fraction."""
+    taxes = taxes or {}
+    return tuple(
+        np.asarray(taxes.get(key, 0.0), dtype=float) / 100
+        for key in TAX_RULE_KEYS + ("income_share",)
+    )
+
+
+def _after_tax_factors(rate, n_years, taxes: dict = None, fees: dict = None,
+                       contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Coefficients linéaires (en pv et pmt) de la valeur avant la sortie,
+    de la plus-value imposable et de la retenue cumulée.
+
+    Chaque mois, l'encours V produit s·r·V de revenus (r : rendement
+    mensuel net de frais courants, s : part des revenus), dont w·s·r·V
+    sont retenus à la source : le placement croît au taux r·(1 - w·s).
+    Les revenus nets réinvestis s'ajoutent au prix de revient, si bien que
+    la plus-value imposable à la sortie vaut V - versements - (1 - w)·s·r·Σ V_j.
+
+    Returns:
+        dict: Couples (coefficient de pv, coefficient de pmt) :
+            "value", "gain", "balance" (Σ V_j), "withholding",
+            ainsi que "n_payments" et "ongoing_fee_rate" (frais courants
+            prélevés par mois et par franc d'encours)
+    """
+    withholding, _, income_share = _tax_terms(taxes)
+    kept = 1 - _fee_terms(fees)[0] / 100
+    monthly = np.expm1(net_force_of_interest(rate, fees, compounding_frequency) / 12)
+    monthly_gross = np.expm1(_force_of_interest(rate, compounding_frequency) / 12)
+
+    # Pas de retenue sur un rendement négatif
+    income = income_share * np.maximum(monthly, 0)
+    rate_after = np.log1p(monthly - withholding * income) * 1200
+    growth, annuity, n_payments, pv_sum, pmt_sum = balance_factors(rate_after, n_years, contribution_frequency)
+
+    reinvested = (1 - withholding) * income
+    value = (kept * growth, kept * annuity)
+    balance = (kept * pv_sum, kept * pmt_sum)
+    return {
+        "value": value,
+        "gain": (value[0] - 1 - reinvested * balance[0], value[1] - n_payments - reinvested * balance[1]),
+        "balance": balance,
+        "withholding": (withholding * income * balance[0], withholding * income * balance[1]),
+        "n_payments": n_payments,
+        "ongoing_fee_rate": monthly_gross - monthly,
+    }
+
+
+def after_tax_breakdown(pv, pmt, rate, n_years, taxes: dict = None, fees: dict = None,
+                        contribution_frequency=12, compounding_frequency=12) -> dict:
+    """
+    Valeur de rachat après impôts et impôts payés jusqu'à l'horizon.
+
+    Args:
+        pv: Montant initial
+        pmt: Versement par période
+        rate: Rendement annuel brut en %
+        n_years: Durée en années
+        taxes: Règles fiscales (voir `country_taxes`)
+        fees: Structure de frais optionnelle (voir core/fees)
+        contribution_frequency: Versements par an (12 : mensuels)
+        compounding_frequency: Capitalisations par an (np.inf : continue)
+
+    Returns:
+        dict: Tableaux NumPy (diffusés) :
+            - "value" : valeur de rachat nette d'impôts
+            - "gross_value" : valeur avant l'impôt sur la plus-value
+            - "withholding" : retenues à la source cumulées
+            - "capital_gains_tax" : impôt sur la plus-value à la sortie
+            - "taxes" : total des impôts payés
+            - "fees" : frais payés (droits d'entrée et frais courants prélevés
+              sur l'encours après retenues)
+            - "invested" : sommes versées
+    """
+    factors = _after_tax_factors(rate, n_years, taxes, fees, contribution_frequency, compounding_frequency)
+    capital_gains = _tax_terms(taxes)[1]
+
+    gross_value = pv * factors["value"][0] + pmt * factors["value"][1]
+    gain = pv * factors["gain"][0] + pmt * factors["gain"][1]
+    withholding = pv * factors["withholding"][0] + pmt * factors["withholding"][1]
+    capital_gains_tax = capital_gains * np.maximum(gain, 0)
+    invested = pv + pmt * factors["n_payments"]
+    balance = pv * factors["balance"][0] + pmt * factors["balance"][1]
+    fees_paid = _fee_terms(fees)[0] / 100 * invested + factors["ongoing_fee_rate"] * balance
+
+    return {
+        "value": gross_value - capital_gains_tax,
+        "gross_value": gross_value,
+        "withholding": withholding,
+        "capital_gains_tax": capital_gains_tax,
+        "taxes": withholding + capital_gains_tax,
+        "fees": fees_paid,
+        "invested": invested,
+    }
+
+
+def calculate_fv_after_tax(pv, pmt, rate, n_years, taxes: dict = None, fees: dict = None,
+                           contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Valeur future nette de frais et d'impôts (valeur de rachat).
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, pmt, rate, n_years)
+    return after_tax_breakdown(pv, pmt, rate, n_years, taxes, fees, contribution_frequency, compounding_frequency)["value"]
+
+
+def solve_after_tax(fv, value_known, gain_known, value_unit, gain_unit, capital_gains) -> np.ndarray:
+    """
+    Résout valeur après impôts = fv pour un montant inconnu x, la valeur
+    avant sortie valant value_known + x·value_unit et la plus-value
+    gain_known + x·gain_unit.
+
+    La valeur après impôts est linéaire par morceaux : on retient le régime
+    imposé (plus-value positive) s'il est cohérent, sinon le régime sans impôt.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        taxed = (fv - value_known + capital_gains * gain_known) / (value_unit - capital_gains * gain_unit)
+        untaxed = (fv - value_known) / value_unit
+    return np.where(gain_known + taxed * gain_unit >= 0, taxed, untaxed)
+
+
+def calculate_pmt_after_tax(fv, pv, rate, n_years, taxes: dict = None, fees: dict = None,
+                            contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Versement nécessaire pour atteindre FV net de frais et d'impôts.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, 0, rate, n_years)
+    factors = _after_tax_factors(rate, n_years, taxes, fees, contribution_frequency, compounding_frequency)
+    value, gain = factors["value"], factors["gain"]
+    return solve_after_tax(fv, pv * value[0], pv * gain[0], value[1], gain[1], _tax_terms(taxes)[1])
+
+
+def calculate_pv_after_tax(fv, pmt, rate, n_years, taxes: dict = None, fees: dict = None,
+                           contribution_frequency=12, compounding_frequency=12) -> np.ndarray:
+    """
+    Montant initial nécessaire pour atteindre FV net de frais et d'impôts.
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(0, pmt, rate, n_years)
+    factors = _after_tax_factors(rate, n_years, taxes, fees, contribution_frequency, compounding_frequency)
+    value, gain = factors["value"], factors["gain"]
+    return solve_after_tax(fv, pmt * value[1], pmt * gain[1], value[0], gain[0], _tax_terms(taxes)[1])
+
+
+def calculate_n_years_after_tax(fv, pv, pmt, rate, taxes: dict = None, fees: dict = None,
+                                contribution_frequency=12, compounding_frequency=12,
+                                iterations: int = 50) -> np.ndarray:
+    """
+    Horizon nécessaire pour atteindre FV net de frais et d'impôts.
+
+    La valeur de rachat croît avec l'horizon dès que le rendement net est
+    positif : dichotomie vectorisée sur [0, 100] ans (précision d'environ
+    une seconde après 50 itérations).
+
+    Returns:
+        np.ndarray: Nombre d'années (np.inf si impossible en 100 ans)
+
+    Raises:
+        CalculationError: Si au moins un paramètre est invalide
+    """
+    validate_inputs(pv, pmt, rate, 0)
+    frequencies = (contribution_frequency, compounding_frequency)
+
+    def value_at(n_years):
+        return after_tax_breakdown(pv, pmt, rate, n_years, taxes, fees, *frequencies)["value"]
+
+    reachable = value_at(100.0) >= fv
+    low = np.zeros(np.shape(reachable))
+    high = np.full(np.shape(reachable), 100.0)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        reached = value_at(middle) >= fv
+        low = np.where(reached, low, middle)
+        high = np.where(reached, middle, high)
+
+    years = np.where(value_at(0.0) >= fv, 0.0, high)
+    return np.where(reachable, years, np.inf)
+
+
+def _equivalent_rate(pv, pmt, n_years, fv, contribution_frequency=12, compounding_frequency=12,
+                     iterations: int = 60) -> np.ndarray:
+    """
+    Rendement annuel effectif (%) d'un placement sans frais ni impôts
+    produisant `fv` : dichotomie vectorisée sur [-50 %, 100 %].
+    """
+    low = np.full(np.shape(fv), -50.0)
+    high = np.full(np.shape(fv), 100.0)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        above = calculate_fv_periodic(pv, pmt, middle, n_years, contribution_frequency, np.inf) >= fv
+        low = np.where(above, low, middle)
+        high = np.where(above, middle, high)
+    # Taux continu -> taux effectif annuel
+    return np.expm1((low + high) / 2 / 100) * 100
+
+
+def compare_countries(pv, pmt, rate, n_years, fees: dict = None,
+                      contribution_frequency=12, compounding_frequency=12,
+                      income_share: float = DEFAULT_INCOME_SHARE) -> dict:
+    """
+    Résultats après impôts pour les huit pays de l'UEMOA en un seul appel.
+
+    Returns:
+        dict: Tableaux NumPy alignés sur UEMOA_COUNTRIES :
+            - "country" : noms des pays
+            - "fv" : valeur de rachat nette d'impôts
+            - "taxes" : total des impôts payés
+            - "withholding", "capital_gains_tax" : détail des impôts
+            - "net_rate" : rendement annuel effectif après frais et impôts (%),
+              rendement constant produisant la même valeur de rachat
+    """
+    frequencies = (contribution_frequency, compounding_frequency)
+    breakdown = after_tax_breakdown(pv, pmt, rate, n_years, country_taxes(None, income_share), fees, *frequencies)
+
+    return {
+        "country": list(UEMOA_COUNTRIES),
+        "fv": breakdown["value"],
+        "taxes": breakdown["taxes"],
+        "withholding": breakdown["withholding"],
+        "capital_gains_tax": breakdown["capital_gains_tax"],
+        "net_rate": _equivalent_rate(pv, pmt, n_years, breakdown["value"], *frequencies),
+    }
@@ -5,11 +5,14 @@
 # - validation
 # - arrondis
 # - helpers généraux
+# - sous-échantillonnage des séries pour les graphiques
 # ---------------------------------------------------------
 
 import math
 from typing import Union
 
+import numpy as np
+
 
 def fmt_money(value: float) -> str:
     """
@@ -91,3 +94,57 @@ def round_down(value: float, decimals: int = 0) -> float:
     """
     factor = 10 ** decimals
     return math.floor(value * factor) / factor
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Sélectionne au plus `max_points` indices d'une série avec l'algorithme
+    Largest-Triangle-Three-Buckets (LTTB).
+
+    Le premier et le dernier point sont toujours conservés : la valeur finale
+    affichée reste donc exacte. Dans chaque tranche, on garde le point qui forme
+    le plus grand triangle avec le point retenu précédemment et la moyenne de la
+    tranche suivante, ce qui préserve la forme de la courbe.
+
+    Args:
+        x: Abscisses (croissantes)
+        y: Ordonnées
+        max_points: Nombre maximal de points à conserver
+
+    Returns:
+        np.ndarray: Indices retenus, triés par ordre croissant
+
+    Example:
+        >>> lttb_indices(np.arange(1201), np.arange(1201) ** 2, 240).size
+        240
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bornes des tranches intermédiaires (le premier et le dernier point sont à part)
+    edges = (np.arange(max_points - 1) * (n - 2) / (max_points - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
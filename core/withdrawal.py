@@ -0,0 +1,165 @@
+# core/withdrawal.py
+# ---------------------------------------------------------
+# Phase de retraits réguliers (décumulation) en forme fermée :
+# - capital restant mois par mois
+# - mois d'épuisement du capital et durée soutenable
+# - retrait mensuel maximal soutenable
+# - rendement minimal nécessaire pour un plan accumulation + retraits
+#
+# Toutes les fonctions acceptent des tableaux NumPy (grilles de
+# taux, de retraits, ...) et n'utilisent aucune boucle sur les mois.
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import calculate_fv_batch, growth_factors
+
+
+def withdrawal_balance(capital, withdrawal, rate, months) -> np.ndarray:
+    """
+    Capital restant après `months` retraits mensuels (en fin de mois).
+
+    V_m = C·(1 + r)^m - w·((1 + r)^m - 1) / r, ramené à 0 une fois le
+    capital épuisé (le capital ne redevient jamais positif ensuite).
+
+    Args:
+        capital: Capital au début de la phase de retrait
+        withdrawal: Retrait mensuel
+        rate: Rendement annuel en %
+        months: Nombre de mois écoulés
+
+    Returns:
+        np.ndarray: Capital restant (>= 0)
+    """
+    growth, annuity = growth_factors(rate, np.asarray(months, dtype=float))
+    balance = capital * growth - withdrawal * annuity
+    depleted = np.asarray(months) >= depletion_month(capital, withdrawal, rate)
+    return np.where(depleted, 0.0, np.maximum(balance, 0.0))
+
+
+def _depletion_months(capital, withdrawal, rate) -> np.ndarray:
+    """
+    Instant (en mois, non arrondi) où le capital atteint 0, ou np.inf.
+
+    Pour r ≠ 0 : m* = log(K / (K - C)) / log(1 + r) avec K = w / r.
+    Pour r = 0 : m* = C / w.
+    """
+    capital, withdrawal, rate = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (capital, withdrawal, rate))
+    )
+    rate_monthly = rate / 100 / 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_rate = np.where(rate_monthly == 0, 1.0, rate_monthly)
+        k = withdrawal / safe_rate
+        months = np.log(k / (k - capital)) / np.log1p(safe_rate)
+        # Ratio <= 0 ou durée négative : les intérêts couvrent les retraits
+        months = np.where((k / (k - capital) > 0) & (months >= 0), months, np.inf)
+        linear = np.where(withdrawal > 0, capital / withdrawal, np.inf)
+
+    months = np.where(rate_monthly == 0, linear, months)
+    months = np.where(withdrawal > 0, months, np.inf)
+    return np.where(capital <= 0, 0.0, months)
+
+
+def depletion_month(capital, withdrawal, rate) -> np.ndarray:
+    """
+    Numéro du mois au cours duquel le capital est épuisé (np.inf si jamais).
+
+    Args:
+        capital: Capital au début de la phase de retrait
+        withdrawal: Retrait mensuel
+        rate: Rendement annuel en %
+
+    Returns:
+        np.ndarray: Mois d'épuisement (1 = premier mois de retrait)
+    """
+    return np.ceil(_depletion_months(capital, withdrawal, rate) - 1e-9)
+
+
+def depletion_analysis(capital, withdrawal, rate, withdrawal_years) -> dict:
+    """
+    Analyse exacte d'une phase de retraits réguliers.
+
+    Args:
+        capital: Capital au début de la phase de retrait
+        withdrawal: Retrait mensuel
+        rate: Rendement annuel en %
+        withdrawal_years: Durée prévue des retraits en années
+
+    Returns:
+        dict: Tableaux NumPy (diffusés) :
+            - "depletion_month" : mois d'épuisement (np.inf si jamais)
+            - "sustainable_years" : durée pendant laquelle les retraits sont
+              couverts, en années (np.inf si le capital est perpétuel)
+            - "remaining_capital" : capital restant au terme prévu
+            - "depleted" : True si le capital s'épuise avant le terme (un
+              capital épuisé exactement au terme ne l'est pas)
+            - "max_withdrawal" : retrait mensuel maximal soutenable sur la durée
+            - "perpetual_withdrawal" : retrait mensuel qui préserve le capital
+    """
+    n_months = np.floor(np.asarray(withdrawal_years, dtype=float) * 12)
+    months = _depletion_months(capital, withdrawal, rate)
+    month = np.ceil(months - 1e-9)
+
+    return {
+        "depletion_month": month,
+        "sustainable_years": months / 12,
+        "remaining_capital": withdrawal_balance(capital, withdrawal, rate, n_months),
+        # Épuisé exactement au terme : retraits soutenables (à l'arrondi près)
+        "depleted": months < n_months - 1e-6,
+        "max_withdrawal": max_sustainable_withdrawal(capital, rate, withdrawal_years),
+        "perpetual_withdrawal": np.maximum(np.asarray(capital, dtype=float) * np.asarray(rate, dtype=float) / 100 / 12, 0.0),
+    }
+
+
+def max_sustainable_withdrawal(capital, rate, withdrawal_years) -> np.ndarray:
+    """
+    Retrait mensuel maximal qui épuise exactement le capital au terme prévu.
+
+    w = C·(1 + r)^N / A_N, avec A_N le facteur d'annuité sur N mois
+    (C / N si le taux est nul).
+
+    Args:
+        capital: Capital au début de la phase de retrait
+        rate: Rendement annuel en %
+        withdrawal_years: Durée des retraits en années
+
+    Returns:
+        np.ndarray: Retrait mensuel maximal (0 si la durée est nulle)
+    """
+    n_months = np.floor(np.asarray(withdrawal_years, dtype=float) * 12)
+    growth, annuity = growth_factors(rate, n_months)
+    safe_annuity = np.where(annuity == 0, 1.0, annuity)
+    return np.where(annuity == 0, 0.0, np.maximum(capital, 0) * growth / safe_annuity)
+
+
+def required_rate(pv, pmt, accumulation_years, withdrawal, withdrawal_years,
+                  low: float = -50.0, high: float = 100.0, iterations: int = 60) -> np.ndarray:
+    """
+    Rendement annuel minimal (en %) pour que le plan accumulation + retraits
+    tienne jusqu'au terme, par dichotomie vectorisée.
+
+    Le capital final (non borné) est croissant avec le taux : une dichotomie
+    sur l'intervalle [low, high] converge vers le taux exact.
+
+    Returns:
+        np.ndarray: Taux minimal en %, np.inf si même `high` ne suffit pas
+    """
+    def final_balance(rate):
+        capital = calculate_fv_batch(pv, pmt, rate, accumulation_years)
+        growth, annuity = growth_factors(rate, np.floor(np.asarray(withdrawal_years, dtype=float) * 12))
+        return capital * growth - withdrawal * annuity
+
+    shape = np.broadcast_shapes(*(np.shape(x) for x in (pv, pmt, accumulation_years, withdrawal, withdrawal_years)))
+    lo = np.full(shape, low)
+    hi = np.full(shape, high)
+
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        ok = final_balance(mid) >= 0
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+
+    hi = np.where(final_balance(np.full(shape, low)) >= 0, low, hi)
+    return np.where(final_balance(np.full(shape, high)) >= 0, hi, np.inf)
@@ -0,0 +1,204 @@
+# core/xirr.py
+# ---------------------------------------------------------
+# Rendement pondéré par les capitaux (TRI, « XIRR ») de flux irréguliers :
+# - historiques réels de comptes clients (versements, retraits, valeur actuelle)
+# - plans simulés (rendement net de frais et d'impôts)
+# - traitement par lot d'un portefeuille de comptes (fichier CSV)
+#
+# Convention de signe (celle du XIRR des tableurs) : sommes versées par
+# le client négatives, sommes reçues et valeur actuelle positives. Les
+# dates sont converties en années (exact/365).
+#
+# Le TRI annule la valeur des flux capitalisés à la date du dernier flux :
+#     g(δ) = Σ a_i·e^(δ·(T - t_i)) = 0,   taux = e^δ - 1
+# Cette forme (plutôt que l'actualisation) évite les dépassements pour
+# les taux très négatifs. Tous les comptes sont résolus ensemble : une
+# ligne par compte, complétée par des flux nuls. Méthode de Newton
+# vectorisée, puis dichotomie sur [-99,99 % ; 10 000 %] pour les comptes
+# où Newton échoue.
+#
+# Usage en ligne de commande :
+#   python -m core.xirr flux.csv [-o resultats.csv]
+# avec les colonnes « account », « date », « amount ».
+# ---------------------------------------------------------
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core.events import _event_flows
+
+# Intervalle de recherche du taux instantané δ = ln(1 + taux)
+XIRR_BRACKET = (np.log(1e-4), np.log(101.0))
+
+
+def year_fractions(dates, start=None) -> np.ndarray:
+    """
+    Durées en années (exact/365) entre `start` et chaque date.
+
+    Args:
+        dates: Dates (tableau, série ou liste convertible par pandas)
+        start: Date de référence (par défaut la première date)
+    """
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    start = dates.min() if start is None else pd.Timestamp(start).to_datetime64()
+    return (dates - start) / np.timedelta64(1, "D") / 365
+
+
+def _terminal_value(delta, amounts, durations) -> tuple:
+    """Valeur des flux capitalisés à la date finale et sa dérivée en δ."""
+    growth = np.exp(np.clip(delta[..., None] * durations, -700, 700))
+    value = np.sum(amounts * growth, axis=-1)
+    return value, np.sum(amounts * durations * growth, axis=-1)
+
+
+def xirr(amounts, times, guess: float = 5.0, tolerance: float = 1e-10,
+         max_iterations: int = 50, bisection_iterations: int = 100) -> np.ndarray:
+    """
+    TRI annualisé de flux irréguliers, pour un ou plusieurs comptes à la fois.
+
+    Args:
+        amounts: Flux de forme (..., n) : négatifs pour les versements,
+            positifs pour les retraits et la valeur actuelle ; compléter
+            par des zéros les comptes ayant moins de flux
+        times: Dates des flux en années, même forme que `amounts`
+        guess: Taux de départ de la méthode de Newton en %
+        tolerance: Tolérance sur g(δ), relative à la somme des |flux|
+        max_iterations: Itérations de Newton
+        bisection_iterations: Itérations de la dichotomie de secours
+
+    Returns:
+        np.ndarray: TRI annuel en % (forme (...)) ; nan si les flux ne
+            changent pas de signe ou si aucun taux n'est trouvé dans
+            l'intervalle de recherche
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    times = np.broadcast_to(np.asarray(times, dtype=float), amounts.shape)
+    present = amounts != 0
+    durations = np.where(present, np.max(np.where(present, times, -np.inf), axis=-1, keepdims=True) - times, 0.0)
+    scale = np.sum(np.abs(amounts), axis=-1)
+    low, high = XIRR_BRACKET
+
+    # Newton vectorisé : les comptes convergés ne bougent plus
+    delta = np.full(amounts.shape[:-1], np.log1p(guess / 100))
+    for _ in range(max_iterations):
+        value, slope = _terminal_value(delta, amounts, durations)
+        active = np.abs(value) > tolerance * scale
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(active, value / slope, 0.0)
+        delta = np.clip(delta - np.nan_to_num(step, nan=0.0), low, high)
+
+    value, _ = _terminal_value(delta, amounts, durations)
+    has_both_signs = np.any(amounts > 0, axis=-1) & np.any(amounts < 0, axis=-1)
+    converged = (
+        has_both_signs & np.isfinite(value) & (np.abs(value) <= tolerance * scale) & (delta > low) & (delta < high)
+    )
+
+    # Dichotomie de secours sur les comptes non convergés dont g change de signe
+    g_low = _terminal_value(np.full_like(delta, low), amounts, durations)[0]
+    g_high = _terminal_value(np.full_like(delta, high), amounts, durations)[0]
+    bracketed = ~converged & (np.sign(g_low) * np.sign(g_high) < 0)
+    if bracketed.any():
+        a, b = np.full_like(delta, low), np.full_like(delta, high)
+        for _ in range(bisection_iterations):
+            middle = (a + b) / 2
+            same_sign = np.sign(_terminal_value(middle, amounts, durations)[0]) == np.sign(g_low)
+            a = np.where(same_sign, middle, a)
+            b = np.where(same_sign, b, middle)
+        delta = np.where(bracketed, (a + b) / 2, delta)
+
+    return np.where(converged | bracketed, np.expm1(delta) * 100, np.nan)
+
+
+def plan_cash_flows(pv, pmt, n_years, value, events: dict = None, pauses=None,
+                    contribution_frequency=12) -> tuple:
+    """
+    Flux d'un plan simulé, du point de vue du client.
+
+    Le capital initial et les versements (frais d'entrée compris) sont
+    des sorties, les retraits ponctuels et la valeur finale (nette de
+    frais et d'impôts) des entrées : leur TRI est le rendement net réel
+    du plan.
+
+    Returns:
+        tuple: (amounts, times) triés par date, en années
+    """
+    n_payments = int(np.floor(n_years * contribution_frequency + 1e-9))
+    payment_times = np.arange(1, n_payments + 1) / contribution_frequency
+    months, event_amounts, units = _event_flows(events, pauses, contribution_frequency)
+    active = months / 12 <= n_years + 1e-9
+
+    times = np.concatenate([[0.0], payment_times, months[active] / 12, [n_years]])
+    amounts = np.concatenate([
+        [-pv],
+        np.full(n_payments, -float(pmt)),
+        -(event_amounts[active] + units[active] * pmt),
+        [value],
+    ])
+    order = np.argsort(times, kind="stable")
+    return amounts[order], times[order]
+
+
+def plan_xirr(pv, pmt, n_years, value, events: dict = None, pauses=None, contribution_frequency=12) -> float:
+    """TRI annuel (%) d'un plan simulé, net de frais et d'impôts (voir `plan_cash_flows`)."""
+    amounts, times = plan_cash_flows(pv, pmt, n_years, value, events, pauses, contribution_frequency)
+    return float(xirr(amounts, times))
+
+
+def accounts_xirr(flows: pd.DataFrame, account: str = "account", date: str = "date",
+                  amount: str = "amount") -> pd.DataFrame:
+    """
+    TRI de chaque compte d'un historique de flux, en un seul appel vectorisé.
+
+    Args:
+        flows: Une ligne par flux, avec le compte, la date et le montant
+            (la valeur actuelle de chaque compte est un flux positif à la
+            date d'évaluation)
+
+    Returns:
+        pd.DataFrame: Une ligne par compte : "account", "first_date",
+            "last_date", "contributions" (sommes versées), "distributions"
+            (sommes reçues et valeur actuelle), "xirr" (en %)
+    """
+    flows = flows[[account, date, amount]].dropna()
+    dates = pd.to_datetime(flows[date])
+    accounts, index = np.unique(flows[account].to_numpy(), return_inverse=True)
+    position = flows.groupby(index).cumcount().to_numpy()
+
+    # Une ligne par compte, complétée par des flux nuls
+    amounts = np.zeros((len(accounts), position.max() + 1 if len(flows) else 1))
+    times = np.zeros_like(amounts)
+    amounts[index, position] = flows[amount].to_numpy(dtype=float)
+    times[index, position] = year_fractions(dates, dates.min() if len(flows) else None)
+
+    grouped = flows.assign(**{date: dates}).groupby(index)
+    values = flows[amount].astype(float)
+    return pd.DataFrame({
+        "account": accounts,
+        "first_date": grouped[date].min().to_numpy(),
+        "last_date": grouped[date].max().to_numpy(),
+        "contributions": -values.clip(upper=0).groupby(index).sum().to_numpy(),
+        "distributions": values.clip(lower=0).groupby(index).sum().to_numpy(),
+        "xirr": xirr(amounts, times),
+    })
+
+
+def main(argv=None) -> int:
+    """Calcul par lot : lit un CSV de flux et écrit le TRI de chaque compte."""
+    parser = argparse.ArgumentParser(description="TRI (XIRR) de chaque compte d'un fichier de flux.")
+    parser.add_argument("input", help="CSV avec les colonnes account, date, amount")
+    parser.add_argument("-o", "--output", help="CSV de sortie (par défaut : sortie standard)")
+    parser.add_argument("--sep", default=",", help="Séparateur du CSV (par défaut : ,)")
+    args = parser.parse_args(argv)
+
+    results = accounts_xirr(pd.read_csv(args.input, sep=args.sep))
+    results.to_csv(args.output or sys.stdout, sep=args.sep, index=False, float_format="%.6f")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@
 #   - ui.sidebar.display_sidebar()
 #   - ui.forms.parameter_form()
 #   - ui.layout.display_results()
+#   - ui.layout.display_account_return() (TRI d'un compte existant)
 #
 # ------------------------------------------------------------
 
@@ -13,7 +14,7 @@ import streamlit as st
 
 from ui.sidebar import display_sidebar
 from ui.forms import parameter_form
-from ui.layout import display_results
+from ui.layout import display_results, display_account_return
 from core.config import get_theme_css, APP_NAME
 
 
@@ -40,10 +41,14 @@ def main():
     # ---- Formulaire ----
     inputs, calculation_mode = parameter_form()
 
-    # Bouton Lancer
-    if st.button("Lancer la simulation", type="primary"):
+    # Bouton Lancer (un changement de mode réaffiche aussi les résultats, sans recalcul)
+    launched = st.button("Lancer la simulation", type="primary")
+    if launched or st.session_state.pop("show_results", False):
         display_results(inputs, calculation_mode)
 
+    st.markdown("---")
+    display_account_return()
+
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,20 @@
 # pages/2_Scénarios_Projections.py
 # ------------------------------------------------------------
 # Page de scénarios avancés et projections pour clients expérimentés :
+#   - Projection interactive « et si ? » calculée dans le navigateur
 #   - Comparaison plusieurs horizons de placement
 #   - Sensibilité au taux
 #   - Sensibilité aux versements
-#   - Scénarios de retraits réguliers
-#   - Impact de l'inflation
+#   - Scénarios de retraits réguliers (analyse d'épuisement exacte,
+#     rente viagère, risque de séquence des rendements par simulation)
+#   - Impact de l'inflation (termes réels, versements indexés, plusieurs hypothèses)
+#   - Carte de sensibilité 2D (taux × versement / taux × horizon)
+#   - Graphique tornade des paramètres les plus influents
+#   - Impact des frais (comparaison des structures de frais usuelles)
+#   - Comparaison fiscale entre les pays de l'UEMOA
+#   - Planification de plusieurs objectifs par ordre de priorité
+#   - Portefeuille multi-actifs (rendements corrélés, rééquilibrage)
+#   - Allocation cycle de vie (glide path) et projection d'une cohorte de clients
 #   - Analyses et visualisations avancées
 #
 # Cette page peut utiliser les résultats de la simulation ou 
@@ -14,12 +23,15 @@
 # Utilise Altair pour les visualisations.
 # ------------------------------------------------------------
 
+import time
+
 import streamlit as st
 import pandas as pd
 import altair as alt
 import numpy as np
 
 from ui.sidebar import display_sidebar
+from ui.charts import create_whatif_chart, create_sensitivity_heatmap, create_fan_chart
 from core.config import (
     get_theme_css, 
     PRIMARY_COLOR, 
@@ -29,12 +41,79 @@ from core.config import (
     DEFAULT_INITIAL_CAPITAL,
     DEFAULT_MONTHLY_PAYMENT,
     DEFAULT_ANNUAL_RATE,
-    DEFAULT_HORIZON_YEARS
+    DEFAULT_HORIZON_YEARS,
+    DEFAULT_VOLATILITY,
+    HEATMAP_GRID_SIZE,
+    RATE_CURVE_POINTS,
+    MIN_RATE,
+    MAX_HORIZON,
+    FEE_STRUCTURES,
+    UEMOA_COUNTRIES,
+    DEFAULT_INCOME_SHARE,
+    ASSET_CLASSES,
+    ASSET_CORRELATIONS,
+    PORTFOLIO_PROFILES,
+    REBALANCING_PERIODS,
+    GLIDE_PATH_SHAPES,
+    DEFAULT_GLIDE_PATH,
+    DEFAULT_RETIREMENT_AGE,
+)
+from core.calculations import (
+    CalculationError,
+    calculate_fv,
+    calculate_fv_batch,
+    calculate_pmt_batch,
+    calculate_n_years_batch,
+    equivalent_contribution,
 )
-from core.calculations import calculate_fv
+from core.results import SimulationResult, schedule_for
+from core.withdrawal import depletion_analysis, required_rate, withdrawal_balance, max_sustainable_withdrawal
+from core.annuity import SEXES, annuity_income, life_expectancy, survival_probabilities
+from core.stochastic import simulate_withdrawal_paths, ruin_statistics, path_percentiles
+from core.portfolio import simulate_portfolio_paths, portfolio_moments
+from core.glidepath import glide_path_factors, glide_path_percentiles, cohort_projection
+from core.inflation import real_rate, nominal_rate, real_schedule, real_terms_plan
+from core.fees import compare_fee_structures
+from core.taxes import compare_countries
+from core.goals import plan_goals, goal_schedules
+from core.sensitivity import fv_rate_sensitivity, tvm_sensitivities
 from core.utils import fmt_money
 
 
+# Hypothèses d'inflation proposées pour la comparaison en termes réels
+INFLATION_ASSUMPTIONS = [0.0, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0]
+
+# Libellés des résultats et paramètres pour le graphique tornade
+TORNADO_OUTPUTS = {
+    "Valeur Future": "fv",
+    "Versement mensuel requis": "pmt",
+    "Montant initial requis": "pv",
+    "Horizon nécessaire": "n_years",
+}
+# Objectifs proposés par défaut pour la planification multi-objectifs
+DEFAULT_GOALS = [
+    {"name": "Frais de scolarité", "amount": 5_000_000, "year": 8, "priority": 1},
+    {"name": "Achat immobilier", "amount": 15_000_000, "year": 15, "priority": 2},
+    {"name": "Retraite", "amount": 30_000_000, "year": 30, "priority": 3},
+]
+
+# Cohorte proposée par défaut (clients de même échéance)
+DEFAULT_COHORT = [
+    {"Client": "Client A", "Montant initial (FCFA)": 0, "Versement mensuel (FCFA)": 25_000},
+    {"Client": "Client B", "Montant initial (FCFA)": 1_000_000, "Versement mensuel (FCFA)": 50_000},
+    {"Client": "Client C", "Montant initial (FCFA)": 5_000_000, "Versement mensuel (FCFA)": 100_000},
+    {"Client": "Client D", "Montant initial (FCFA)": 20_000_000, "Versement mensuel (FCFA)": 0},
+]
+
+PARAMETER_LABELS = {
+    "fv": "Objectif (montant final)",
+    "pv": "Montant initial",
+    "pmt": "Versement mensuel",
+    "rate": "Rendement annuel",
+    "n_years": "Horizon",
+}
+
+
 def simulate_series(pv, pmt, rate, horizons):
     """Retourne un DataFrame contenant FV pour plusieurs horizons."""
     rows = []
@@ -45,12 +124,12 @@ def simulate_series(pv, pmt, rate, horizons):
 
 
 def simulate_rate_sensitivity(pv, pmt, n_years, rates):
-    """Sensibilité aux taux."""
-    rows = []
-    for r in rates:
-        fv = calculate_fv(pv, pmt, r, n_years)
-        rows.append({"Rendement (%)": r, "FV": fv})
-    return pd.DataFrame(rows)
+    """Sensibilité aux taux (une seule évaluation vectorisée pour tous les taux)."""
+    rates = np.asarray(rates, dtype=float)
+    return pd.DataFrame({
+        "Rendement (%)": rates,
+        "FV": calculate_fv_batch(pv, pmt, rates, n_years),
+    })
 
 
 def simulate_pmt_sensitivity(pv, rate, n_years, pmt_values):
@@ -69,156 +148,70 @@ def simulate_withdrawal_scenario(pv, pmt, rate, accumulation_years, withdrawal_m
     Phase 1 (accumulation) : pv + pmt réguliers pendant accumulation_years
     Phase 2 (retrait) : retraits réguliers de withdrawal_monthly pendant withdrawal_years
     
+    Les deux phases sont évaluées en forme fermée (sans boucle sur les mois).
     Retourne un DataFrame avec l'évolution du capital.
     """
-    rate_m = rate / 100 / 12
-    data = []
+    # Échéancier de la simulation déjà calculé s'il s'agit du même placement
+    accumulation = schedule_for(pv, pmt, rate, accumulation_years, st.session_state.get("simulation_results"))
+    accumulated_capital = accumulation["value"][-1]
+    offset_months = accumulation["month"][-1]
     
-    # Phase d'accumulation
-    value = pv
-    for month in range(int(accumulation_years * 12)):
-        value = value * (1 + rate_m) + pmt
-        data.append({
-            "Mois": month,
-            "Année": month / 12,
-            "Capital": value,
-            "Phase": "Accumulation"
-        })
+    # Phase de retrait : capital ramené à 0 une fois épuisé
+    withdrawal_months = np.arange(1, int(withdrawal_years * 12) + 1)
+    withdrawal_values = withdrawal_balance(accumulated_capital, withdrawal_monthly, rate, withdrawal_months)
     
-    # Phase de retrait
-    accumulated_capital = value
-    offset_months = int(accumulation_years * 12)
+    months = np.concatenate([accumulation["month"], offset_months + withdrawal_months])
+    df = pd.DataFrame({
+        "Mois": months,
+        "Année": months / 12,
+        "Capital": np.concatenate([accumulation["value"], withdrawal_values]),
+        "Phase": np.repeat(["Accumulation", "Retrait"], [len(accumulation["month"]), len(withdrawal_months)]),
+    })
     
-    for month in range(int(withdrawal_years * 12)):
-        value = value * (1 + rate_m) - withdrawal_monthly
-        if value < 0:
-            value = 0  # Le capital est épuisé
-        
-        data.append({
-            "Mois": offset_months + month,
-            "Année": (offset_months + month) / 12,
-            "Capital": value,
-            "Phase": "Retrait"
-        })
-    
-    return pd.DataFrame(data), accumulated_capital
+    return df, accumulated_capital
 
 
-def simulate_inflation_impact(pv, pmt, rate, n_years, inflation_rate):
+def simulate_inflation_impact(pv, pmt, rate, n_years, inflation_rate, indexed=False):
     """
     Compare la valeur nominale vs valeur réelle (ajustée de l'inflation).
-    """
-    rate_m = rate / 100 / 12
-    inflation_m = inflation_rate / 100 / 12
-    
-    data = []
-    value_nominal = pv
     
-    for month in range(int(n_years * 12) + 1):
-        if month > 0:
-            value_nominal = value_nominal * (1 + rate_m) + pmt
-        
-        # Valeur réelle = valeur nominale déflatée
-        value_real = value_nominal / ((1 + inflation_m) ** month)
-        
-        data.append({
-            "Année": month / 12,
-            "Valeur Nominale": value_nominal,
-            "Valeur Réelle": value_real
-        })
+    Les déflateurs sont calculés en une passe vectorisée ; avec `indexed`,
+    les versements sont revalorisés chaque mois au rythme de l'inflation.
+    """
+    schedule = real_schedule(pv, pmt, rate, n_years, inflation_rate, indexed)
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        "Année": schedule["year"],
+        "Valeur Nominale": schedule["nominal"],
+        "Valeur Réelle": schedule["real"]
+    })
 
 
-def main():
-    st.set_page_config(page_title="Scénarios & Projections | " + APP_NAME, layout="wide")
-    st.markdown(get_theme_css(), unsafe_allow_html=True)
-    display_sidebar()
-    
-    # ---- Initialize session state for simulation results ----
-    # Using None instead of {} to properly distinguish between "not yet initialized" and "no simulation run"
-    # This ensures we can accurately detect if a simulation has been performed
-    if "simulation_results" not in st.session_state:
-        st.session_state.simulation_results = None
+def _commit_whatif_values():
+    """Reporte les valeurs validées de la projection « et si ? » dans les paramètres de base."""
+    st.session_state.proj_rate = st.session_state.whatif_commit_rate
+    st.session_state.proj_pmt = st.session_state.whatif_commit_pmt
+    st.session_state.proj_n_years = st.session_state.whatif_commit_n_years
 
-    st.markdown(
-        f"""
-        <h1 style="color:{PRIMARY_COLOR};">🎯 Scénarios & Projections</h1>
-        <p style="font-size: 16px; color: #666;">
-        Explorez différents scénarios d'investissement, analysez l'impact des variations de paramètres, 
-        et planifiez votre stratégie financière à long terme avec des projections détaillées.
-        </p>
-        """,
-        unsafe_allow_html=True
-    )
 
-    st.markdown("---")
-    
-    # -------------------------------
-    # RÉCUPÉRATION DES RÉSULTATS DE SIMULATION
-    # -------------------------------
-    simulation_results = st.session_state.get('simulation_results', None)
-    has_simulation_results = (
-        simulation_results is not None 
-        and isinstance(simulation_results, dict) 
-        and len(simulation_results) > 0
-    )
-    
-    # Déterminer les valeurs par défaut
-    if has_simulation_results:
-        default_pv = int(simulation_results.get('pv', DEFAULT_INITIAL_CAPITAL))
-        default_pmt = int(simulation_results.get('pmt', DEFAULT_MONTHLY_PAYMENT))
-        default_rate = float(simulation_results.get('rate', DEFAULT_ANNUAL_RATE))
-        default_n_years = int(simulation_results.get('n_years', DEFAULT_HORIZON_YEARS))
-        
-        # Afficher un message informatif
-        st.info(
-            f"✅ **Paramètres chargés depuis votre simulation précédente.**\n\n"
-            f"Mode de calcul utilisé : *{simulation_results.get('calculation_mode', 'N/A')}*. "
-            f"Vous pouvez modifier les paramètres ci-dessous pour explorer d'autres scénarios."
-        )
-    else:
-        default_pv = DEFAULT_INITIAL_CAPITAL
-        default_pmt = DEFAULT_MONTHLY_PAYMENT
-        default_rate = DEFAULT_ANNUAL_RATE
-        default_n_years = DEFAULT_HORIZON_YEARS
-        
-        st.info(
-            "📋 **Aucune simulation détectée.**\n\n"
-            "Cette page utilise des paramètres par défaut. Pour de meilleurs résultats, "
-            "effectuez d'abord une simulation dans la page **Simulation** (menu latéral), "
-            "puis revenez ici pour explorer des scénarios avancés basés sur vos paramètres."
-        )
+def _seed_whatif_values():
+    """Aligne le formulaire « et si ? » sur les paramètres de base (initialisation ou modification)."""
+    st.session_state.whatif_commit_rate = st.session_state.proj_rate
+    st.session_state.whatif_commit_pmt = st.session_state.proj_pmt
+    st.session_state.whatif_commit_n_years = st.session_state.proj_n_years
 
-    # -------------------------------
-    # PARAMÈTRES DE BASE POUR L'ANALYSE
-    # -------------------------------
-    st.markdown("---")
-    st.markdown(f"### 🎯 Paramètres de base pour les projections")
-    st.markdown(
-        "<p style='color: #666; font-size: 14px; margin-bottom: 15px;'>"
-        "Ajustez ces paramètres pour explorer différents scénarios d'investissement. "
-        "Les analyses ci-dessous s'adapteront automatiquement."
-        "</p>",
-        unsafe_allow_html=True
-    )
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        pv = st.number_input("💰 Montant initial (FCFA)", value=default_pv, step=10_000, format="%d", key="proj_pv")
-    with col2:
-        pmt = st.number_input("💳 Versement mensuel (FCFA)", value=default_pmt, step=5_000, format="%d", key="proj_pmt")
-    with col3:
-        rate = st.number_input("📈 Rendement annuel (%)", value=default_rate, step=0.1, format="%.2f", key="proj_rate")
-    with col4:
-        n_years = st.number_input("⏱️ Horizon (années)", value=default_n_years, step=1, format="%d", min_value=1, key="proj_n_years")
 
-    st.markdown("---")
-
-    # ============================================================
-    # 1) COMPARAISON PAR HORIZON INTELLIGENT
-    # ============================================================
-    with st.expander("📊 Comparaison par horizon de placement", expanded=True):
+# ============================================================
+# 1) COMPARAISON PAR HORIZON INTELLIGENT
+# ============================================================
+@st.fragment
+def render_horizon_section(pv, pmt, rate, n_years):
+    """Section 1 : comparaison par horizon de placement."""
+    section = st.expander("📊 Comparaison par horizon de placement", expanded=True, key="section_horizon", on_change="rerun")
+    with section:
+        # Section repliée : rien n'est calculé
+        if not section.open:
+            return
         
         st.markdown(
             """
@@ -287,10 +280,17 @@ def main():
                 f"démontrant la puissance des intérêts composés sur le long terme."
             )
 
-    # ============================================================
-    # 2) SENSIBILITÉ AUX TAUX AMÉLIORÉE
-    # ============================================================
-    with st.expander("📈 Analyse de sensibilité aux taux de rendement"):
+
+# ============================================================
+# 2) SENSIBILITÉ AUX TAUX AMÉLIORÉE
+# ============================================================
+@st.fragment
+def render_rate_sensitivity_section(pv, pmt, rate, n_years):
+    """Section 2 : sensibilité au taux de rendement."""
+    section = st.expander("📈 Analyse de sensibilité aux taux de rendement", key="section_rate", on_change="rerun")
+    with section:
+        if not section.open:
+            return
         
         st.markdown(
             """
@@ -313,30 +313,33 @@ def main():
                 key="rate_range_slider"
             )
         
-        # Générer une plage de taux intelligente
-        rates = [
+        # Taux d'échantillon du tableau, intégrés à la courbe continue :
+        # une seule évaluation vectorisée alimente la courbe, le tableau et le point actuel
+        table_rates = np.unique(np.round([
             max(0.1, rate - rate_range),
             max(0.1, rate - rate_range/2),
             rate,
             rate + rate_range/2,
             rate + rate_range
-        ]
-        rates = sorted([round(r, 2) for r in rates])
+        ], 2))
+        # Taux arrondis au centième (libellés du tableau et de la courbe)
+        curve_rates = np.round(np.linspace(table_rates[0], table_rates[-1], RATE_CURVE_POINTS), 2)
+        rates = np.union1d(curve_rates, np.append(table_rates, rate))
         df_r = simulate_rate_sensitivity(pv, pmt, n_years, rates)
         
-        # Calculer l'impact en FCFA et en %
-        # Find the closest rate to the current rate (handle floating point precision)
-        rate_rounded = round(rate, 2)
-        matching_rows = df_r[df_r["Rendement (%)"].apply(lambda x: abs(x - rate_rounded) < 0.01)]
-        current_fv = matching_rows["FV"].iloc[0] if len(matching_rows) > 0 else None
+        # Le taux actuel fait partie de la grille : recherche exacte
+        current_idx = np.searchsorted(rates, rate)
+        current_fv = df_r["FV"].iat[current_idx]
         
         if current_fv:
             df_r["Écart vs Actuel"] = df_r["FV"] - current_fv
             df_r["% Impact"] = (df_r["FV"] / current_fv - 1) * 100
+        
+        df_table = df_r.iloc[np.searchsorted(rates, table_rates)]
 
-        chart_r = (
+        curve_r = (
             alt.Chart(df_r)
-            .mark_line(point=True, strokeWidth=3)
+            .mark_line(strokeWidth=3)
             .encode(
                 x=alt.X("Rendement (%):Q", title="Taux de rendement annuel (%)"),
                 y=alt.Y("FV:Q", title="Valeur Future (FCFA)"),
@@ -348,22 +351,55 @@ def main():
             )
             .properties(height=350)
         )
+        
+        points_r = (
+            alt.Chart(df_table)
+            .mark_point(filled=True, size=70)
+            .encode(
+                x="Rendement (%):Q",
+                y="FV:Q",
+                color=alt.condition(
+                    alt.datum["Rendement (%)"] == round(rate, 2),
+                    alt.value(ACCENT_COLOR),
+                    alt.value(PRIMARY_COLOR)
+                ),
+                tooltip=[
+                    alt.Tooltip("Rendement (%):Q", format=".2f", title="Taux"),
+                    alt.Tooltip("FV:Q", format=",.0f", title="Valeur Future"),
+                ],
+            )
+        )
 
-        st.altair_chart(chart_r.interactive(), use_container_width=True)
+        st.altair_chart((curve_r + points_r).interactive(), use_container_width=True)
+        
+        # Sensibilités analytiques au taux actuel
+        sensitivity = fv_rate_sensitivity(pv, pmt, rate, n_years)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Valeur future actuelle", fmt_money(current_fv))
+        with col2:
+            st.metric(
+                "Effet de +1 point de taux",
+                fmt_money(sensitivity["derivative"]),
+                delta=f"{float(sensitivity['semi_elasticity']):+.1f}%",
+                help="Dérivée exacte de la valeur future par rapport au taux, au taux actuel"
+            )
+        with col3:
+            st.metric(
+                "Élasticité au taux",
+                f"{float(sensitivity['elasticity']):.2f}",
+                help="Variation en % de la valeur future pour une hausse de 1% (relative) du taux"
+            )
         
         # Tableau avec impact détaillé
         if current_fv:
             st.markdown("**📋 Impact détaillé par taux :**")
-            df_display = df_r.copy()
-            df_display["Taux"] = df_display["Rendement (%)"].apply(lambda x: f"{x:.2f}%")
-            df_display["Valeur Future"] = df_display["FV"].apply(lambda x: f"{x:,.0f} FCFA")
-            df_display["Écart"] = df_display["Écart vs Actuel"].apply(
-                lambda x: f"{x:+,.0f} FCFA" if pd.notna(x) else "—"
-            )
-            df_display["Impact"] = df_display["% Impact"].apply(
-                lambda x: f"{x:+.1f}%" if pd.notna(x) else "—"
-            )
-            df_display = df_display[["Taux", "Valeur Future", "Écart", "Impact"]]
+            df_display = pd.DataFrame({
+                "Taux": [f"{x:.2f}%" for x in df_table["Rendement (%)"]],
+                "Valeur Future": [f"{x:,.0f} FCFA" for x in df_table["FV"]],
+                "Écart": [f"{x:+,.0f} FCFA" for x in df_table["Écart vs Actuel"]],
+                "Impact": [f"{x:+.1f}%" for x in df_table["% Impact"]],
+            })
             st.dataframe(df_display, use_container_width=True, hide_index=True)
             
             # Insight sur la sensibilité
@@ -377,10 +413,17 @@ def main():
                 f"Choisissez un placement avec un taux stable et fiable !"
             )
 
-    # ============================================================
-    # 3) SENSIBILITÉ AUX VERSEMENTS AMÉLIORÉE
-    # ============================================================
-    with st.expander("💵 Sensibilité aux versements mensuels"):
+
+# ============================================================
+# 3) SENSIBILITÉ AUX VERSEMENTS AMÉLIORÉE
+# ============================================================
+@st.fragment
+def render_pmt_sensitivity_section(pv, pmt, rate, n_years):
+    """Section 3 : sensibilité aux versements mensuels."""
+    section = st.expander("💵 Sensibilité aux versements mensuels", key="section_pmt", on_change="rerun")
+    with section:
+        if not section.open:
+            return
         
         st.markdown(
             """
@@ -463,10 +506,17 @@ def main():
                             f"Cependant, un versement plus élevé génère un capital final plus important."
                         )
 
-    # ============================================================
-    # 4) SCÉNARIO DE RETRAITS RÉGULIERS
-    # ============================================================
-    with st.expander("🏦 Scénario de retraits réguliers (Phase d'accumulation + Phase de retrait)"):
+
+# ============================================================
+# 4) SCÉNARIO DE RETRAITS RÉGULIERS
+# ============================================================
+@st.fragment
+def render_withdrawal_section(pv, pmt, rate, n_years):
+    """Section 4 : phase d'accumulation puis phase de retraits réguliers."""
+    section = st.expander("🏦 Scénario de retraits réguliers (Phase d'accumulation + Phase de retrait)", key="section_withdrawal", on_change="rerun")
+    with section:
+        if not section.open:
+            return
         
         st.markdown(
             """
@@ -504,8 +554,36 @@ def main():
             key="withdrawal_monthly"
         )
         
+        col1, col2 = st.columns(2)
+        with col1:
+            indexed = st.checkbox(
+                "Versements et retraits indexés sur l'inflation",
+                value=False,
+                key="withdrawal_indexed",
+                help="Les montants sont exprimés en FCFA d'aujourd'hui et revalorisés chaque mois. "
+                     "Le scénario est alors calculé au taux réel."
+            )
+        with col2:
+            withdrawal_inflation = st.number_input(
+                "Inflation annuelle (%)",
+                value=2.5,
+                min_value=0.0,
+                max_value=20.0,
+                step=0.1,
+                key="withdrawal_inflation",
+                disabled=not indexed
+            )
+        
+        # En FCFA constants, un plan indexé se calcule comme un plan nominal au taux réel
+        plan_rate = float(real_rate(rate, withdrawal_inflation)) if indexed else rate
+        if indexed:
+            st.caption(
+                f"Montants en FCFA d'aujourd'hui — rendement réel : {plan_rate:.2f}% "
+                f"(rendement nominal {rate}%, inflation {withdrawal_inflation}%)."
+            )
+        
         df_withdrawal, accumulated = simulate_withdrawal_scenario(
-            pv, pmt, rate, accum_years, withdrawal_monthly, withdrawal_years
+            pv, pmt, plan_rate, accum_years, withdrawal_monthly, withdrawal_years
         )
         
         # Graphique
@@ -532,8 +610,10 @@ def main():
         
         st.altair_chart(chart_withdrawal, use_container_width=True)
         
-        # Métriques importantes
-        final_capital = df_withdrawal.iloc[-1]["Capital"]
+        # Analyse exacte de la phase de retrait (forme fermée)
+        analysis = depletion_analysis(accumulated, withdrawal_monthly, plan_rate, withdrawal_years)
+        final_capital = float(analysis["remaining_capital"])
+        max_withdrawal = float(analysis["max_withdrawal"])
         total_withdrawals = withdrawal_monthly * withdrawal_years * 12
         
         col1, col2, col3, col4 = st.columns(4)
@@ -543,7 +623,7 @@ def main():
         with col2:
             st.metric("Total des retraits", fmt_money(total_withdrawals))
         with col3:
-            if final_capital > 0:
+            if not analysis["depleted"]:
                 st.metric("Capital restant", fmt_money(final_capital), delta="✅ Viable")
             else:
                 st.metric("Capital restant", fmt_money(0), delta="⚠️ Épuisé")
@@ -553,38 +633,42 @@ def main():
             st.metric("Taux de retrait", f"{withdrawal_rate:.2f}%", 
                      help="Pourcentage du capital retiré chaque année")
         
-        # Analyse et recommandations intelligentes
-        if final_capital <= 0:
-            # Calculer combien de mois le capital peut tenir
-            months_sustainable = 0
-            capital_depleted = False
-            for idx, row in df_withdrawal[df_withdrawal["Phase"] == "Retrait"].iterrows():
-                if row["Capital"] <= 0:
-                    months_sustainable = int(row["Mois"]) - int(accum_years * 12)
-                    capital_depleted = True
-                    break
+        # Analyse et recommandations (valeurs exactes)
+        if analysis["depleted"]:
+            years_sustainable = float(analysis["sustainable_years"])
             
-            if capital_depleted and months_sustainable > 0:
-                years_sustainable = months_sustainable / 12
-                # Calcul de la différence de rendement nécessaire (toujours positif)
-                rate_diff = abs(withdrawal_rate - 4) if withdrawal_rate > 4 else 4 - withdrawal_rate
-                st.error(
-                    f"⚠️ **Capital épuisé après {years_sustainable:.1f} ans de retraits** "
-                    f"(sur {withdrawal_years} ans prévus).\n\n"
-                    f"**Recommandations :**\n"
-                    f"- Réduire les retraits mensuels à environ {withdrawal_monthly * 0.7:,.0f} FCFA (-30%)\n"
-                    f"- Ou augmenter la période d'accumulation de {int((withdrawal_years - years_sustainable) * 1.5)} ans\n"
-                    f"- Ou viser un rendement supérieur d'au moins {rate_diff:.1f} points de pourcentage"
+            # Capital nécessaire pour tenir la durée prévue, puis durée d'accumulation correspondante
+            required_capital = accumulated * withdrawal_monthly / max_withdrawal if max_withdrawal > 0 else np.inf
+            required_accum_years = float(calculate_n_years_batch(required_capital, pv, pmt, plan_rate))
+            min_rate = float(required_rate(pv, pmt, accum_years, withdrawal_monthly, withdrawal_years))
+            if indexed:
+                min_rate = float(nominal_rate(min_rate, withdrawal_inflation))
+            
+            recommendations = [
+                f"- Réduire les retraits mensuels à **{max_withdrawal:,.0f} FCFA** "
+                f"({(max_withdrawal / withdrawal_monthly - 1) * 100:+.1f}%)"
+            ]
+            if np.isfinite(required_accum_years):
+                recommendations.append(
+                    f"- Ou allonger la période d'accumulation de **{required_accum_years - accum_years:.1f} ans** "
+                    f"(soit {required_accum_years:.1f} ans au total)"
                 )
             else:
-                # Capital épuisé immédiatement
-                st.error(
-                    f"⚠️ **Capital insuffisant pour ce scénario de retraits.**\n\n"
-                    f"**Recommandations :**\n"
-                    f"- Augmenter significativement la période d'accumulation\n"
-                    f"- Ou réduire les retraits mensuels à {withdrawal_monthly * 0.5:,.0f} FCFA (-50%)\n"
-                    f"- Ou augmenter les versements mensuels durant l'accumulation"
+                recommendations.append("- Ou augmenter les versements mensuels durant l'accumulation")
+            if np.isfinite(min_rate):
+                recommendations.append(
+                    f"- Ou viser un rendement d'au moins **{min_rate:.2f}%** "
+                    f"(+{min_rate - rate:.2f} points de pourcentage)"
+                )
+            
+            if years_sustainable >= 1 / 12:
+                title = (
+                    f"⚠️ **Capital épuisé après {years_sustainable:.1f} ans de retraits** "
+                    f"(sur {withdrawal_years} ans prévus, au mois {int(analysis['depletion_month'])})."
                 )
+            else:
+                title = "⚠️ **Capital insuffisant pour ce scénario de retraits.**"
+            st.error(title + "\n\n**Recommandations :**\n" + "\n".join(recommendations))
         else:
             # Le scénario est viable
             sustainability_ratio = final_capital / accumulated
@@ -592,7 +676,8 @@ def main():
                 st.success(
                     f"✅ **Scénario très viable !** Après {withdrawal_years} ans de retraits, "
                     f"il vous reste encore {sustainability_ratio*100:.1f}% de votre capital initial. "
-                    f"Vous pourriez augmenter vos retraits mensuels jusqu'à environ {withdrawal_monthly * 1.3:,.0f} FCFA."
+                    f"Vous pourriez augmenter vos retraits mensuels jusqu'à **{max_withdrawal:,.0f} FCFA** "
+                    f"(capital entièrement consommé au terme)."
                 )
             elif sustainability_ratio > 0.2:
                 st.info(
@@ -604,6 +689,13 @@ def main():
                     f"⚠️ **Scénario juste viable.** Seulement {sustainability_ratio*100:.1f}% du capital reste. "
                     f"Considérez de réduire légèrement les retraits pour plus de sécurité."
                 )
+            
+            perpetual = float(analysis["perpetual_withdrawal"])
+            if perpetual > 0:
+                st.caption(
+                    f"💡 Un retrait mensuel de {perpetual:,.0f} FCFA préserverait intégralement le capital "
+                    f"(seuls les intérêts sont consommés)."
+                )
         
         # Calcul de la "règle des 4%" pour comparaison
         safe_withdrawal = accumulated * 0.04 / 12
@@ -620,11 +712,187 @@ def main():
                 f"**📊 Référence - Règle des 4% :** Selon cette règle classique de planification financière, "
                 f"un retrait mensuel sûr serait d'environ **{safe_withdrawal:,.0f} FCFA**."
             )
+        
+        # Rente viagère : la phase de retrait dure toute la vie au lieu d'une durée fixe
+        st.markdown("---")
+        st.markdown("**🪙 Conversion du capital en rente viagère**")
+        st.caption(
+            "Au lieu de retraits sur une durée fixe, le capital accumulé peut être converti en une rente "
+            "versée chaque mois jusqu'au décès : le risque de vivre plus longtemps que prévu est alors mutualisé."
+        )
+        if st.toggle("Phase de retrait en rente viagère", value=False, key="withdrawal_life_annuity"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                retirement_age = st.number_input(
+                    "Âge à la conversion",
+                    value=DEFAULT_RETIREMENT_AGE,
+                    min_value=40,
+                    max_value=90,
+                    step=1,
+                    key="annuity_age"
+                )
+            with col2:
+                sex = st.selectbox("Sexe", options=SEXES, key="annuity_sex")
+            with col3:
+                indexation = st.number_input(
+                    "Revalorisation annuelle de la rente (%)",
+                    value=0.0,
+                    min_value=0.0,
+                    max_value=10.0,
+                    step=0.5,
+                    key="annuity_indexation",
+                    help="0 : rente constante. Avec des montants indexés sur l'inflation, la rente "
+                         "est déjà exprimée en FCFA d'aujourd'hui."
+                )
+
+            income = float(annuity_income(accumulated, retirement_age, plan_rate, sex, indexation))
+            expectancy = float(life_expectancy(retirement_age, sex))
+            fixed_term = float(max_sustainable_withdrawal(accumulated, plan_rate, withdrawal_years))
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Rente viagère mensuelle", fmt_money(income),
+                          help="Première année ; revalorisée ensuite chaque année du taux choisi")
+            with col2:
+                st.metric("Espérance de vie à la conversion", f"{expectancy:.1f} ans")
+            with col3:
+                st.metric(f"Retrait maximal sur {withdrawal_years} ans", fmt_money(fixed_term),
+                          delta=f"{(fixed_term / income - 1) * 100:+.1f}% vs rente" if income > 0 else None,
+                          delta_color="off")
+
+            # Revenu espéré année par année (rente × probabilité d'être en vie)
+            survival = survival_probabilities(retirement_age, sex)[11::12]
+            years = np.arange(1, len(survival) + 1)
+            df_annuity = pd.DataFrame({
+                "Âge": retirement_age + years,
+                "Probabilité d'être en vie": survival * 100,
+                "Rente mensuelle": income * (1 + indexation / 100) ** (years - 1),
+            })
+            df_annuity = df_annuity[df_annuity["Probabilité d'être en vie"] >= 0.5]
+            chart_annuity = (
+                alt.Chart(df_annuity)
+                .mark_area(opacity=0.6, color=ACCENT_COLOR)
+                .encode(
+                    x=alt.X("Âge:Q", title="Âge"),
+                    y=alt.Y("Probabilité d'être en vie:Q", title="Probabilité d'être en vie (%)"),
+                    tooltip=[
+                        alt.Tooltip("Âge:Q"),
+                        alt.Tooltip("Probabilité d'être en vie:Q", format=".1f"),
+                        alt.Tooltip("Rente mensuelle:Q", format=",.0f"),
+                    ]
+                )
+                .properties(height=250, title="Probabilité de percevoir la rente selon l'âge")
+            )
+            st.altair_chart(chart_annuity, use_container_width=True)
 
-    # ============================================================
-    # 5) IMPACT DE L'INFLATION
-    # ============================================================
-    with st.expander("📉 Impact de l'inflation sur la valeur réelle"):
+            # Rente selon l'âge de conversion (toutes les valeurs en un seul appel)
+            ages = np.arange(max(retirement_age - 5, 40), min(retirement_age + 6, 91))
+            incomes = annuity_income(accumulated, ages, plan_rate, sex, indexation)
+            st.dataframe(
+                pd.DataFrame({
+                    "Âge à la conversion": ages,
+                    "Rente mensuelle": [fmt_money(v) for v in incomes],
+                    "Espérance de vie": [f"{v:.1f} ans" for v in life_expectancy(ages, sex)],
+                }),
+                use_container_width=True,
+                hide_index=True,
+            )
+            st.caption(
+                f"Taux technique : {plan_rate:.2f}% ; table de mortalité indicative. "
+                "Rente versée en fin de mois, sans réversion ni annuités garanties."
+            )
+
+        # Risque de séquence des rendements (rendements aléatoires)
+        st.markdown("---")
+        st.markdown("**🎲 Risque de séquence des rendements**")
+        st.caption(
+            "Le scénario ci-dessus suppose un rendement constant. En pratique, une série de mauvaises années "
+            "en début de retraits peut épuiser le capital même si le rendement moyen est atteint."
+        )
+        if st.toggle("Simuler des rendements aléatoires", value=False, key="withdrawal_stochastic"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                volatility = st.slider(
+                    "Volatilité annuelle (%)",
+                    min_value=0.0,
+                    max_value=30.0,
+                    value=DEFAULT_VOLATILITY,
+                    step=0.5,
+                    key="withdrawal_volatility"
+                )
+            with col2:
+                n_paths = st.selectbox(
+                    "Nombre de trajectoires",
+                    options=[1_000, 5_000, 10_000, 20_000],
+                    index=1,
+                    format_func=lambda n: f"{n:,}".replace(",", " "),
+                    key="withdrawal_paths"
+                )
+            with col3:
+                current_age = st.number_input(
+                    "Âge actuel",
+                    value=40,
+                    min_value=18,
+                    max_value=90,
+                    step=1,
+                    key="withdrawal_current_age"
+                )
+            
+            paths = simulate_withdrawal_paths(
+                pv, pmt, plan_rate, volatility, accum_years, withdrawal_monthly, withdrawal_years, n_paths
+            )
+            stats = ruin_statistics(paths)
+            retirement_age = current_age + accum_years
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Probabilité de ruine", f"{stats['probability_of_ruin'] * 100:.1f}%",
+                          help="Part des trajectoires où le capital s'épuise avant la fin des retraits")
+            with col2:
+                if np.isnan(stats["median_depletion_years"]):
+                    st.metric("Âge médian d'épuisement", "—")
+                else:
+                    st.metric("Âge médian d'épuisement", f"{retirement_age + stats['median_depletion_years']:.1f} ans",
+                              help="Parmi les trajectoires ruinées")
+            with col3:
+                st.metric("Capital médian au départ", fmt_money(stats["accumulated_percentiles"][50]))
+            with col4:
+                st.metric("Capital final médian", fmt_money(stats["final_percentiles"][50]))
+            
+            # Éventail des trajectoires (percentiles mois par mois)
+            chart_fan = create_fan_chart(
+                paths["month"], stats["percentiles"], "Capital simulé : médiane, intervalles 25-75% et 5-95%"
+            )
+            st.altair_chart(chart_fan, use_container_width=True)
+            
+            # Distribution de l'âge d'épuisement
+            if len(stats["depletion_years"]) > 0:
+                df_ages = pd.DataFrame({"Âge": retirement_age + stats["depletion_years"]})
+                chart_ages = (
+                    alt.Chart(df_ages)
+                    .mark_bar(color=ACCENT_COLOR)
+                    .encode(
+                        x=alt.X("Âge:Q", bin=alt.Bin(maxbins=40), title="Âge à l'épuisement du capital"),
+                        y=alt.Y("count():Q", title="Nombre de trajectoires"),
+                        tooltip=[alt.Tooltip("count():Q", title="Trajectoires")]
+                    )
+                    .properties(height=250, title="Distribution de l'âge d'épuisement (trajectoires ruinées)")
+                )
+                st.altair_chart(chart_ages, use_container_width=True)
+            else:
+                st.success("✅ Aucune trajectoire simulée n'épuise le capital avant le terme.")
+
+
+# ============================================================
+# 5) IMPACT DE L'INFLATION
+# ============================================================
+@st.fragment
+def render_inflation_section(pv, pmt, rate, n_years):
+    """Section 5 : impact de l'inflation sur la valeur réelle."""
+    section = st.expander("📉 Impact de l'inflation sur la valeur réelle", key="section_inflation", on_change="rerun")
+    with section:
+        if not section.open:
+            return
         
         st.markdown(
             """
@@ -643,7 +911,14 @@ def main():
             key="inflation_rate"
         )
         
-        df_inflation = simulate_inflation_impact(pv, pmt, rate, n_years, inflation_rate)
+        indexed = st.checkbox(
+            "Indexer les versements mensuels sur l'inflation",
+            value=False,
+            key="inflation_indexed",
+            help="Le versement est revalorisé chaque mois pour conserver son pouvoir d'achat."
+        )
+        
+        df_inflation = simulate_inflation_impact(pv, pmt, rate, n_years, inflation_rate, indexed)
         
         # Graphique comparatif
         df_inflation_melted = df_inflation.melt(
@@ -697,8 +972,34 @@ def main():
         with col3:
             st.metric("Perte de pouvoir d'achat", f"{purchasing_power_loss:.1f}%", delta=f"-{purchasing_power_loss:.1f}%")
         
+        # Comparaison de plusieurs hypothèses d'inflation (un seul calcul vectorisé)
+        st.markdown("**Comparaison de plusieurs hypothèses d'inflation**")
+        assumptions = st.multiselect(
+            "Hypothèses d'inflation (%)",
+            options=INFLATION_ASSUMPTIONS,
+            default=[1.0, 2.5, 4.0, 6.0],
+            key="inflation_assumptions"
+        )
+        if assumptions:
+            inflations = np.array(sorted(assumptions))
+            plan = real_terms_plan(pv, pmt, rate, n_years, inflations, indexed)
+            df_plans = pd.DataFrame({
+                "Inflation": [f"{i:.1f}%" for i in inflations],
+                "Rendement réel": [f"{r:.2f}%" for r in plan["real_rate"]],
+                "Valeur nominale": [fmt_money(v) for v in plan["nominal_fv"]],
+                "Valeur réelle": [fmt_money(v) for v in plan["real_fv"]],
+                "Perte de pouvoir d'achat": [f"{l:.1f}%" for l in plan["purchasing_power_loss"]],
+                "Versement indexé pour préserver l'objectif": [fmt_money(v) for v in plan["preserving_pmt"]],
+            })
+            st.dataframe(df_plans, use_container_width=True, hide_index=True)
+            st.caption(
+                f"Dernière colonne : versement mensuel indexé (en FCFA d'aujourd'hui) nécessaire pour que la "
+                f"valeur réelle finale atteigne {fmt_money(calculate_fv(pv, pmt, rate, n_years))}, "
+                f"la valeur obtenue sans inflation."
+            )
+        
         # Recommandation
-        real_return = rate - inflation_rate
+        real_return = float(real_rate(rate, inflation_rate))
         if real_return > 2:
             st.success(
                 f"✅ **Bon rendement réel** : Votre rendement ({rate}%) dépasse largement l'inflation "
@@ -716,5 +1017,786 @@ def main():
             )
 
 
+# ============================================================
+# 6) CARTE DE SENSIBILITÉ 2D
+# ============================================================
+@st.fragment
+def render_heatmap_section(pv, pmt, rate, n_years):
+    """Section 6 : carte de chaleur taux × versement ou taux × horizon."""
+    section = st.expander("🗺️ Carte de sensibilité (taux × versement / taux × horizon)", key="section_heatmap", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Cette carte croise deux paramètres à la fois sur une grille fine. 
+            Chaque case est un scénario complet : repérez d'un coup d'œil les combinaisons de taux 
+            et de versement (ou d'horizon) qui atteignent vos objectifs. La croix rouge marque 
+            votre situation actuelle.
+            """
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            grid_type = st.radio(
+                "Axe vertical",
+                ("Versement mensuel", "Horizon de placement"),
+                horizontal=True,
+                key="heatmap_axis"
+            )
+        with col2:
+            if grid_type == "Horizon de placement":
+                measure = st.radio(
+                    "Mesure affichée",
+                    ("Valeur Future", "Versement mensuel requis"),
+                    horizontal=True,
+                    key="heatmap_measure"
+                )
+            else:
+                measure = "Valeur Future"
+
+        if measure == "Versement mensuel requis":
+            target = st.number_input(
+                "🎯 Objectif à atteindre (FCFA)",
+                value=int(calculate_fv(pv, pmt, rate, n_years)),
+                step=100_000,
+                format="%d",
+                key="heatmap_target"
+            )
+
+        # Grille complète évaluée en un seul appel vectorisé ; les taux sont
+        # arrondis au centième (axe lisible)
+        rates = np.round(np.linspace(max(rate - 5, MIN_RATE), rate + 5, HEATMAP_GRID_SIZE), 2)
+        start = time.perf_counter()
+        if grid_type == "Versement mensuel":
+            levels = np.linspace(0, 2 * max(pmt, 50_000), HEATMAP_GRID_SIZE)
+            z = calculate_fv_batch(pv, levels[:, None], rates[None, :], n_years)
+            current_y, y_title = pmt, "Versement mensuel (FCFA)"
+        else:
+            levels = np.linspace(1, min(max(2 * n_years, 10), MAX_HORIZON), HEATMAP_GRID_SIZE)
+            if measure == "Versement mensuel requis":
+                z = calculate_pmt_batch(target, pv, rates[None, :], levels[:, None])
+            else:
+                z = calculate_fv_batch(pv, pmt, rates[None, :], levels[:, None])
+            current_y, y_title = n_years, "Horizon (années)"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        fig = create_sensitivity_heatmap(
+            rates, levels, z,
+            current_x=rate,
+            current_y=current_y,
+            x_title="Taux de rendement annuel (%)",
+            y_title=y_title,
+            z_title=measure
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.caption(
+            f"⚡ {HEATMAP_GRID_SIZE} × {HEATMAP_GRID_SIZE} = {z.size:,} scénarios "
+            f"calculés en {elapsed_ms:.1f} ms".replace(",", " ")
+        )
+
+
+# ============================================================
+# 7) GRAPHIQUE TORNADE (DÉRIVÉES ANALYTIQUES)
+# ============================================================
+@st.fragment
+def render_tornado_section(pv, pmt, rate, n_years):
+    """Section 7 : paramètres qui influencent le plus le résultat."""
+    section = st.expander("🌪️ Quels paramètres pèsent le plus ? (graphique tornade)", key="section_tornado", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Ce graphique classe les paramètres selon leur influence sur le 
+            résultat choisi, pour une même variation relative de chacun d'eux. Il permet 
+            d'expliquer simplement au client sur quel levier agir en priorité.
+            """
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            output_label = st.selectbox("Résultat analysé", list(TORNADO_OUTPUTS), key="tornado_output")
+        with col2:
+            shock = st.slider(
+                "Variation des paramètres (±%)",
+                min_value=1,
+                max_value=50,
+                value=10,
+                step=1,
+                key="tornado_shock"
+            )
+
+        output = TORNADO_OUTPUTS[output_label]
+        values = {
+            "fv": calculate_fv(pv, pmt, rate, n_years),
+            "pv": pv,
+            "pmt": pmt,
+            "rate": rate,
+            "n_years": n_years,
+        }
+
+        # Impact au premier ordre : dérivée exacte × variation du paramètre
+        derivatives = tvm_sensitivities(pv, pmt, rate, n_years)[output]
+        names = [name for name in derivatives if np.isfinite(derivatives[name])]
+        impacts = np.array([derivatives[name] * values[name] for name in names], dtype=float) * shock / 100
+
+        order = np.argsort(-np.abs(impacts))
+        labels = [PARAMETER_LABELS[names[i]] for i in order]
+        df_tornado = pd.DataFrame({
+            "Paramètre": np.repeat(labels, 2),
+            "Variation": [f"-{shock}%", f"+{shock}%"] * len(labels),
+            "Impact": np.column_stack([-impacts[order], impacts[order]]).ravel(),
+        })
+
+        unit = "ans" if output == "n_years" else "FCFA"
+        value_format = ",.2f" if output == "n_years" else ",.0f"
+
+        chart_tornado = (
+            alt.Chart(df_tornado)
+            .mark_bar()
+            .encode(
+                x=alt.X("Impact:Q", title=f"Variation de « {output_label} » ({unit})"),
+                y=alt.Y("Paramètre:N", sort=labels, title=None),
+                color=alt.Color(
+                    "Variation:N",
+                    scale=alt.Scale(domain=[f"-{shock}%", f"+{shock}%"], range=[SECONDARY_COLOR, PRIMARY_COLOR]),
+                    legend=alt.Legend(title="Variation du paramètre")
+                ),
+                tooltip=[
+                    alt.Tooltip("Paramètre:N"),
+                    alt.Tooltip("Variation:N"),
+                    alt.Tooltip("Impact:Q", format=value_format, title=f"Impact ({unit})"),
+                ],
+            )
+            .properties(height=60 * len(labels) + 40)
+        )
+
+        st.altair_chart(chart_tornado, use_container_width=True)
+
+        if len(labels) > 0:
+            top_impact = abs(impacts[order[0]])
+            top_text = f"{top_impact:,.2f} ans" if output == "n_years" else fmt_money(top_impact)
+            st.info(
+                f"🎯 **Levier principal :** une variation de ±{shock}% du paramètre "
+                f"« {labels[0]} » modifie « {output_label} » d'environ **{top_text}**."
+            )
+        st.caption("Approximation au premier ordre, calculée à partir des dérivées exactes des formules.")
+
+
+# ============================================================
+# 8) IMPACT DES FRAIS
+# ============================================================
+@st.fragment
+def render_fees_section(pv, pmt, rate, n_years):
+    """Section 8 : coût des frais selon la structure de frais du placement."""
+    section = st.expander("💸 Impact des frais sur le capital final", key="section_fees", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Droits d'entrée, frais de gestion et commissions de performance 
+            réduisent le capital final bien au-delà de leur montant : chaque franc prélevé cesse 
+            aussi de produire des intérêts. Cette analyse compare les structures de frais usuelles.
+            """
+        )
+
+        # Toutes les structures évaluées en un seul appel vectorisé
+        comparison = compare_fee_structures(pv, pmt, rate, n_years, FEE_STRUCTURES)
+        df_fees = pd.DataFrame({
+            "Structure": comparison["name"],
+            "Capital final": comparison["fv"],
+            "Frais payés": comparison["fees_paid"],
+            "Manque à gagner": comparison["cost"],
+            "Rendement net": comparison["net_rate"],
+        })
+
+        chart_fees = (
+            alt.Chart(df_fees)
+            .mark_bar()
+            .encode(
+                x=alt.X("Structure:N", sort=None, title=None),
+                y=alt.Y("Capital final:Q", title="Capital final net de frais (FCFA)"),
+                color=alt.value(PRIMARY_COLOR),
+                tooltip=[
+                    alt.Tooltip("Structure:N"),
+                    alt.Tooltip("Capital final:Q", format=",.0f"),
+                    alt.Tooltip("Frais payés:Q", format=",.0f"),
+                    alt.Tooltip("Manque à gagner:Q", format=",.0f"),
+                    alt.Tooltip("Rendement net:Q", format=".2f"),
+                ],
+            )
+            .properties(height=350)
+        )
+        st.altair_chart(chart_fees, use_container_width=True)
+
+        st.dataframe(
+            pd.DataFrame({
+                "Structure": df_fees["Structure"],
+                "Rendement net": [f"{r:.2f}%" for r in df_fees["Rendement net"]],
+                "Capital final": [fmt_money(v) for v in df_fees["Capital final"]],
+                "Frais payés": [fmt_money(v) for v in df_fees["Frais payés"]],
+                "Manque à gagner": [fmt_money(v) for v in df_fees["Manque à gagner"]],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        worst = int(np.argmax(comparison["cost"]))
+        st.info(
+            f"💡 **À retenir :** avec la structure « {comparison['name'][worst]} », le manque à gagner atteint "
+            f"**{fmt_money(comparison['cost'][worst])}** sur {n_years} ans, dont "
+            f"{fmt_money(comparison['fees_paid'][worst])} de frais effectivement payés."
+        )
+        st.caption("Manque à gagner : écart entre le capital sans frais et le capital net (frais payés + intérêts perdus sur ces frais).")
+
+
+# ============================================================
+# 9) COMPARAISON FISCALE UEMOA
+# ============================================================
+@st.fragment
+def render_tax_section(pv, pmt, rate, n_years):
+    """Section 9 : résultats après impôts dans les huit pays de l'UEMOA."""
+    section = st.expander("🌍 Comparaison fiscale entre les pays de l'UEMOA", key="section_taxes", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Retenue à la source sur les revenus et imposition des plus-values 
+            diffèrent d'un pays à l'autre. Cette analyse compare la valeur de rachat après impôts 
+            du même placement dans chacun des huit pays de l'UEMOA (taux indicatifs).
+            """
+        )
+
+        income_share = st.slider(
+            "Part du rendement perçue en revenus courants (%)",
+            min_value=0.0,
+            max_value=100.0,
+            value=DEFAULT_INCOME_SHARE,
+            step=5.0,
+            key="tax_income_share",
+            help="Intérêts et dividendes, soumis à la retenue à la source ; le reste est une plus-value imposée à la sortie."
+        )
+
+        # Les huit pays en un seul appel vectorisé
+        comparison = compare_countries(pv, pmt, rate, n_years, income_share=income_share)
+        client_country = st.session_state.get("country", UEMOA_COUNTRIES[0])
+        df_taxes = pd.DataFrame({
+            "Pays": comparison["country"],
+            "Valeur après impôts": comparison["fv"],
+            "Impôts payés": comparison["taxes"],
+            "Rendement net": comparison["net_rate"],
+            "Client": [country == client_country for country in comparison["country"]],
+        })
+
+        chart_taxes = (
+            alt.Chart(df_taxes)
+            .mark_bar()
+            .encode(
+                x=alt.X("Pays:N", sort="-y", title=None),
+                y=alt.Y("Valeur après impôts:Q", title="Valeur de rachat après impôts (FCFA)"),
+                color=alt.condition("datum.Client", alt.value(ACCENT_COLOR), alt.value(PRIMARY_COLOR)),
+                tooltip=[
+                    alt.Tooltip("Pays:N"),
+                    alt.Tooltip("Valeur après impôts:Q", format=",.0f"),
+                    alt.Tooltip("Impôts payés:Q", format=",.0f"),
+                    alt.Tooltip("Rendement net:Q", format=".2f"),
+                ],
+            )
+            .properties(height=350)
+        )
+        st.altair_chart(chart_taxes, use_container_width=True)
+
+        st.dataframe(
+            pd.DataFrame({
+                "Pays": comparison["country"],
+                "Retenue à la source": [fmt_money(v) for v in comparison["withholding"]],
+                "Impôt sur la plus-value": [fmt_money(v) for v in comparison["capital_gains_tax"]],
+                "Valeur après impôts": [fmt_money(v) for v in comparison["fv"]],
+                "Rendement net": [f"{r:.2f}%" for r in comparison["net_rate"]],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        best, worst = int(np.argmax(comparison["fv"])), int(np.argmin(comparison["fv"]))
+        st.info(
+            f"💡 **À retenir :** l'écart entre le pays le plus favorable ({comparison['country'][best]}) "
+            f"et le moins favorable ({comparison['country'][worst]}) atteint "
+            f"**{fmt_money(comparison['fv'][best] - comparison['fv'][worst])}** sur {n_years} ans."
+        )
+        st.caption(f"En surbrillance : pays du client ({client_country}). Rendement net : rendement annuel constant donnant la même valeur de rachat.")
+
+
+# ============================================================
+# 10) PLANIFICATION DE PLUSIEURS OBJECTIFS
+# ============================================================
+@st.fragment
+def render_goals_section(pv, pmt, rate, n_years):
+    """Section 10 : plusieurs objectifs financés par un même versement, par ordre de priorité."""
+    section = st.expander("🗂️ Planification de plusieurs objectifs", key="section_goals", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Scolarité des enfants, achat immobilier, retraite... Un même 
+            placement finance souvent plusieurs projets à des dates différentes. Indiquez vos 
+            objectifs et leur priorité (1 = la plus importante) : l'analyse calcule le versement 
+            minimal qui les finance tous et, avec votre budget, les objectifs effectivement couverts.
+            """
+        )
+
+        edited = st.data_editor(
+            pd.DataFrame(DEFAULT_GOALS).rename(columns={
+                "name": "Objectif", "amount": "Montant (FCFA)", "year": "Année", "priority": "Priorité",
+            }),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key="goals_editor",
+            column_config={
+                "Montant (FCFA)": st.column_config.NumberColumn(min_value=0, step=100_000, format="%d"),
+                "Année": st.column_config.NumberColumn(min_value=1, max_value=MAX_HORIZON, step=1),
+                "Priorité": st.column_config.NumberColumn(min_value=1, step=1),
+            },
+        )
+        edited = edited.dropna(subset=["Montant (FCFA)", "Année"])
+        if edited.empty:
+            st.warning("⚠️ Ajoutez au moins un objectif (montant et année).")
+            return
+        goals = [
+            {
+                "name": str(row["Objectif"]) if pd.notna(row["Objectif"]) else f"Objectif {index + 1}",
+                "amount": float(row["Montant (FCFA)"]),
+                "year": float(row["Année"]),
+                "priority": float(row["Priorité"]) if pd.notna(row["Priorité"]) else index + 1,
+            }
+            for index, (_, row) in enumerate(edited.iterrows())
+        ]
+
+        budget = st.number_input(
+            "💳 Budget de versement mensuel (FCFA)",
+            min_value=0, value=int(pmt), step=5_000, format="%d",
+            key="goals_budget",
+        )
+
+        plan = plan_goals(pv, goals, rate, pmt=budget)
+        col1, col2 = st.columns(2)
+        col1.metric("Versement minimal (tous les objectifs)", fmt_money(plan["minimal_pmt"]))
+        col2.metric("Objectifs financés avec le budget", f"{int(plan['funded'].sum())} / {len(goals)}")
+
+        if plan["feasible"]:
+            st.success(
+                f"✅ Votre budget de {fmt_money(budget)} par mois finance tous les objectifs "
+                f"(marge : {fmt_money(budget - plan['minimal_pmt'])} par mois)."
+            )
+        else:
+            missing = [name for name, funded in zip(plan["name"], plan["funded"]) if not funded]
+            st.warning(
+                f"⚠️ Budget insuffisant : il manque {fmt_money(plan['minimal_pmt'] - budget)} par mois pour "
+                f"financer tous les objectifs. Non couverts en totalité : {', '.join(missing)}."
+            )
+
+        st.dataframe(
+            pd.DataFrame({
+                "Objectif": plan["name"],
+                "Année": plan["year"].astype(int),
+                "Priorité": plan["priority"].astype(int),
+                "Montant": [fmt_money(v) for v in plan["amount"]],
+                "Part du versement minimal": [fmt_money(v) for v in plan["allocation"]],
+                "Financé": ["✅" if funded else "❌" for funded in plan["funded"]],
+                "Montant finançable": [fmt_money(v) for v in plan["fundable_amount"]],
+                "Manque": [fmt_money(v) for v in plan["amount"] - plan["fundable_amount"]],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        # Réserves de chaque objectif et solde du compte, en une seule passe
+        schedules = goal_schedules(pv, goals, rate, budget)
+        yearly = slice(0, None, 12)
+        df_reserves = pd.DataFrame({
+            "Année": np.repeat(schedules["year"][yearly][None, :], len(goals), axis=0).ravel(),
+            "Objectif": np.repeat(schedules["name"], len(schedules["year"][yearly])),
+            "Montant": schedules["reserved"][:, yearly].ravel(),
+        })
+        df_balance = pd.DataFrame({
+            "Année": schedules["year"][yearly],
+            "Solde du compte": schedules["balance"][yearly],
+        })
+
+        chart_reserves = alt.Chart(df_reserves).mark_area(opacity=0.8).encode(
+            x=alt.X("Année:Q", title="Années"),
+            y=alt.Y("Montant:Q", stack=True, title="Montant (FCFA)"),
+            color=alt.Color("Objectif:N", sort=schedules["name"], title="Réserve affectée"),
+            tooltip=[alt.Tooltip("Année:Q"), alt.Tooltip("Objectif:N"), alt.Tooltip("Montant:Q", format=",.0f")],
+        )
+        chart_balance = alt.Chart(df_balance).mark_line(color=PRIMARY_COLOR, strokeWidth=2).encode(
+            x="Année:Q",
+            y="Solde du compte:Q",
+            tooltip=[alt.Tooltip("Année:Q"), alt.Tooltip("Solde du compte:Q", format=",.0f")],
+        )
+        st.altair_chart((chart_reserves + chart_balance).properties(height=350), use_container_width=True)
+
+        st.caption(
+            "Réserve d'un objectif : montant à détenir aujourd'hui pour le financer à sa date. "
+            "Le solde est affecté aux réserves par ordre de priorité ; chaque objectif est retiré du compte à son échéance. "
+            "Part du versement minimal : hausse du versement nécessaire quand on ajoute l'objectif, par ordre de priorité."
+        )
+
+
+# ============================================================
+# 11) PORTEFEUILLE MULTI-ACTIFS
+# ============================================================
+@st.fragment
+def render_portfolio_section(pv, pmt, rate, n_years):
+    """Section 11 : projection d'un portefeuille diversifié (rendements corrélés, rééquilibrage)."""
+    section = st.expander("🧺 Portefeuille multi-actifs", key="section_portfolio", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Un fonds diversifié combine actions BRVM, obligations régionales 
+            et placements monétaires, dont les rendements fluctuent différemment. Cette analyse 
+            simule des rendements corrélés pour chaque classe d'actifs, rééquilibre périodiquement 
+            le portefeuille vers l'allocation cible et présente l'éventail des capitaux obtenus.
+            """
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            profile = st.selectbox("Profil d'allocation", options=list(PORTFOLIO_PROFILES), index=1, key="portfolio_profile")
+        with col2:
+            rebalancing = st.selectbox("Rééquilibrage", options=list(REBALANCING_PERIODS), index=2, key="portfolio_rebalancing")
+        with col3:
+            n_paths = st.selectbox(
+                "Nombre de trajectoires",
+                options=[1_000, 5_000, 10_000],
+                index=1,
+                format_func=lambda n: f"{n:,}".replace(",", " "),
+                key="portfolio_paths"
+            )
+
+        # Hypothèses modifiables ; la clé dépend du profil pour recharger ses poids
+        assets = st.data_editor(
+            pd.DataFrame({
+                "Classe d'actifs": list(ASSET_CLASSES),
+                "Poids (%)": PORTFOLIO_PROFILES[profile],
+                "Rendement (%)": [asset["rate"] for asset in ASSET_CLASSES.values()],
+                "Volatilité (%)": [asset["volatility"] for asset in ASSET_CLASSES.values()],
+            }),
+            use_container_width=True,
+            hide_index=True,
+            disabled=["Classe d'actifs"],
+            key=f"portfolio_assets_{profile}",
+            column_config={
+                "Poids (%)": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=5.0),
+                "Rendement (%)": st.column_config.NumberColumn(min_value=-20.0, max_value=30.0, step=0.5),
+                "Volatilité (%)": st.column_config.NumberColumn(min_value=0.0, max_value=60.0, step=0.5),
+            },
+        ).fillna(0.0)
+        weights = assets["Poids (%)"].to_numpy()
+        rates = assets["Rendement (%)"].to_numpy()
+        volatilities = assets["Volatilité (%)"].to_numpy()
+        if weights.sum() <= 0:
+            st.warning("⚠️ Renseignez au moins un poids positif.")
+            return
+
+        try:
+            paths = simulate_portfolio_paths(
+                pv, pmt, weights, rates, volatilities, ASSET_CORRELATIONS, n_years,
+                REBALANCING_PERIODS[rebalancing], n_paths
+            )
+        except CalculationError as e:
+            st.error(f"Erreur lors du calcul : {str(e)}")
+            return
+        stats = path_percentiles(paths["values"])
+        expected_rate, volatility = portfolio_moments(weights, rates, volatilities, ASSET_CORRELATIONS)
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Rendement moyen du portefeuille", f"{expected_rate:.2f}%")
+        with col2:
+            st.metric("Volatilité du portefeuille", f"{volatility:.2f}%",
+                      help="Tient compte des corrélations entre classes d'actifs")
+        with col3:
+            st.metric("Capital final médian", fmt_money(stats["final_percentiles"][50]))
+        with col4:
+            st.metric("Scénario défavorable (5%)", fmt_money(stats["final_percentiles"][5]),
+                      help="5% des trajectoires simulées finissent en dessous de ce montant")
+
+        # Projection à taux constant (rendement moyen du portefeuille) pour comparaison
+        chart_fan = create_fan_chart(
+            paths["month"], stats["percentiles"],
+            f"Portefeuille {profile.lower()} : médiane, intervalles 25-75% et 5-95%",
+            reference=schedule_for(pv, pmt, float(expected_rate), n_years, st.session_state.get("simulation_results"))["value"],
+        )
+        st.altair_chart(chart_fan, use_container_width=True)
+
+        st.caption(
+            f"Pointillés : projection à taux constant ({expected_rate:.2f}%). "
+            f"Hypothèses indicatives ; rééquilibrage {rebalancing.lower()} vers l'allocation cible."
+        )
+
+
+# ============================================================
+# 12) ALLOCATION CYCLE DE VIE (GLIDE PATH)
+# ============================================================
+@st.fragment
+def render_glide_path_section(pv, pmt, rate, n_years):
+    """Section 12 : part risquée décroissante à l'approche de l'échéance, projection d'une cohorte."""
+    section = st.expander("🛬 Allocation cycle de vie (glide path)", key="section_glide_path", on_change="rerun")
+    with section:
+        if not section.open:
+            return
+
+        st.markdown(
+            f"""
+            **💡 Commentaire :** À mesure que l'échéance approche (ici dans {n_years} ans), la part 
+            investie en actions est réduite au profit des obligations et du monétaire, pour limiter 
+            l'impact d'un mauvais marché juste avant le besoin des fonds. Choisissez la forme de 
+            cette trajectoire ; la même simulation sert ensuite à tous les clients de même échéance.
+            """
+        )
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            start_weight = st.slider("Part actions au départ (%)", 0.0, 100.0, DEFAULT_GLIDE_PATH["start_weight"], 5.0,
+                                     key="glide_start_weight")
+        with col2:
+            end_weight = st.slider("Part actions à l'échéance (%)", 0.0, 100.0, DEFAULT_GLIDE_PATH["end_weight"], 5.0,
+                                   key="glide_end_weight")
+        with col3:
+            glide_years = st.slider("Durée de la décroissance (années)", 1, 40, DEFAULT_GLIDE_PATH["glide_years"],
+                                    key="glide_years")
+        with col4:
+            shape = st.selectbox("Forme de la trajectoire", options=list(GLIDE_PATH_SHAPES), key="glide_shape")
+
+        glide_path = {"start_weight": start_weight, "end_weight": end_weight, "glide_years": glide_years, "shape": shape}
+        factors = glide_path_factors(n_years, glide_path)
+
+        # Allocation mois par mois (aire empilée, une valeur par an)
+        yearly = slice(0, None, 12)
+        weights = factors["weights"][yearly]
+        df_weights = pd.DataFrame({
+            "Année": np.repeat(factors["month"][:-1][yearly] / 12, weights.shape[1]),
+            "Classe d'actifs": np.tile(list(ASSET_CLASSES), len(weights)),
+            "Poids": weights.ravel(),
+        })
+        chart_weights = alt.Chart(df_weights).mark_area().encode(
+            x=alt.X("Année:Q", title="Années"),
+            y=alt.Y("Poids:Q", stack=True, title="Allocation (%)", scale=alt.Scale(domain=[0, 100])),
+            color=alt.Color("Classe d'actifs:N", sort=list(ASSET_CLASSES),
+                            scale=alt.Scale(range=[PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR])),
+            tooltip=[alt.Tooltip("Année:Q"), alt.Tooltip("Classe d'actifs:N"), alt.Tooltip("Poids:Q", format=".1f")],
+        ).properties(height=250, title="Trajectoire d'allocation")
+        st.altair_chart(chart_weights, use_container_width=True)
+
+        stats = glide_path_percentiles(pv, pmt, n_years, glide_path)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Capital final médian", fmt_money(stats["final_percentiles"][50]))
+        with col2:
+            st.metric("Scénario défavorable (5%)", fmt_money(stats["final_percentiles"][5]),
+                      help="5% des trajectoires simulées finissent en dessous de ce montant")
+        with col3:
+            st.metric("Scénario favorable (95%)", fmt_money(stats["final_percentiles"][95]))
+        st.altair_chart(
+            create_fan_chart(factors["month"], stats["percentiles"], "Capital simulé : médiane, intervalles 25-75% et 5-95%"),
+            use_container_width=True,
+        )
+
+        # Cohorte : tous les clients de même échéance partagent la simulation
+        st.markdown("**👥 Projection d'une cohorte (même échéance)**")
+        cohort = st.data_editor(
+            pd.DataFrame(DEFAULT_COHORT),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key="glide_cohort",
+            column_config={
+                "Montant initial (FCFA)": st.column_config.NumberColumn(min_value=0, step=100_000, format="%d"),
+                "Versement mensuel (FCFA)": st.column_config.NumberColumn(min_value=0, step=5_000, format="%d"),
+            },
+        ).dropna(subset=["Montant initial (FCFA)", "Versement mensuel (FCFA)"])
+        if cohort.empty:
+            return
+
+        projection = cohort_projection(
+            cohort["Montant initial (FCFA)"].to_numpy(), cohort["Versement mensuel (FCFA)"].to_numpy(), factors
+        )
+        st.dataframe(
+            pd.DataFrame({
+                "Client": cohort["Client"].fillna(""),
+                "Défavorable (5%)": [fmt_money(v) for v in projection["final_percentiles"][5]],
+                "Médiane": [fmt_money(v) for v in projection["final_percentiles"][50]],
+                "Favorable (95%)": [fmt_money(v) for v in projection["final_percentiles"][95]],
+                "Moyenne": [fmt_money(v) for v in projection["mean"]],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(
+            "Rééquilibrage mensuel vers l'allocation de la trajectoire ; hypothèses de rendement et de "
+            "volatilité de la section « Portefeuille multi-actifs » (valeurs par défaut)."
+        )
+
+
+def main():
+    st.set_page_config(page_title="Scénarios & Projections | " + APP_NAME, layout="wide")
+    st.markdown(get_theme_css(), unsafe_allow_html=True)
+    display_sidebar()
+    
+    # ---- Initialize session state for simulation results ----
+    # Using None instead of {} to properly distinguish between "not yet initialized" and "no simulation run"
+    # This ensures we can accurately detect if a simulation has been performed
+    if "simulation_results" not in st.session_state:
+        st.session_state.simulation_results = None
+
+    st.markdown(
+        f"""
+        <h1 style="color:{PRIMARY_COLOR};">🎯 Scénarios & Projections</h1>
+        <p style="font-size: 16px; color: #666;">
+        Explorez différents scénarios d'investissement, analysez l'impact des variations de paramètres, 
+        et planifiez votre stratégie financière à long terme avec des projections détaillées.
+        </p>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("---")
+    
+    # -------------------------------
+    # RÉCUPÉRATION DES RÉSULTATS DE SIMULATION
+    # -------------------------------
+    simulation_results = st.session_state.get('simulation_results', None)
+    has_simulation_results = isinstance(simulation_results, SimulationResult)
+    
+    # Déterminer les valeurs par défaut
+    if has_simulation_results:
+        default_pv = int(simulation_results.pv)
+        default_rate = float(simulation_results.rate)
+        # Les scénarios raisonnent en versements mensuels : conversion à valeur acquise égale
+        default_pmt = int(equivalent_contribution(
+            simulation_results.pmt,
+            default_rate,
+            simulation_results.contribution_frequency,
+            12,
+            simulation_results.compounding_frequency
+        ))
+        default_n_years = int(simulation_results.n_years)
+        
+        # Afficher un message informatif
+        st.info(
+            f"✅ **Paramètres chargés depuis votre simulation précédente.**\n\n"
+            f"Mode de calcul utilisé : *{simulation_results.calculation_mode or 'N/A'}*. "
+            f"Vous pouvez modifier les paramètres ci-dessous pour explorer d'autres scénarios."
+        )
+    else:
+        default_pv = DEFAULT_INITIAL_CAPITAL
+        default_pmt = DEFAULT_MONTHLY_PAYMENT
+        default_rate = DEFAULT_ANNUAL_RATE
+        default_n_years = DEFAULT_HORIZON_YEARS
+        
+        st.info(
+            "📋 **Aucune simulation détectée.**\n\n"
+            "Cette page utilise des paramètres par défaut. Pour de meilleurs résultats, "
+            "effectuez d'abord une simulation dans la page **Simulation** (menu latéral), "
+            "puis revenez ici pour explorer des scénarios avancés basés sur vos paramètres."
+        )
+
+    # -------------------------------
+    # PARAMÈTRES DE BASE POUR L'ANALYSE
+    # -------------------------------
+    st.markdown("---")
+    st.markdown(f"### 🎯 Paramètres de base pour les projections")
+    st.markdown(
+        "<p style='color: #666; font-size: 14px; margin-bottom: 15px;'>"
+        "Ajustez ces paramètres pour explorer différents scénarios d'investissement. "
+        "Les analyses ci-dessous s'adapteront automatiquement."
+        "</p>",
+        unsafe_allow_html=True
+    )
+    
+    # Valeurs initiales posées via session_state (et non `value=`) afin que
+    # la section « et si ? » puisse y reporter les valeurs validées
+    for key, default in (
+        ("proj_pv", default_pv),
+        ("proj_pmt", default_pmt),
+        ("proj_rate", default_rate),
+        ("proj_n_years", default_n_years),
+    ):
+        if key not in st.session_state:
+            st.session_state[key] = default
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        pv = st.number_input("💰 Montant initial (FCFA)", step=10_000, format="%d", key="proj_pv")
+    with col2:
+        pmt = st.number_input("💳 Versement mensuel (FCFA)", step=5_000, format="%d", key="proj_pmt", on_change=_seed_whatif_values)
+    with col3:
+        rate = st.number_input("📈 Rendement annuel (%)", step=0.1, format="%.2f", key="proj_rate", on_change=_seed_whatif_values)
+    with col4:
+        n_years = st.number_input("⏱️ Horizon (années)", step=1, format="%d", min_value=1, key="proj_n_years", on_change=_seed_whatif_values)
+
+    st.markdown("---")
+
+    # ============================================================
+    # 0) PROJECTION INTERACTIVE « ET SI ? » (CALCULÉE DANS LE NAVIGATEUR)
+    # ============================================================
+    with st.expander("🎚️ Projection interactive « Et si ? »", expanded=True):
+
+        st.markdown(
+            """
+            **💡 Commentaire :** Déplacez les curseurs sous le graphique pour explorer d'autres 
+            rendements, versements ou horizons. La courbe est recalculée instantanément dans 
+            votre navigateur, sans relancer la page. Reportez ensuite les valeurs retenues 
+            ci-dessous pour mettre à jour toutes les analyses.
+            """
+        )
+
+        st.altair_chart(create_whatif_chart(pv, pmt, rate, n_years), use_container_width=True)
+
+        # Seule la validation du formulaire déclenche un recalcul côté serveur.
+        # Valeurs posées via session_state (et non `value=`, ignoré après le
+        # premier affichage) : elles suivent les paramètres de base
+        if "whatif_commit_rate" not in st.session_state:
+            _seed_whatif_values()
+        with st.form("whatif_commit_form", border=False):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.number_input("📈 Rendement retenu (%)", step=0.1, format="%.2f", key="whatif_commit_rate")
+            with col2:
+                st.number_input("💳 Versement retenu (FCFA)", step=5_000, format="%d", key="whatif_commit_pmt")
+            with col3:
+                st.number_input("⏱️ Horizon retenu (années)", step=1, format="%d", min_value=1, key="whatif_commit_n_years")
+            st.form_submit_button("✅ Appliquer ces valeurs aux analyses", on_click=_commit_whatif_values)
+
+    # Chaque section est un fragment : ses widgets ne relancent que la section
+    render_horizon_section(pv, pmt, rate, n_years)
+    render_rate_sensitivity_section(pv, pmt, rate, n_years)
+    render_pmt_sensitivity_section(pv, pmt, rate, n_years)
+    render_withdrawal_section(pv, pmt, rate, n_years)
+    render_inflation_section(pv, pmt, rate, n_years)
+    render_heatmap_section(pv, pmt, rate, n_years)
+    render_tornado_section(pv, pmt, rate, n_years)
+    render_fees_section(pv, pmt, rate, n_years)
+    render_tax_section(pv, pmt, rate, n_years)
+    render_goals_section(pv, pmt, rate, n_years)
+    render_portfolio_section(pv, pmt, rate, n_years)
+    render_glide_path_section(pv, pmt, rate, n_years)
+
+
 if __name__ == "__main__":
     main()
@@ -545,7 +545,7 @@ durée_années = mois / 12
             
             - **Volatilité ignorée** : Les marchés réels sont volatils, le taux peut varier
             - **Inflation non considérée** : Les calculs sont en valeur nominale
-            - **Fiscalité non incluse** : Les impôts sur les gains ne sont pas pris en compte
+            - **Fiscalité simplifiée** : Taux indicatifs par pays (retenue à la source, plus-values), sans abattements ni plafonds
             - **Liquidité supposée** : On suppose qu'on peut toujours investir et retirer
             - **Risques non modélisés** : Pas de prise en compte du risque de perte
             """
@@ -0,0 +1,53 @@
+# tests/test_annuity.py
+# ---------------------------------------------------------
+# Conversion du capital en rente viagère (core/annuity.py)
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.annuity import (
+    SEXES,
+    annuity_factor,
+    annuity_income,
+    build_life_table,
+    life_expectancy,
+    load_life_table,
+    survival_probabilities,
+)
+from core.config import LIFE_TABLE_MAX_AGE
+
+
+def test_embedded_life_table_is_up_to_date():
+    assert np.array_equal(load_life_table(), build_life_table())
+    assert load_life_table().shape == (len(SEXES), LIFE_TABLE_MAX_AGE + 1)
+    assert np.all(load_life_table()[:, -1] == 1)
+
+
+def test_survival_probabilities():
+    survival = survival_probabilities([60, 80], SEXES[0])
+    assert np.all((survival >= 0) & (survival <= 1))
+    assert np.all(np.diff(survival, axis=-1) <= 0)
+    # Survivre 20 ans depuis 60 ans, puis au-delà depuis 80 ans
+    assert np.allclose(survival[0, 240:-240], survival[0, 239] * survival[1, :-480])
+    # Plus aucun survivant après le dernier âge de la table (q = 1)
+    assert survival[0, (LIFE_TABLE_MAX_AGE - 60) * 12] < 1e-12
+    assert np.all(survival[0, (LIFE_TABLE_MAX_AGE + 1 - 60) * 12:] == 0)
+
+
+def test_annuity_factor_zero_rate():
+    # Sans actualisation, le prix de la rente est le nombre de mois vécus
+    assert np.isclose(annuity_factor(65, 0.0), 12 * (life_expectancy(65) - 1 / 24))
+
+
+def test_annuity_factor_monotonicity():
+    factors = annuity_factor(65, np.array([2.0, 4.0, 6.0]))
+    assert np.all(np.diff(factors) < 0)
+    assert np.all(np.diff(annuity_factor(np.array([55, 65, 75]), 4.0)) < 0)
+    assert annuity_factor(65, 4.0, indexation=2.0) > annuity_factor(65, 4.0)
+    assert np.all(np.diff(life_expectancy(np.array([50, 60, 70]))) < 0)
+
+
+def test_annuity_income():
+    assert np.isclose(annuity_income(10_000_000, 65, 3.0) * annuity_factor(65, 3.0), 10_000_000)
+    # Deux sexes, deux tables distinctes
+    assert annuity_income(10_000_000, 65, 3.0, SEXES[0]) != annuity_income(10_000_000, 65, 3.0, SEXES[1])
@@ -0,0 +1,87 @@
+# tests/test_calculations.py
+# ---------------------------------------------------------
+# Solveurs de base (core/calculations.py) : versions scalaires, `*_batch`
+# et formes fermées périodiques
+# ---------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from core.calculations import (
+    calculate_fv,
+    calculate_pmt,
+    calculate_pv,
+    calculate_n_years,
+    calculate_fv_batch,
+    calculate_pmt_batch,
+    calculate_pv_batch,
+    calculate_n_years_batch,
+    growth_factors,
+    solve_all,
+)
+
+
+@pytest.mark.parametrize("n_years", [10.0, 10.04, 7.5, 0.05])
+def test_scalar_and_batch_agree(n_years):
+    # Horizon fractionnaire : ni la version scalaire ni la version vectorisée ne tronquent au mois
+    fv = calculate_fv(1e6, 5e4, 5.0, n_years)
+    assert np.isclose(calculate_fv_batch(1e6, 5e4, 5.0, n_years), fv, rtol=1e-12)
+    assert np.isclose(calculate_pmt(fv, 1e6, 5.0, n_years), calculate_pmt_batch(fv, 1e6, 5.0, n_years), rtol=1e-12)
+    assert np.isclose(calculate_pv(fv, 5e4, 5.0, n_years), calculate_pv_batch(fv, 5e4, 5.0, n_years), rtol=1e-12)
+
+
+def test_fractional_horizon_is_not_truncated():
+    # 10,04 ans : 120 versements, puis 0,04 an de capitalisation supplémentaire
+    growth = (1 + 0.05 / 12) ** (12 * 10.04)
+    annuity = ((1 + 0.05 / 12) ** 120 - 1) / (0.05 / 12) * (1 + 0.05 / 12) ** (12 * 0.04)
+    assert np.isclose(calculate_fv(1e6, 5e4, 5.0, 10.04), 1e6 * growth + 5e4 * annuity, rtol=1e-12)
+    assert calculate_fv(1e6, 5e4, 5.0, 10.04) > calculate_fv(1e6, 5e4, 5.0, 10.0)
+
+
+def test_fv_matches_monthly_recurrence():
+    value = 1e6
+    for _ in range(120):
+        value = value * (1 + 0.06 / 12) + 25_000
+    assert np.isclose(calculate_fv(1e6, 25_000, 6.0, 10), value, rtol=1e-12)
+
+
+def test_fv_zero_rate():
+    assert np.isclose(calculate_fv(1e6, 10_000, 0.0, 2.5), 1e6 + 30 * 10_000)
+
+
+def test_n_years_inverts_fv():
+    for n_years in (3.25, 10.0, 10.04):
+        fv = calculate_fv(1e6, 5e4, 5.0, n_years)
+        assert np.isclose(calculate_n_years(fv, 1e6, 5e4, 5.0), n_years, rtol=1e-9)
+        assert np.isclose(calculate_n_years_batch(fv, 1e6, 5e4, 5.0), n_years, rtol=1e-9)
+
+
+def test_n_years_edge_cases():
+    assert calculate_n_years(1e6, 2e6, 0, 5.0) == 0.0
+    assert calculate_n_years(2e6, 1e6, 0, 0.0) == np.inf
+    assert calculate_n_years(1e12, 0, 1, 1.0) == np.inf
+
+
+def test_batch_grid_matches_scalar():
+    rates = np.array([0.0, 2.5, 7.0])
+    horizons = np.array([1.0, 10.04, 25.5])
+    grid = calculate_fv_batch(1e5, 2e4, rates[None, :], horizons[:, None])
+    expected = [[calculate_fv(1e5, 2e4, rate, n_years) for rate in rates] for n_years in horizons]
+    assert np.allclose(grid, expected, rtol=1e-12)
+
+
+def test_solve_all_quadruplet_is_consistent():
+    solved = solve_all(np.nan, 1e6, 5e4, 5.0, 10.04)
+    assert np.isclose(solved["fv"], calculate_fv(1e6, 5e4, 5.0, 10.04))
+    solved = solve_all(solved["fv"], 1e6, np.nan, 5.0, 10.04)
+    assert np.isclose(solved["pmt"], 5e4)
+
+
+def test_growth_factors_closed_form():
+    growth, annuity = growth_factors(np.array([0.0, 6.0])[:, None], np.arange(121.0)[None, :])
+    assert np.allclose(growth[0], 1.0) and np.allclose(annuity[0], np.arange(121))
+    value = np.zeros(121)
+    for month in range(1, 121):
+        value[month] = value[month - 1] * 1.005 + 1
+    assert np.allclose(annuity[1], value, rtol=1e-12)
+    assert np.allclose(growth[1], 1.005 ** np.arange(121), rtol=1e-12)
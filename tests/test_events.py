@@ -0,0 +1,61 @@
+# tests/test_events.py
+# ---------------------------------------------------------
+# Solveurs avec flux irréguliers (core/events.py)
+# ---------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from core.calculations import CalculationError
+from core.events import (
+    calculate_fv_with_events,
+    calculate_n_years_with_events,
+    calculate_pmt_with_events,
+    plan_breakdown,
+)
+
+
+def test_n_years_target_reached_before_withdrawal():
+    # 1,4 M au mois 14, puis retrait de 500 000 au mois 16 : l'objectif
+    # de 1,35 M est atteint une première fois au mois 14, pas au mois 19
+    n_years = calculate_n_years_with_events(1.35e6, 0, 100_000, 0.0, events={16: -500_000})
+    assert np.isclose(n_years * 12, 14)
+
+
+def test_n_years_is_first_crossing():
+    # Objectif atteint à l'horizon (au versement près), pas un mois plus tôt
+    events = {24: 1_000_000, 60: -500_000}
+    n_years = calculate_n_years_with_events(1e7, 100_000, 50_000, 5.0, events=events)
+    value = plan_breakdown(100_000, 50_000, 5.0, np.array([n_years - 1 / 12, n_years + 1e-6]), events)["value"]
+    assert value[0] < 1e7 <= value[1]
+
+
+def test_withdrawal_bears_no_entry_fee():
+    # 3 % de droits d'entrée sur le seul capital initial : 970 000 investis,
+    # dont 500 000 retirés en totalité au mois 12
+    breakdown = plan_breakdown(1e6, 0, 0.0, 2, {12: -500_000}, fees={"entry_fee": 3})
+    assert np.isclose(breakdown["value"], 470_000)
+    assert np.isclose(breakdown["fees"], 30_000)
+    assert np.isclose(breakdown["invested"], 500_000)
+
+
+def test_deposit_bears_entry_fee():
+    breakdown = plan_breakdown(1e6, 0, 0.0, 2, {12: 500_000}, fees={"entry_fee": 3})
+    assert np.isclose(breakdown["value"], 1_455_000)
+    assert np.isclose(breakdown["fees"], 45_000)
+
+
+def test_withdrawal_up_to_balance_is_accepted():
+    assert np.isclose(calculate_fv_with_events(1e6, 0, 0.0, 2, {12: -1e6}), 0.0)
+
+
+def test_withdrawal_beyond_balance_is_rejected():
+    with pytest.raises(CalculationError, match="mois 12"):
+        calculate_fv_with_events(1e6, 0, 5.0, 2, {12: -1.1e6})
+    # Versement calculé : le retrait doit rester couvert par l'encours obtenu
+    with pytest.raises(CalculationError):
+        calculate_pmt_with_events(1e6, 1e6, 0.0, 2, {6: -2e6})
+
+
+def test_withdrawal_after_horizon_is_ignored():
+    assert np.isclose(calculate_fv_with_events(1e6, 0, 0.0, 2, {36: -1e8}), 1e6)
@@ -0,0 +1,77 @@
+# tests/test_fees.py
+# ---------------------------------------------------------
+# Frais d'entrée, de gestion et de performance (core/fees.py),
+# vérifiés contre une récurrence mensuelle explicite
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import calculate_fv_periodic
+from core.fees import (
+    calculate_fv_with_fees,
+    calculate_n_years_with_fees,
+    calculate_pmt_with_fees,
+    compare_fee_structures,
+    fees_paid,
+    net_effective_rate,
+)
+
+
+def _monthly_plan(pv, pmt, rate, n_months, entry_fee=0.0, management_fee=0.0):
+    """Récurrence mois par mois : (valeur finale, frais de gestion cumulés)."""
+    gross = 1 + rate / 1200
+    net = gross * (1 - management_fee / 1200)
+    kept = 1 - entry_fee / 100
+    value, ongoing = pv * kept, 0.0
+    for _ in range(n_months):
+        ongoing += (gross - net) * value
+        value = value * net + pmt * kept
+    return value, ongoing
+
+
+def test_no_fees_matches_gross_solver():
+    fv = calculate_fv_with_fees(1_000_000, 50_000, 7.5, 12)
+    assert np.isclose(fv, calculate_fv_periodic(1_000_000, 50_000, 7.5, 12))
+
+
+def test_fees_match_monthly_recurrence():
+    fees = {"entry_fee": 2.0, "management_fee": 1.5}
+    value, ongoing = _monthly_plan(1_000_000, 50_000, 8.0, 120, **fees)
+    assert np.isclose(calculate_fv_with_fees(1_000_000, 50_000, 8.0, 10, fees), value)
+
+    paid = fees_paid(1_000_000, 50_000, 8.0, 10, fees)
+    assert np.isclose(paid["entry"], 0.02 * (1_000_000 + 50_000 * 120))
+    assert np.isclose(paid["ongoing"], ongoing)
+    assert np.isclose(paid["total"], paid["entry"] + paid["ongoing"])
+
+
+def test_performance_fee_below_hurdle_is_free():
+    fees = {"performance_fee": 20.0, "hurdle_rate": 6.0}
+    assert np.isclose(calculate_fv_with_fees(0, 50_000, 5.0, 10, fees), calculate_fv_periodic(0, 50_000, 5.0, 10))
+    assert calculate_fv_with_fees(0, 50_000, 9.0, 10, fees) < calculate_fv_periodic(0, 50_000, 9.0, 10)
+
+
+def test_net_effective_rate():
+    # 1 % de frais de gestion prélevés chaque mois sur un rendement de 12 %
+    expected = ((1.01 * (1 - 1 / 1200)) ** 12 - 1) * 100
+    assert np.isclose(net_effective_rate(12.0, {"management_fee": 1.0}), expected)
+
+
+def test_solvers_invert_fv():
+    fees = {"entry_fee": 3.0, "management_fee": 2.0, "performance_fee": 20.0, "hurdle_rate": 6.0}
+    fv = calculate_fv_with_fees(500_000, 40_000, 10.0, 15, fees)
+    assert np.isclose(calculate_pmt_with_fees(fv, 500_000, 10.0, 15, fees), 40_000)
+    assert np.isclose(calculate_n_years_with_fees(fv, 500_000, 40_000, 10.0, fees), 15)
+
+
+def test_compare_fee_structures():
+    structures = {"Sans frais": {}, "Gestion": {"management_fee": 1.0}, "Entrée": {"entry_fee": 2.0}}
+    comparison = compare_fee_structures(1_000_000, 50_000, 8.0, 10, structures)
+    gross = calculate_fv_periodic(1_000_000, 50_000, 8.0, 10)
+
+    assert comparison["name"] == list(structures)
+    assert np.isclose(comparison["fv"][0], gross)
+    assert np.allclose(comparison["cost"], gross - comparison["fv"])
+    assert np.isclose(comparison["fv"][2], 0.98 * gross)
+    # Le manque à gagner dépasse les frais payés (rendement perdu sur ces frais)
+    assert np.all(comparison["cost"][1:] > comparison["fees_paid"][1:])
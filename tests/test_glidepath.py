@@ -0,0 +1,57 @@
+# tests/test_glidepath.py
+# ---------------------------------------------------------
+# Trajectoires d'allocation en cycle de vie (core/glidepath.py)
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.config import ASSET_CLASSES, ASSET_CORRELATIONS, DEFAULT_GLIDE_PATH, GLIDE_DEFENSIVE_MIX
+from core.glidepath import cohort_projection, glide_path_factors, glide_path_percentiles, glide_weights
+
+N_PATHS = 2_000
+GLIDE_PATH = {"start_weight": 80.0, "end_weight": 20.0, "glide_years": 10, "shape": "Linéaire"}
+
+
+def test_glide_weights():
+    weights = glide_weights([30, 10, 5, 0, -1], **GLIDE_PATH)
+    assert np.allclose(weights.sum(axis=-1), 100)
+    assert np.allclose(weights[:, 0], [80, 80, 50, 20, 20])
+
+    # Poche défensive répartie selon GLIDE_DEFENSIVE_MIX
+    defensive = np.array(GLIDE_DEFENSIVE_MIX[1:]) / sum(GLIDE_DEFENSIVE_MIX[1:])
+    assert np.allclose(weights[2, 1:], 50 * defensive)
+
+
+def test_glide_weights_shapes():
+    # Mi-parcours : baisse précoce sous la forme linéaire, tardive au-dessus
+    risky = {
+        shape: glide_weights(5, **{**GLIDE_PATH, "shape": shape})[0]
+        for shape in ("Linéaire", "Baisse précoce", "Baisse tardive")
+    }
+    assert risky["Baisse précoce"] < risky["Linéaire"] < risky["Baisse tardive"]
+
+
+def test_factors_without_volatility():
+    # Sans volatilité, P_N est le produit des rendements mensuels pondérés
+    assets = {name: {**asset, "volatility": 0.0} for name, asset in ASSET_CLASSES.items()}
+    factors = glide_path_factors(15, GLIDE_PATH, assets, n_paths=2)
+    rates = np.array([asset["rate"] for asset in assets.values()])
+    monthly = 1 + factors["weights"] @ rates / 120_000
+    assert factors["weights"].shape == (180, len(assets))
+    assert np.allclose(factors["initial"], np.prod(monthly))
+    assert np.allclose(factors["contributions"], 1 + np.sum(np.cumprod(monthly[::-1])[:-1]))
+
+
+def test_cohort_matches_single_client():
+    factors = glide_path_factors(20, DEFAULT_GLIDE_PATH, n_paths=N_PATHS)
+    cohort = cohort_projection([1_000_000, 0], [50_000, 100_000], factors)
+    assert np.allclose(cohort["mean"], [
+        1_000_000 * factors["initial"].mean() + 50_000 * factors["contributions"].mean(),
+        100_000 * factors["contributions"].mean(),
+    ])
+
+    # Mêmes trajectoires que la projection d'un client seul
+    client = glide_path_percentiles(1_000_000, 50_000, 20, DEFAULT_GLIDE_PATH, ASSET_CLASSES, ASSET_CORRELATIONS,
+                                    n_paths=N_PATHS)
+    for percentile, band in cohort["final_percentiles"].items():
+        assert np.isclose(band[0], client["final_percentiles"][percentile])
@@ -0,0 +1,62 @@
+# tests/test_portfolio.py
+# ---------------------------------------------------------
+# Portefeuille multi-actifs (core/portfolio.py)
+# ---------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from core.calculations import CalculationError, calculate_fv_periodic
+from core.portfolio import correlation_factor, portfolio_moments, simulate_portfolio_paths
+
+RATES = [10.0, 6.0, 3.0]
+CORRELATIONS = np.eye(3)
+
+
+def test_portfolio_moments():
+    rate, volatility = portfolio_moments([50, 50, 0], RATES, [20.0, 10.0, 0.0], CORRELATIONS)
+    assert np.isclose(rate, 8.0)
+    assert np.isclose(volatility, np.hypot(10.0, 5.0))
+
+    # Corrélation parfaite : volatilités additives ; poids normalisés à 100
+    _, volatility = portfolio_moments([1, 3], RATES[:2], [20.0, 10.0], np.ones((2, 2)))
+    assert np.isclose(volatility, 12.5)
+
+
+def test_invalid_correlations_raise():
+    with pytest.raises(CalculationError):
+        correlation_factor([[1.0, 1.2], [1.2, 1.0]])
+    with pytest.raises(CalculationError):
+        simulate_portfolio_paths(0, 1000, [-10, 110], RATES[:2], [1.0, 1.0], np.eye(2), 1)
+
+
+def test_monthly_rebalancing_without_volatility():
+    # Allocation rétablie chaque mois : rendement moyen pondéré
+    weights = [40, 40, 20]
+    paths = simulate_portfolio_paths(1_000_000, 50_000, weights, RATES, [0.0] * 3, CORRELATIONS, 10,
+                                     rebalancing_months=1, n_paths=2)
+    rate, _ = portfolio_moments(weights, RATES, [0.0] * 3, CORRELATIONS)
+    assert np.allclose(paths["final"], calculate_fv_periodic(1_000_000, 50_000, rate, 10))
+    assert paths["values"].shape == (2, 121)
+
+
+def test_no_rebalancing_without_volatility():
+    # Lignes jamais rééquilibrées : chaque actif croît à son propre taux
+    weights = [40, 40, 20]
+    paths = simulate_portfolio_paths(1_000_000, 50_000, weights, RATES, [0.0] * 3, CORRELATIONS, 10,
+                                     rebalancing_months=0, n_paths=2)
+    expected = sum(w / 100 * calculate_fv_periodic(1_000_000, 50_000, r, 10) for w, r in zip(weights, RATES))
+    assert np.allclose(paths["final"], expected)
+
+
+def test_partial_last_period():
+    # 14 mois, rééquilibrage au bout de 12 : récurrence ligne par ligne
+    weights = [60, 40]
+    paths = simulate_portfolio_paths(0, 10_000, weights, RATES[:2], [0.0] * 2, np.eye(2), 14 / 12,
+                                     rebalancing_months=12, n_paths=1)
+    lines = np.zeros(2)
+    for month in range(14):
+        if month == 12:
+            lines = lines.sum() * np.array(weights) / 100
+        lines = lines * (1 + np.array(RATES[:2]) / 1200) + 10_000 * np.array(weights) / 100
+    assert np.isclose(paths["final"][0], lines.sum())
@@ -0,0 +1,32 @@
+# tests/test_simulation_page.py
+# ---------------------------------------------------------
+# Page Simulation pilotée sans navigateur (streamlit.testing.v1.AppTest)
+# ---------------------------------------------------------
+
+import os
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "1_Simulation.py")
+
+
+def _simulation(mode: str) -> AppTest:
+    at = AppTest.from_file(PAGE, default_timeout=120)
+    at.run()
+    at.radio(key="calculation_mode").set_value(mode).run()
+    return at
+
+
+def test_probability_mode_totals_match_schedule():
+    at = _simulation("Versement Mensuel")
+    at.checkbox(key="use_target_probability").check().run()
+    next(button for button in at.button if button.label == "Lancer la simulation").click().run()
+    assert not at.exception
+
+    result = at.session_state["simulation_results"]
+    totals = result.totals
+    # Montant final = valeur déterministe du versement probabiliste, au-delà de l'objectif
+    assert np.isclose(totals["capital"], result.schedule["value"][-1])
+    assert totals["capital"] > at.number_input(key="form_fv").value
+    assert totals["interest"] > 0
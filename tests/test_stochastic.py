@@ -0,0 +1,80 @@
+# tests/test_stochastic.py
+# ---------------------------------------------------------
+# Simulations à rendements aléatoires (core/stochastic.py) :
+# cas limite sans volatilité et propriétés des estimateurs
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import calculate_fv_periodic, calculate_pmt_periodic, growth_factors
+from core.stochastic import (
+    calculate_pmt_probability,
+    contribution_factors,
+    probability_of_target,
+    ruin_statistics,
+    simulate_monthly_returns,
+    simulate_withdrawal_paths,
+)
+from core.withdrawal import depletion_month
+
+N_PATHS = 2_000
+
+
+def test_monthly_returns_mean_and_seed():
+    growth = simulate_monthly_returns(8.0, 15.0, 120, N_PATHS, seed=1)
+    assert growth.shape == (N_PATHS, 120)
+    assert np.isclose(growth.mean(), 1 + 8.0 / 1200, atol=5e-4)
+    assert np.array_equal(growth, simulate_monthly_returns(8.0, 15.0, 120, N_PATHS, seed=1))
+    assert np.allclose(simulate_monthly_returns(8.0, 0.0, 12, 3), 1 + 8.0 / 1200)
+
+
+def test_contribution_factors_without_volatility():
+    growth = simulate_monthly_returns(6.0, 0.0, 120, 2)
+    expected_growth, expected_annuity = growth_factors(6.0, 120)
+    assert np.allclose(contribution_factors(growth), [expected_growth, expected_annuity])
+
+    # Versements trimestriels : même valeur que le solveur déterministe
+    quarterly = contribution_factors(growth, contribution_frequency=4)
+    assert np.allclose(quarterly @ [1_000_000, 150_000], calculate_fv_periodic(1_000_000, 150_000, 6.0, 10, 4))
+
+
+def test_probability_of_target_without_volatility():
+    pmt = calculate_pmt_periodic(10_000_000, 1_000_000, 7.0, 10)
+    probability = probability_of_target(10_000_000, 1_000_000, [pmt * 0.99, pmt * 1.01], 7.0, 0.0, 10, n_paths=10)
+    assert np.array_equal(probability, [0.0, 1.0])
+
+
+def test_pmt_probability():
+    pmt = calculate_pmt_periodic(10_000_000, 1_000_000, 7.0, 10)
+    assert np.isclose(calculate_pmt_probability(10_000_000, 1_000_000, 7.0, 0.0, 10, 90.0, n_paths=10), pmt)
+
+    # Le versement trouvé atteint l'objectif avec la probabilité visée
+    required = calculate_pmt_probability(10_000_000, 1_000_000, 7.0, 15.0, 10, [50.0, 90.0], n_paths=N_PATHS)
+    assert required[0] < required[1]
+    reached = probability_of_target(10_000_000, 1_000_000, required, 7.0, 15.0, 10, n_paths=N_PATHS)
+    assert np.all(reached >= [0.5, 0.9])
+    assert calculate_pmt_probability(1_000_000, 1_000_000, 7.0, 15.0, 10, 50.0, n_paths=N_PATHS) == 0
+
+
+def test_withdrawal_paths_without_volatility():
+    # Capital accumulé puis retraits : même mois d'épuisement que le calcul exact
+    paths = simulate_withdrawal_paths(1_000_000, 50_000, 6.0, 0.0, 5, 200_000, 10, n_paths=3)
+    capital = calculate_fv_periodic(1_000_000, 50_000, 6.0, 5)
+    assert np.allclose(paths["accumulated"], capital)
+    assert np.all(paths["ruined"])
+    assert np.all(paths["depletion_month"] == depletion_month(capital, 200_000, 6.0))
+    assert np.all(paths["values"][:, -1] == 0)
+
+    statistics = ruin_statistics(paths)
+    assert statistics["probability_of_ruin"] == 1.0
+    assert np.isclose(statistics["median_depletion_years"], depletion_month(capital, 200_000, 6.0) / 12)
+
+
+def test_ruin_probability_grows_with_withdrawal():
+    def probability_of_ruin(withdrawal):
+        paths = simulate_withdrawal_paths(10_000_000, 0, 6.0, 15.0, 0, withdrawal, 25, n_paths=N_PATHS)
+        return ruin_statistics(paths)["probability_of_ruin"]
+
+    probabilities = [probability_of_ruin(withdrawal) for withdrawal in (40_000, 70_000, 100_000)]
+    assert probabilities[0] <= probabilities[1] <= probabilities[2]
+    assert probabilities[0] < probabilities[2]
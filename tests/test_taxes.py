@@ -0,0 +1,94 @@
+# tests/test_taxes.py
+# ---------------------------------------------------------
+# Retenues à la source et impôt sur la plus-value (core/taxes.py),
+# vérifiés contre une récurrence mensuelle explicite
+# ---------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from core.calculations import calculate_fv_periodic
+from core.config import UEMOA_COUNTRIES
+from core.taxes import (
+    after_tax_breakdown,
+    calculate_fv_after_tax,
+    calculate_n_years_after_tax,
+    calculate_pmt_after_tax,
+    calculate_pv_after_tax,
+    compare_countries,
+    country_taxes,
+)
+
+TAXES = {"withholding": 10.0, "capital_gains": 15.0, "income_share": 40.0}
+
+
+def _monthly_plan(pv, pmt, rate, n_months, withholding, capital_gains, income_share):
+    """Récurrence mois par mois : (valeur de rachat, retenues, impôt sur la plus-value)."""
+    r = rate / 1200
+    w, cg, s = withholding / 100, capital_gains / 100, income_share / 100
+    value, basis, withheld = pv, pv, 0.0
+    for _ in range(n_months):
+        income = s * r * value
+        withheld += w * income
+        basis += (1 - w) * income + pmt
+        value = value * (1 + r) - w * income + pmt
+    tax = cg * max(value - basis, 0.0)
+    return value - tax, withheld, tax
+
+
+def test_no_taxes_matches_gross_solver():
+    breakdown = after_tax_breakdown(1_000_000, 50_000, 7.5, 12)
+    assert np.isclose(breakdown["value"], calculate_fv_periodic(1_000_000, 50_000, 7.5, 12))
+    assert breakdown["taxes"] == 0
+
+
+def test_taxes_match_monthly_recurrence():
+    value, withheld, tax = _monthly_plan(1_000_000, 50_000, 8.0, 120, **TAXES)
+    breakdown = after_tax_breakdown(1_000_000, 50_000, 8.0, 10, TAXES)
+    assert np.isclose(breakdown["value"], value)
+    assert np.isclose(breakdown["withholding"], withheld)
+    assert np.isclose(breakdown["capital_gains_tax"], tax)
+    assert np.isclose(breakdown["invested"], 1_000_000 + 50_000 * 120)
+
+
+def test_income_only_bears_no_capital_gains_tax():
+    # Tout le rendement en revenus réinvestis : prix de revient = valeur
+    taxes = {"withholding": 10.0, "capital_gains": 20.0, "income_share": 100.0}
+    breakdown = after_tax_breakdown(1_000_000, 0, 6.0, 10, taxes)
+    assert np.isclose(breakdown["value"], 1_000_000 * (1 + 0.9 * 0.06 / 12) ** 120)
+    assert np.isclose(breakdown["capital_gains_tax"], 0, atol=1e-6)
+
+
+def test_no_withholding_on_negative_return():
+    breakdown = after_tax_breakdown(1_000_000, 0, -5.0, 5, TAXES)
+    assert breakdown["taxes"] == 0
+    assert np.isclose(breakdown["value"], calculate_fv_periodic(1_000_000, 0, -5.0, 5))
+
+
+def test_solvers_invert_fv():
+    fees = {"entry_fee": 2.0, "management_fee": 1.5}
+    fv = calculate_fv_after_tax(500_000, 40_000, 9.0, 15, TAXES, fees)
+    assert np.isclose(calculate_pmt_after_tax(fv, 500_000, 9.0, 15, TAXES, fees), 40_000)
+    assert np.isclose(calculate_pv_after_tax(fv, 40_000, 9.0, 15, TAXES, fees), 500_000)
+    assert np.isclose(calculate_n_years_after_tax(fv, 500_000, 40_000, 9.0, TAXES, fees), 15, atol=1e-6)
+
+
+def test_country_taxes():
+    taxes = country_taxes(None, income_share=30.0)
+    assert all(len(taxes[key]) == len(UEMOA_COUNTRIES) for key in taxes)
+
+    single = country_taxes(UEMOA_COUNTRIES[0], income_share=30.0)
+    assert single["withholding"] == taxes["withholding"][0]
+    assert single["income_share"] == 30.0
+    with pytest.raises(ValueError):
+        country_taxes("France")
+
+
+def test_compare_countries_matches_each_country():
+    comparison = compare_countries(1_000_000, 50_000, 8.0, 10, income_share=30.0)
+    for index, country in enumerate(UEMOA_COUNTRIES):
+        value = calculate_fv_after_tax(1_000_000, 50_000, 8.0, 10, country_taxes(country, 30.0))
+        assert np.isclose(comparison["fv"][index], value)
+    # Rendement équivalent : sous le rendement effectif brut dès qu'il y a des impôts
+    gross_rate = ((1 + 0.08 / 12) ** 12 - 1) * 100
+    assert np.all(comparison["net_rate"][comparison["taxes"] > 0] < gross_rate)
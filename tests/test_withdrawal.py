@@ -0,0 +1,54 @@
+# tests/test_withdrawal.py
+# ---------------------------------------------------------
+# Phase de retraits réguliers (core/withdrawal.py)
+# ---------------------------------------------------------
+
+import numpy as np
+
+from core.calculations import calculate_fv_batch
+from core.withdrawal import (
+    depletion_analysis,
+    depletion_month,
+    max_sustainable_withdrawal,
+    required_rate,
+    withdrawal_balance,
+)
+
+
+def test_balance_matches_monthly_recurrence():
+    capital = 10_000_000
+    for _ in range(36):
+        capital = capital * (1 + 6.0 / 1200) - 150_000
+    assert np.isclose(withdrawal_balance(10_000_000, 150_000, 6.0, 36), capital)
+
+
+def test_depletion_month_zero_rate():
+    assert depletion_month(1_200_000, 100_000, 0.0) == 12
+    assert depletion_month(1_250_000, 100_000, 0.0) == 13
+
+
+def test_perpetual_withdrawal_preserves_capital():
+    analysis = depletion_analysis(12_000_000, 60_000, 6.0, 30)
+    assert np.isclose(analysis["perpetual_withdrawal"], 60_000)
+    assert np.isinf(analysis["depletion_month"])
+    assert not analysis["depleted"]
+    assert np.isclose(analysis["remaining_capital"], 12_000_000)
+
+
+def test_max_withdrawal_exhausts_capital_at_term():
+    withdrawal = max_sustainable_withdrawal(10_000_000, 6.0, 20)
+    assert np.isclose(withdrawal_balance(10_000_000, withdrawal, 6.0, 240), 0, atol=1e-3)
+    assert np.isclose(max_sustainable_withdrawal(1_200_000, 0.0, 1), 100_000)
+
+    # Épuisé exactement au terme : soutenable ; un peu plus : épuisé avant
+    assert not depletion_analysis(10_000_000, withdrawal, 6.0, 20)["depleted"]
+    assert depletion_analysis(10_000_000, withdrawal * 1.001, 6.0, 20)["depleted"]
+
+
+def test_required_rate_exhausts_capital_at_term():
+    rate = required_rate(1_000_000, 50_000, 20, 200_000, 15)
+    capital = calculate_fv_batch(1_000_000, 50_000, rate, 20)
+    assert np.isclose(withdrawal_balance(capital, 200_000, rate, 180), 0, atol=1.0)
+
+    # Sans rendement, le capital versé couvre exactement les retraits
+    assert np.isclose(required_rate(1_200_000, 0, 0, 100_000, 1), 0, atol=1e-6)
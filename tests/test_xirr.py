@@ -0,0 +1,66 @@
+# tests/test_xirr.py
+# ---------------------------------------------------------
+# TRI de flux irréguliers (core/xirr.py)
+# ---------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from core.calculations import calculate_fv
+from core.events import calculate_fv_with_events
+from core.xirr import accounts_xirr, plan_xirr, xirr, year_fractions
+
+
+def test_single_period():
+    assert np.isclose(xirr([-100, 110], [0, 1]), 10.0)
+    assert np.isclose(xirr([-100, 121], [0, 2]), 10.0)
+
+
+def test_several_accounts_padded_with_zeros():
+    amounts = [[-100, 110, 0], [-100, -100, 231]]
+    times = [[0, 1, 0], [0, 1, 2]]
+    assert np.allclose(xirr(amounts, times), [10.0, 10.0])
+
+
+def test_no_sign_change_is_nan():
+    assert np.isnan(xirr([-100, -50], [0, 1]))
+    assert np.isnan(xirr([100, 50], [0, 1]))
+
+
+def test_negative_return():
+    assert np.isclose(xirr([-100, 80], [0, 1]), -20.0)
+
+
+def test_plan_xirr_is_effective_rate():
+    # Un plan à 8 % capitalisé mensuellement rapporte 8,30 % effectifs par an
+    value = calculate_fv(1_000_000, 50_000, 8.0, 10)
+    assert np.isclose(plan_xirr(1_000_000, 50_000, 10, value), ((1 + 0.08 / 12) ** 12 - 1) * 100)
+
+
+def test_plan_xirr_with_events():
+    events = {24: 500_000, 60: -300_000}
+    value = calculate_fv_with_events(1_000_000, 50_000, 6.0, 10, events)
+    assert np.isclose(plan_xirr(1_000_000, 50_000, 10, value, events), ((1 + 0.06 / 12) ** 12 - 1) * 100)
+
+
+def test_year_fractions():
+    # Exact/365, à partir de la première date par défaut (2024 est bissextile)
+    dates = ["2024-01-01", "2025-01-01", "2024-07-01"]
+    assert np.allclose(year_fractions(dates), [0.0, 366 / 365, 182 / 365])
+    assert np.allclose(year_fractions(dates, start="2023-01-01"), [1.0, 731 / 365, 547 / 365])
+
+
+def test_accounts_xirr():
+    flows = pd.DataFrame({
+        "account": ["A", "A", "B", "B", "B"],
+        "date": ["2023-01-01", "2024-01-01", "2023-01-01", "2023-07-01", "2024-01-01"],
+        "amount": [-1000.0, 1100.0, -1000.0, -500.0, 1600.0],
+    })
+    results = accounts_xirr(flows)
+    assert list(results["account"]) == ["A", "B"]
+    assert np.allclose(results["contributions"], [1000, 1500])
+    assert np.allclose(results["distributions"], [1100, 1600])
+    assert np.isclose(results["xirr"][0], 10.0)
+    # Le TRI de chaque compte ne dépend que de ses propres flux
+    single = xirr([-1000.0, -500.0, 1600.0], year_fractions(["2023-01-01", "2023-07-01", "2024-01-01"]))
+    assert np.isclose(results["xirr"][1], single)
@@ -5,54 +5,80 @@
 # - Histogramme annuel (Capital Investi vs Intérêts)
 # - Courbe Capital vs Intérêts cumulés
 # - Waterfall final
+# - Éventail des trajectoires simulées (percentiles)
 #
 # Désormais organisés dans des sous-sections pliables (expanders)
+#
+# Les cartes de chaleur denses (grilles de 200 x 200) utilisent Plotly :
+# la matrice est transmise telle quelle, sans une ligne de données par cellule.
 # ---------------------------------------------------------
 
+import logging
+
+import numpy as np
 import pandas as pd
 import altair as alt
+import plotly.graph_objects as go
 import streamlit as st
 
-from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR
+from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR, TAX_COLOR, CHART_MAX_POINTS, MAX_HORIZON
+from core.results import SimulationResult
+from core.utils import lttb_indices
+
+logger = logging.getLogger(__name__)
+
 
+def chart_payload(chart) -> int:
+    """Taille (octets) de la spécification Vega-Lite d'un graphique, données incluses."""
+    return len(chart.to_json())
 
-def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
+
+def _render_chart(name, chart, **kwargs):
+    """
+    Affiche un graphique Altair et journalise (niveau INFO) la taille de
+    sa spécification envoyée au navigateur.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Graphique '%s' : %d octets de spécification", name, chart_payload(chart))
+    st.altair_chart(chart, **kwargs)
+
+
+def create_simulation_chart(result: SimulationResult, fv_target=None):
     """
     Produit :
         - 4 graphiques, chacun dans un expander
+
+    `result` : résultat de la simulation (voir core/results) ; son
+    échéancier et sa répartition annuelle sont réutilisés tels quels.
+    Avec des frais (core/fees), les frais payés sont ajoutés aux courbes ;
+    avec des impôts (core/taxes), les valeurs deviennent des valeurs de
+    rachat après impôts. Les flux irréguliers (core/events) sont inclus.
     """
 
     # ---------------------------------------------------------
-    # 1) Génération des données mensuelles
+    # 1) Données mensuelles (échéancier partagé)
     # ---------------------------------------------------------
-    months = int(n_years * 12)
-    rate_m = rate / 100 / 12
-
-    data = []
-    value = pv
-    capital = pv
-
-    data.append({
-        "Mois": 0,
-        "Année": 0,
-        "Valeur Totale": pv,
-        "Capital Investi": pv,
-        "Interets": 0
+    schedule = result.schedule
+    has_fees = "fees" in schedule
+    has_taxes = "taxes" in schedule
+
+    # Données allégées pour les courbes : points retenus sur la valeur
+    # totale (LTTB), premier et dernier mois toujours conservés (valeur
+    # finale exacte). Le capital investi n'est pas linéaire (versements
+    # exceptionnels, retraits, pauses), mais ses ruptures coïncident avec
+    # celles de la valeur totale, que LTTB tend à retenir.
+    idx = lttb_indices(schedule["year"], schedule["value"], CHART_MAX_POINTS)
+
+    df_curve = pd.DataFrame({
+        "Année": schedule["year"][idx],
+        "Valeur Totale": schedule["value"][idx],
+        "Capital Investi": schedule["invested"][idx],
+        "Interets": schedule["interest"][idx],
     })
-
-    for m in range(1, months + 1):
-        value = value * (1 + rate_m) + pmt
-        capital += pmt
-
-        data.append({
-            "Mois": m,
-            "Année": m / 12,
-            "Valeur Totale": value,
-            "Capital Investi": capital,
-            "Interets": value - capital
-        })
-
-    df = pd.DataFrame(data)
+    if has_fees:
+        df_curve["Frais Payés"] = schedule["fees"][idx]
+    if has_taxes:
+        df_curve["Impôts Payés"] = schedule["taxes"][idx]
 
     # =========================================================
     # ==========  I — Courbe d’évolution du portefeuille ======
@@ -60,11 +86,14 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
 
     with st.expander("📈 Évolution du portefeuille (courbe principale)", expanded=True):
 
+        # Les couches partagent un seul jeu de données, limité aux colonnes tracées
+        columns = ["Année", "Valeur Totale", "Capital Investi"] + (["Frais Payés"] if has_fees else [])
+        base = alt.Chart(df_curve[columns]).encode(x=alt.X("Année:Q", title="Horizon (années)"))
+
         curve_val = (
-            alt.Chart(df)
+            base
             .mark_line(strokeWidth=3)
             .encode(
-                x=alt.X("Année:Q", title="Horizon (années)"),
                 y=alt.Y("Valeur Totale:Q", title="Montant (FCFA)"),
                 color=alt.value(PRIMARY_COLOR),
                 tooltip=[
@@ -76,10 +105,9 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
         )
 
         invested_line = (
-            alt.Chart(df)
+            base
             .mark_line(strokeDash=[4, 4], strokeWidth=2)
             .encode(
-                x="Année:Q",
                 y="Capital Investi:Q",
                 color=alt.value(SECONDARY_COLOR),
                 tooltip=[alt.Tooltip("Capital Investi:Q", format=",.0f")],
@@ -88,6 +116,18 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
 
         chart = curve_val + invested_line
 
+        if has_fees:
+            fees_line = (
+                base
+                .mark_line(strokeDash=[2, 2], strokeWidth=2)
+                .encode(
+                    y="Frais Payés:Q",
+                    color=alt.value(ACCENT_COLOR),
+                    tooltip=[alt.Tooltip("Frais Payés:Q", format=",.0f")],
+                )
+            )
+            chart = chart + fees_line
+
         if fv_target is not None and fv_target > 0:
             rule = (
                 alt.Chart(pd.DataFrame({"y": [fv_target]}))
@@ -96,7 +136,7 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
             )
             chart = chart + rule
 
-        st.altair_chart(chart.interactive(), use_container_width=True)
+        _render_chart("evolution", chart.interactive(), use_container_width=True)
 
     # =========================================================
     # =======  II — Histogramme Capital/Intérêts annuel =======
@@ -104,22 +144,15 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
 
     with st.expander("📊 Répartition annuelle : Capital Investi vs Intérêts"):
 
-        df_yearly = df.copy()
-        df_yearly["Année_int"] = df_yearly["Année"].astype(int)
-        df_group = df_yearly.groupby("Année_int").agg({
-            "Capital Investi": "last",
-            "Interets": "last",
-        }).reset_index()
-
-        df_group["Capital Investi Annuel"] = df_group["Capital Investi"].diff().fillna(df_group["Capital Investi"])
-        df_group["Interets Annuel"] = df_group["Interets"].diff().fillna(df_group["Interets"])
-
-        df_bar = df_group.melt(
-            id_vars="Année_int",
-            value_vars=["Capital Investi Annuel", "Interets Annuel"],
-            var_name="Catégorie",
-            value_name="Montant"
-        )
+        yearly = result.yearly
+        n_bars = len(yearly["year"])
+
+        # Format long construit directement depuis les tableaux (pas de melt)
+        df_bar = pd.DataFrame({
+            "Année": np.tile(yearly["year"], 2),
+            "Catégorie": np.repeat(["Capital Investi Annuel", "Interets Annuel"], n_bars),
+            "Montant": np.concatenate([yearly["invested"], yearly["interest"]]),
+        })
 
         color_scale = alt.Scale(
             domain=["Capital Investi Annuel", "Interets Annuel"],
@@ -130,7 +163,7 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
             alt.Chart(df_bar)
             .mark_bar()
             .encode(
-                x=alt.X("Année_int:O", title="Année"),
+                x=alt.X("Année:O", title="Année"),
                 y=alt.Y("Montant:Q", title="Montant (FCFA)"),
                 color=alt.Color("Catégorie:N", scale=color_scale),
                 tooltip=[
@@ -141,7 +174,7 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
             .properties(height=350)
         )
 
-        st.altair_chart(bar, use_container_width=True)
+        _render_chart("repartition_annuelle", bar, use_container_width=True)
 
     # =========================================================
     # === III — Couroles cumulées : Capital vs Intérêts ======
@@ -149,11 +182,14 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
 
     with st.expander("📈 Capital vs Intérêts cumulés"):
 
+        columns = ["Année", "Capital Investi", "Interets"] + [column for column in ("Frais Payés", "Impôts Payés")
+                                                              if column in df_curve]
+        base_cum = alt.Chart(df_curve[columns]).encode(x="Année:Q")
+
         curve_cum_cap = (
-            alt.Chart(df)
+            base_cum
             .mark_line(strokeWidth=3)
             .encode(
-                x="Année:Q",
                 y="Capital Investi:Q",
                 color=alt.value(SECONDARY_COLOR),
                 tooltip=[alt.Tooltip("Capital Investi:Q", format=",.0f")],
@@ -161,17 +197,42 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
         )
 
         curve_cum_int = (
-            alt.Chart(df)
+            base_cum
             .mark_line(strokeWidth=3)
             .encode(
-                x="Année:Q",
                 y="Interets:Q",
                 color=alt.value(PRIMARY_COLOR),
                 tooltip=[alt.Tooltip("Interets:Q", format=",.0f")],
             )
         )
 
-        st.altair_chart((curve_cum_cap + curve_cum_int).interactive(), use_container_width=True)
+        chart_cum = curve_cum_cap + curve_cum_int
+
+        if has_fees:
+            curve_cum_fees = (
+                base_cum
+                .mark_line(strokeWidth=2, strokeDash=[2, 2])
+                .encode(
+                    y="Frais Payés:Q",
+                    color=alt.value(ACCENT_COLOR),
+                    tooltip=[alt.Tooltip("Frais Payés:Q", format=",.0f")],
+                )
+            )
+            chart_cum = chart_cum + curve_cum_fees
+
+        if has_taxes:
+            curve_cum_taxes = (
+                base_cum
+                .mark_line(strokeWidth=2, strokeDash=[6, 3])
+                .encode(
+                    y="Impôts Payés:Q",
+                    color=alt.value(TAX_COLOR),
+                    tooltip=[alt.Tooltip("Impôts Payés:Q", format=",.0f")],
+                )
+            )
+            chart_cum = chart_cum + curve_cum_taxes
+
+        _render_chart("cumuls", chart_cum.interactive(), use_container_width=True)
 
     # =========================================================
     # ===== IV — Distribution du capital (Pie Chart) ==========
@@ -179,9 +240,8 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
 
     with st.expander("🥧 Distribution du capital estimé", expanded=True):
 
-        final = df.iloc[-1]
-        total_invested = final["Capital Investi"]
-        total_interest = final["Interets"]
+        total_invested = schedule["invested"][-1]
+        total_interest = schedule["interest"][-1]
 
         # Données pour le camembert
         pie_df = pd.DataFrame({
@@ -212,7 +272,7 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
             .properties(height=400)
         )
 
-        st.altair_chart(pie_chart, use_container_width=True)
+        _render_chart("distribution", pie_chart, use_container_width=True)
         
         # Afficher les pourcentages
         total = total_invested + total_interest
@@ -224,3 +284,180 @@ def create_simulation_chart(pv, pmt, rate, n_years, fv_target=None):
             st.info(f"**Capital Investi** : {invested_pct:.1f}%")
         with col2:
             st.success(f"**Intérêts Générés** : {interest_pct:.1f}%")
+
+
+def _fv_expression(pv: str, pmt: str, rate: str, months: str) -> str:
+    """
+    Traduit la formule de `calculate_fv` (capitalisation mensuelle,
+    versements en fin de mois) en expression Vega évaluée dans le navigateur.
+    Les arguments sont eux-mêmes des expressions Vega.
+    """
+    rate_m = f"(({rate}) / 100 / 12)"
+    growth = f"pow(1 + {rate_m}, {months})"
+    annuity = f"({rate_m} == 0 ? ({months}) : ({growth} - 1) / {rate_m})"
+    return f"({pv}) * {growth} + ({pmt}) * {annuity}"
+
+
+def create_whatif_chart(pv, pmt, rate, n_years, max_years=MAX_HORIZON):
+    """
+    Projection « et si ? » entièrement calculée côté navigateur.
+
+    Le taux, le versement mensuel et l'horizon sont des paramètres Vega-Lite
+    liés à des curseurs : les déplacer recalcule la courbe dans le navigateur,
+    sans aucun aller-retour avec le serveur Streamlit. Les mois sont générés
+    par une séquence Vega, la spécification ne contient donc aucune donnée.
+    """
+    rate_param = alt.param(
+        name="whatif_rate",
+        value=float(rate),
+        bind=alt.binding_range(min=-5, max=20, step=0.1, name="Rendement annuel (%) "),
+    )
+    pmt_param = alt.param(
+        name="whatif_pmt",
+        value=float(pmt),
+        bind=alt.binding_range(
+            min=0, max=max(4 * float(pmt), 500_000), step=5_000, name="Versement mensuel (FCFA) "
+        ),
+    )
+    horizon_param = alt.param(
+        name="whatif_years",
+        value=int(n_years),
+        bind=alt.binding_range(min=1, max=max_years, step=1, name="Horizon (années) "),
+    )
+
+    base = (
+        alt.Chart(alt.sequence(0, max_years * 12 + 1, as_="Mois"))
+        .transform_filter("datum.Mois <= whatif_years * 12")
+        .transform_calculate(
+            Année="datum.Mois / 12",
+            **{
+                "Valeur Totale": _fv_expression(pv, "whatif_pmt", "whatif_rate", "datum.Mois"),
+                "Capital Investi": f"{pv} + whatif_pmt * datum.Mois",
+            },
+        )
+    )
+
+    curve_val = (
+        base
+        .mark_line(strokeWidth=3)
+        .encode(
+            x=alt.X("Année:Q", title="Horizon (années)"),
+            y=alt.Y("Valeur Totale:Q", title="Montant (FCFA)"),
+            color=alt.value(PRIMARY_COLOR),
+            tooltip=[
+                alt.Tooltip("Année:Q", format=".2f"),
+                alt.Tooltip("Valeur Totale:Q", format=",.0f"),
+                alt.Tooltip("Capital Investi:Q", format=",.0f"),
+            ],
+        )
+        .add_params(rate_param, pmt_param, horizon_param)
+        .properties(height=350)
+    )
+
+    invested_line = (
+        base
+        .mark_line(strokeDash=[4, 4], strokeWidth=2)
+        .encode(x="Année:Q", y="Capital Investi:Q", color=alt.value(SECONDARY_COLOR))
+    )
+
+    # Étiquette de la valeur finale, recalculée elle aussi dans le navigateur
+    final_label = (
+        base
+        .transform_filter("datum.Mois == whatif_years * 12")
+        .transform_calculate(label="'Valeur finale : ' + format(datum['Valeur Totale'], ',.0f') + ' FCFA'")
+        .mark_text(align="right", dx=-5, dy=-12, fontSize=14, fontWeight="bold", color=PRIMARY_COLOR)
+        .encode(x="Année:Q", y="Valeur Totale:Q", text="label:N")
+    )
+
+    return curve_val + invested_line + final_label
+
+
+def create_sensitivity_heatmap(x, y, z, current_x, current_y, x_title, y_title, z_title):
+    """
+    Carte de chaleur d'une grille de sensibilité, avec le point actuel du client.
+
+    Args:
+        x: Valeurs de l'axe horizontal (colonnes de z)
+        y: Valeurs de l'axe vertical (lignes de z)
+        z: Matrice des résultats, de forme (len(y), len(x))
+        current_x, current_y: Coordonnées du point actuel à mettre en évidence
+        x_title, y_title, z_title: Libellés des axes et de l'échelle de couleur
+
+    Returns:
+        go.Figure: Figure Plotly prête pour `st.plotly_chart`
+    """
+    fig = go.Figure()
+
+    fig.add_trace(go.Heatmap(
+        x=x,
+        y=y,
+        z=z,
+        colorscale=[[0, ACCENT_COLOR], [0.5, SECONDARY_COLOR], [1, PRIMARY_COLOR]],
+        colorbar=dict(title=z_title, tickformat=",.0f"),
+        hovertemplate=(
+            f"{x_title} : %{{x:.2f}}<br>{y_title} : %{{y:,.2f}}<br>"
+            f"{z_title} : %{{z:,.0f}}<extra></extra>"
+        ),
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[current_x],
+        y=[current_y],
+        mode="markers+text",
+        marker=dict(color="red", size=12, symbol="x", line=dict(width=2, color="white")),
+        text=["Situation actuelle"],
+        textposition="top center",
+        textfont=dict(color="red"),
+        hoverinfo="skip",
+        showlegend=False,
+    ))
+
+    fig.update_layout(
+        height=450,
+        margin=dict(l=10, r=10, t=30, b=10),
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+    )
+    return fig
+
+
+def create_fan_chart(month, bands: dict, title: str, reference=None, height=350):
+    """
+    Éventail des trajectoires simulées : médiane et intervalles 25-75 % et 5-95 %.
+
+    Args:
+        month: Mois 0 .. n
+        bands: {p: capital au p-ième percentile, mois par mois} pour
+            p dans (5, 25, 50, 75, 95) (voir `core.stochastic.path_percentiles`)
+        title: Titre du graphique
+        reference: Projection déterministe optionnelle (même grille de mois),
+            tracée en pointillés
+    """
+    df_fan = pd.DataFrame({
+        "Année": np.asarray(month) / 12,
+        "P5": bands[5], "P25": bands[25], "Médiane": bands[50], "P75": bands[75], "P95": bands[95],
+    })
+    base = alt.Chart(df_fan).encode(x=alt.X("Année:Q", title="Années"))
+    chart = (
+        base.mark_area(opacity=0.2, color=PRIMARY_COLOR).encode(
+            y=alt.Y("P5:Q", title="Capital (FCFA)"), y2="P95:Q"
+        )
+        + base.mark_area(opacity=0.35, color=PRIMARY_COLOR).encode(y="P25:Q", y2="P75:Q")
+        + base.mark_line(strokeWidth=3, color=SECONDARY_COLOR).encode(
+            y="Médiane:Q",
+            tooltip=[
+                alt.Tooltip("Année:Q", format=".1f"),
+                alt.Tooltip("P5:Q", format=",.0f"),
+                alt.Tooltip("Médiane:Q", format=",.0f"),
+                alt.Tooltip("P95:Q", format=",.0f"),
+            ]
+        )
+    )
+    if reference is not None:
+        df_reference = pd.DataFrame({"Année": np.asarray(month) / 12, "Taux constant": reference})
+        chart += alt.Chart(df_reference).mark_line(strokeDash=[6, 4], color=ACCENT_COLOR, strokeWidth=2).encode(
+            x="Année:Q",
+            y="Taux constant:Q",
+            tooltip=[alt.Tooltip("Année:Q", format=".1f"), alt.Tooltip("Taux constant:Q", format=",.0f")],
+        )
+    return chart.properties(height=height, title=title)
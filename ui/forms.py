@@ -1,14 +1,22 @@
 # ui/forms.py
 # ---------------------------------------------------------
 # Gère toute la logique d'affichage des formulaires utilisateur :
-# - choix du paramètre à calculer
+# - choix du paramètre à calculer (un changement de mode réaffiche la
+#   dernière simulation sans nouveau calcul)
 # - saisie des valeurs (pv, fv, pmt, rate, n_years)
+# - fréquences de versement et de capitalisation
+# - structure de frais (droits d'entrée, gestion, performance)
+# - fiscalité du pays du client (UEMOA)
+# - versements exceptionnels et pauses des versements (retraits
+#   supérieurs à l'encours signalés)
+# - probabilité visée pour le versement (rendements aléatoires)
 #
 # Retourne :
 #   inputs : dict propre contenant toutes les valeurs saisies
 #   calculation_mode : str ("Montant Final", etc.)
 # ---------------------------------------------------------
 
+import pandas as pd
 import streamlit as st
 from core.config import (
     PRIMARY_COLOR,
@@ -16,8 +24,31 @@ from core.config import (
     DEFAULT_MONTHLY_PAYMENT,
     DEFAULT_TARGET_AMOUNT,
     DEFAULT_ANNUAL_RATE,
-    DEFAULT_HORIZON_YEARS
+    DEFAULT_HORIZON_YEARS,
+    CONTRIBUTION_FREQUENCIES,
+    COMPOUNDING_FREQUENCIES,
+    FEE_STRUCTURES,
+    UEMOA_COUNTRIES,
+    DEFAULT_INCOME_SHARE,
+    DEFAULT_VOLATILITY,
+    DEFAULT_TARGET_PROBABILITY,
+    MONTH_NAMES,
+    MAX_HORIZON,
+    CALCULATION_MODES
 )
+from core.calculations import CalculationError
+from core.results import SimulationResult
+from core.taxes import country_taxes
+from core.events import annual_events, check_withdrawals, merge_events
+
+# Clés des saisies du quadruplet (fv, pv, pmt, horizon) et valeurs par défaut
+FORM_KEYS = {"fv": "form_fv", "pv": "form_pv", "pmt": "form_pmt", "n_years": "form_n_years"}
+FORM_DEFAULTS = {
+    "form_fv": DEFAULT_TARGET_AMOUNT,
+    "form_pv": DEFAULT_INITIAL_CAPITAL,
+    "form_pmt": DEFAULT_MONTHLY_PAYMENT,
+    "form_n_years": float(DEFAULT_HORIZON_YEARS),
+}
 
 
 def parameter_form():
@@ -38,25 +69,54 @@ def parameter_form():
     )
 
     # -------- MODE DE CALCUL --------
+    # Changer de mode ne relance aucun calcul : le quadruplet de la dernière
+    # simulation est reporté dans les saisies puis réaffiché (voir _switch_mode)
     calculation_mode = st.radio(
         "Quel paramètre souhaitez-vous déterminer ?",
-        ("Montant Final", "Versement Mensuel", "Montant Initial", "Horizon de Placement"),
-        horizontal=True
+        list(CALCULATION_MODES),
+        horizontal=True,
+        key="calculation_mode",
+        on_change=_switch_mode,
     )
 
     st.markdown("---")
 
     inputs = {}
 
+    # -------- FRÉQUENCES --------
+    col1, col2 = st.columns(2)
+    with col1:
+        contribution_label = st.selectbox(
+            "Fréquence des versements",
+            list(CONTRIBUTION_FREQUENCIES),
+            index=0,
+            key="contribution_frequency",
+        )
+    with col2:
+        compounding_label = st.selectbox(
+            "Capitalisation des intérêts",
+            list(COMPOUNDING_FREQUENCIES),
+            index=0,
+            key="compounding_frequency",
+        )
+    inputs["contribution_frequency"] = CONTRIBUTION_FREQUENCIES[contribution_label]
+    inputs["compounding_frequency"] = COMPOUNDING_FREQUENCIES[compounding_label]
+
     # -------- SAISIES --------
 
+    # Valeurs initiales posées via session_state (et non `value=`) afin que
+    # le changement de mode puisse y reporter les valeurs calculées
+    for key, default in FORM_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = default
+
     # FV
     if calculation_mode != "Montant Final":
         inputs["fv"] = st.number_input(
             "Montant Final (Objectif en FCFA)",
-            value=DEFAULT_TARGET_AMOUNT,
             step=100_000,
             format="%d",
+            key="form_fv",
         )
     else:
         inputs["fv"] = 0
@@ -65,9 +125,9 @@ def parameter_form():
     if calculation_mode != "Montant Initial":
         inputs["pv"] = st.number_input(
             "Montant Initial (Capital de départ)",
-            value=DEFAULT_INITIAL_CAPITAL,
             step=10_000,
             format="%d",
+            key="form_pv",
         )
     else:
         inputs["pv"] = 0
@@ -75,10 +135,10 @@ def parameter_form():
     # PMT
     if calculation_mode != "Versement Mensuel":
         inputs["pmt"] = st.number_input(
-            "Versement Mensuel (Contribution régulière)",
-            value=DEFAULT_MONTHLY_PAYMENT,
+            f"Versement {contribution_label} (Contribution régulière)",
             step=5_000,
             format="%d",
+            key="form_pmt",
         )
     else:
         inputs["pmt"] = 0
@@ -96,14 +156,218 @@ def parameter_form():
     if calculation_mode != "Horizon de Placement":
         inputs["n_years"] = st.number_input(
             "Horizon de Placement (en années)",
-            min_value=1,
-            value=DEFAULT_HORIZON_YEARS,
-            step=1,
-            format="%d",
+            min_value=1.0,
+            step=1.0,
+            format="%.2f",
+            key="form_n_years",
         )
     else:
         inputs["n_years"] = 0
 
+    # -------- PROBABILITÉ D'ATTEINDRE L'OBJECTIF --------
+    inputs["target_probability"] = probability_form() if calculation_mode == "Versement Mensuel" else None
+
+    # -------- VERSEMENTS EXCEPTIONNELS --------
+    inputs["events"], inputs["pauses"] = events_form(contribution_label)
+
+    # -------- FRAIS --------
+    inputs["fees"] = fee_form()
+
+    # -------- FISCALITÉ --------
+    inputs["tax_country"] = st.session_state.get("country", UEMOA_COUNTRIES[0])
+    inputs["taxes"] = tax_form(inputs["tax_country"])
+
+    # -------- CONTRÔLE DES RETRAITS --------
+    # Montant initial et versement connus : un retrait supérieur à l'encours
+    # est signalé dès la saisie (dans les autres modes, le calcul le rejette)
+    if calculation_mode in ("Montant Final", "Horizon de Placement"):
+        try:
+            check_withdrawals(
+                inputs["pv"], inputs["pmt"], inputs["rate"], inputs["n_years"] or MAX_HORIZON,
+                inputs["events"], inputs["pauses"], inputs["taxes"], inputs["fees"],
+                inputs["contribution_frequency"], inputs["compounding_frequency"],
+            )
+        except CalculationError as e:
+            st.error(f"❌ {e}")
+
     st.markdown("---")
 
     return inputs, calculation_mode
+
+
+def events_form(contribution_label: str) -> tuple:
+    """
+    Saisie des flux irréguliers : prime annuelle, versements ou retraits
+    ponctuels et pause des versements réguliers.
+    Retourne (events, pauses) au format de core/events.
+    """
+    with st.expander("📅 Versements exceptionnels et pauses", expanded=False):
+        st.caption(
+            "Mois comptés depuis le début du plan (mois 1 = fin du premier mois, plan démarré en janvier). "
+            "Un montant négatif correspond à un retrait."
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            bonus = st.number_input(
+                "Prime annuelle (FCFA)",
+                min_value=0, value=0, step=50_000, format="%d",
+                key="annual_bonus",
+            )
+        with col2:
+            bonus_month = st.selectbox("Mois de la prime", MONTH_NAMES, index=11, key="annual_bonus_month")
+
+        lump_sums = st.data_editor(
+            pd.DataFrame({"Mois": pd.Series(dtype="int"), "Montant (FCFA)": pd.Series(dtype="float")}),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="lump_sums",
+            column_config={
+                "Mois": st.column_config.NumberColumn(min_value=1, max_value=1200, step=1),
+                "Montant (FCFA)": st.column_config.NumberColumn(step=10_000, format="%d"),
+            },
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            pause_start = st.number_input(
+                f"Pause du versement {contribution_label.lower()} : premier mois",
+                min_value=0, value=0, step=1,
+                help="0 : aucune pause",
+                key="pause_start",
+            )
+        with col2:
+            pause_length = st.number_input(
+                "Durée de la pause (mois)",
+                min_value=0, value=0, step=1,
+                key="pause_length",
+            )
+
+    lump_sums = lump_sums.dropna()
+    events = merge_events(
+        annual_events(bonus, MONTH_NAMES.index(bonus_month) + 1) if bonus > 0 else {},
+        dict(zip(lump_sums["Mois"].astype(int), lump_sums["Montant (FCFA)"].astype(float))),
+    )
+    pauses = [(pause_start, pause_length)] if pause_start > 0 and pause_length > 0 else []
+    return events, pauses
+
+
+def _switch_mode():
+    """
+    Rappel du choix du mode de calcul : si la dernière simulation forme un
+    quadruplet cohérent (fv, pv, pmt, horizon), ses valeurs sont reportées
+    dans les saisies et les résultats sont réaffichés sans nouveau calcul.
+    """
+    result = st.session_state.get("simulation_results")
+    if (not isinstance(result, SimulationResult) or result.target_probability
+            or not result.is_consistent or result.n_years < 1):
+        return
+    for field, key in FORM_KEYS.items():
+        value = getattr(result, field)
+        st.session_state[key] = float(value) if field == "n_years" else int(round(value))
+    st.session_state.show_results = True
+
+
+def probability_form():
+    """
+    Option du mode « Versement Mensuel » : versement qui atteint l'objectif
+    avec une probabilité donnée, les rendements étant aléatoires.
+    Retourne {"probability", "volatility"} (en %) ou None.
+    """
+    with st.expander("🎲 Objectif atteint avec une probabilité donnée", expanded=False):
+        enabled = st.checkbox(
+            "Calculer le versement qui atteint l'objectif avec une probabilité donnée",
+            value=False,
+            key="use_target_probability",
+            help="Le versement classique suppose un rendement constant : il n'atteint l'objectif "
+                 "qu'environ une fois sur deux lorsque les rendements fluctuent.",
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            probability = st.slider(
+                "Probabilité visée (%)",
+                min_value=50.0, max_value=99.0, value=DEFAULT_TARGET_PROBABILITY, step=1.0,
+                disabled=not enabled, key="target_probability",
+            )
+        with col2:
+            volatility = st.slider(
+                "Volatilité annuelle (%)",
+                min_value=0.0, max_value=30.0, value=DEFAULT_VOLATILITY, step=0.5,
+                disabled=not enabled, key="target_volatility",
+            )
+
+    return {"probability": probability, "volatility": volatility} if enabled else None
+
+
+def fee_form() -> dict:
+    """
+    Saisie de la structure de frais (modèle prédéfini ou personnalisé).
+    Retourne un dict {"entry_fee", "management_fee", "performance_fee", "hurdle_rate"} en %.
+    """
+    with st.expander("💸 Frais du placement", expanded=False):
+        structure = st.selectbox(
+            "Structure de frais",
+            list(FEE_STRUCTURES) + ["Personnalisée"],
+            index=0,
+            key="fee_structure",
+        )
+        preset = FEE_STRUCTURES.get(structure, FEE_STRUCTURES["Sans frais"])
+        custom = structure == "Personnalisée"
+
+        # La clé dépend du modèle : changer de modèle réinitialise les valeurs affichées
+        col1, col2 = st.columns(2)
+        with col1:
+            entry_fee = st.number_input(
+                "Droits d'entrée (% de chaque versement)",
+                min_value=0.0, max_value=10.0, value=preset["entry_fee"], step=0.25,
+                disabled=not custom, key=f"entry_fee_{structure}",
+            )
+            performance_fee = st.number_input(
+                "Commission de performance (%)",
+                min_value=0.0, max_value=50.0, value=preset["performance_fee"], step=1.0,
+                disabled=not custom, key=f"performance_fee_{structure}",
+            )
+        with col2:
+            management_fee = st.number_input(
+                "Frais de gestion annuels (%)",
+                min_value=0.0, max_value=5.0, value=preset["management_fee"], step=0.1,
+                disabled=not custom, key=f"management_fee_{structure}",
+            )
+            hurdle_rate = st.number_input(
+                "Taux plancher de la performance (%)",
+                min_value=0.0, max_value=20.0, value=preset["hurdle_rate"], step=0.5,
+                disabled=not custom, key=f"hurdle_rate_{structure}",
+            )
+
+    return {
+        "entry_fee": entry_fee,
+        "management_fee": management_fee,
+        "performance_fee": performance_fee,
+        "hurdle_rate": hurdle_rate,
+    }
+
+
+def tax_form(country: str):
+    """
+    Application optionnelle de la fiscalité du pays choisi dans la barre latérale.
+    Retourne les règles fiscales (voir core/taxes.country_taxes) ou None.
+    """
+    with st.expander(f"🏛️ Fiscalité ({country})", expanded=False):
+        apply_taxes = st.checkbox(
+            "Calculer les résultats après impôts",
+            value=False,
+            key="apply_taxes",
+        )
+        income_share = st.slider(
+            "Part du rendement perçue en revenus courants (%)",
+            min_value=0.0, max_value=100.0, value=DEFAULT_INCOME_SHARE, step=5.0,
+            disabled=not apply_taxes, key="income_share",
+            help="Intérêts et dividendes, soumis à la retenue à la source ; le reste est une plus-value imposée à la sortie.",
+        )
+        taxes = country_taxes(country, income_share)
+        st.caption(
+            f"Retenue à la source : {taxes['withholding']:.1f} % · "
+            f"Plus-values : {taxes['capital_gains']:.1f} % (taux indicatifs)"
+        )
+
+    return taxes if apply_taxes else None
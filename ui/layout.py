@@ -6,20 +6,98 @@
 # Utilise la palette provenant de `core/config.py`
 
 import math
+from functools import partial
+
 import streamlit as st
-from datetime import datetime
+import pandas as pd
+from datetime import datetime, date
 
-from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR
-from core.calculations import calculate_fv, calculate_pmt, calculate_pv, calculate_n_years
+from core.config import PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR, CONTRIBUTION_FREQUENCIES, CALCULATION_MODES
+from core.calculations import equivalent_contribution
+from core.fees import (
+    calculate_fv_with_fees,
+    calculate_pmt_with_fees,
+    calculate_pv_with_fees,
+    calculate_n_years_with_fees,
+    net_force_of_interest,
+    solve_all_with_fees,
+)
+from core.taxes import (
+    calculate_fv_after_tax,
+    calculate_pmt_after_tax,
+    calculate_pv_after_tax,
+    calculate_n_years_after_tax,
+)
+from core.events import (
+    calculate_fv_with_events,
+    calculate_pmt_with_events,
+    calculate_pv_with_events,
+    calculate_n_years_with_events,
+)
+from core.results import SimulationResult
+from core.xirr import plan_xirr, xirr, year_fractions
+from core.stochastic import calculate_pmt_probability, probability_of_target
 from core.utils import fmt_money
 from ui.charts import create_simulation_chart
 from core.export import create_pdf_report, send_email_with_attachment
 
 
+def _solvers(fees: dict, taxes: dict, frequencies: tuple, events: dict = None, pauses=None) -> tuple:
+    """
+    Solveurs (FV, PMT, PV, horizon) nets de frais et, si `taxes` est
+    fourni, d'impôts, avec les flux irréguliers éventuels ; les
+    fréquences sont déjà appliquées.
+    """
+    options = {"fees": fees, "contribution_frequency": frequencies[0], "compounding_frequency": frequencies[1]}
+    if events or pauses:
+        solvers = (calculate_fv_with_events, calculate_pmt_with_events, calculate_pv_with_events, calculate_n_years_with_events)
+        options.update(taxes=taxes, events=events, pauses=pauses)
+    elif taxes:
+        solvers = (calculate_fv_after_tax, calculate_pmt_after_tax, calculate_pv_after_tax, calculate_n_years_after_tax)
+        options["taxes"] = taxes
+    else:
+        solvers = (calculate_fv_with_fees, calculate_pmt_with_fees, calculate_pv_with_fees, calculate_n_years_with_fees)
+    return tuple(partial(solver, **options) for solver in solvers)
+
+
+def _stochastic_terms(rate, fees: dict, compounding_frequency) -> tuple:
+    """
+    (part investie après droits d'entrée, rendement annuel en % au sens de
+    core/stochastic : facteur mensuel moyen 1 + r/1200) nets de frais.
+    """
+    kept = 1 - fees.get("entry_fee", 0.0) / 100
+    return kept, 1200 * math.expm1(float(net_force_of_interest(rate, fees, compounding_frequency)) / 12)
+
+
+def _result_text(calculation_mode: str, calculated_value: float, period_label: str) -> str:
+    """Phrase de résultat (markdown) du paramètre calculé."""
+    if calculation_mode == "Montant Final":
+        return f"Montant Final calculé : **{fmt_money(calculated_value)}**"
+    if calculation_mode == "Versement Mensuel":
+        return f"Versement {period_label} calculé : **{fmt_money(calculated_value)}**"
+    if calculation_mode == "Montant Initial":
+        return f"Montant Initial calculé : **{fmt_money(calculated_value)}**"
+
+    if not math.isfinite(calculated_value):
+        return "⚠️ **Impossible d'atteindre l'objectif** avec ces paramètres (horizon infini requis)"
+    if calculated_value <= 0:
+        return "✅ **L'objectif est déjà atteint** avec le montant initial actuel (aucun horizon nécessaire)"
+    # Arrondi au dixième de mois avant le découpage (évite « 13 ans et 12.0 mois »)
+    years, months = divmod(round(calculated_value * 12, 1), 12)
+    return f"Horizon de Placement calculé : **{int(years)} ans et {months:.1f} mois** ({calculated_value:.2f} années)"
+
+
 def display_results(inputs: dict, calculation_mode: str):
     """
     Affiche le bloc principal des résultats et appelle le graphique.
     `inputs` : dict contenant les valeurs 'pv', 'pmt', 'fv', 'rate', 'n_years'
+               et, optionnellement, 'contribution_frequency' / 'compounding_frequency'
+               (versements et capitalisation par an, mensuels par défaut)
+               et 'fees' (structure de frais, voir core/fees),
+               'taxes' (règles fiscales du pays, voir core/taxes) et 'tax_country',
+               'events' / 'pauses' (flux irréguliers, voir core/events),
+               'target_probability' ({"probability", "volatility"} en %, mode
+               Versement Mensuel : versement qui atteint l'objectif avec cette probabilité)
     `calculation_mode` : texte (Montant Final, PV, PMT, Horizon)
     """
 
@@ -30,61 +108,93 @@ def display_results(inputs: dict, calculation_mode: str):
     rate = inputs.get("rate", 0)
     n_years = inputs.get("n_years", 0)
 
+    contribution_frequency = inputs.get("contribution_frequency", 12)
+    compounding_frequency = inputs.get("compounding_frequency", 12)
+    frequencies = (contribution_frequency, compounding_frequency)
+    fees = inputs.get("fees") or {}
+    has_fees = any(value > 0 for value in fees.values())
+    taxes = inputs.get("taxes")
+    events = inputs.get("events") or {}
+    pauses = inputs.get("pauses") or []
+    target_probability = inputs.get("target_probability")
+    probability_note = None
+    period_label = {v: k for k, v in CONTRIBUTION_FREQUENCIES.items()}.get(contribution_frequency, "Périodique")
+
     # -------- CALCUL DU PARAMÈTRE MANQUANT --------
-    calculated_value = None
+    # Le quadruplet (fv, pv, pmt, horizon) est résolu en une seule évaluation ;
+    # après un simple changement de mode, celui de la simulation précédente
+    # est réaffiché tel quel, sans nouveau calcul
+    if calculation_mode not in CALCULATION_MODES:
+        st.error("Mode de calcul non reconnu")
+        return
+    solved_field = CALCULATION_MODES[calculation_mode]
+    previous = st.session_state.get("simulation_results")
+    reuse = isinstance(previous, SimulationResult) and previous.matches_inputs(inputs, calculation_mode)
     
     try:
-        if calculation_mode == "Montant Final":
-            calculated_value = calculate_fv(pv, pmt, rate, n_years)
-            fv = calculated_value
-            result_text = f"Montant Final calculé : **{fmt_money(calculated_value)}**"
-            
-        elif calculation_mode == "Versement Mensuel":
-            calculated_value = calculate_pmt(fv, pv, rate, n_years)
-            pmt = calculated_value
-            result_text = f"Versement Mensuel calculé : **{fmt_money(calculated_value)}**"
-            
-            # Afficher aussi les équivalents trimestriels et annuels
-            pmt_quarterly = calculated_value * 3
-            pmt_yearly = calculated_value * 12
-            result_text += f"\n\n*Équivalents :*\n- Par trimestre : {fmt_money(pmt_quarterly)}\n- Par an : {fmt_money(pmt_yearly)}"
-            
-        elif calculation_mode == "Montant Initial":
-            calculated_value = calculate_pv(fv, pmt, rate, n_years)
-            pv = calculated_value
-            result_text = f"Montant Initial calculé : **{fmt_money(calculated_value)}**"
-            
-        elif calculation_mode == "Horizon de Placement":
-            calculated_value = calculate_n_years(fv, pv, pmt, rate)
-            n_years = calculated_value
-            
-            if not math.isfinite(calculated_value):
-                result_text = "⚠️ **Impossible d'atteindre l'objectif** avec ces paramètres (horizon infini requis)"
-            elif calculated_value <= 0:
-                result_text = "✅ **L'objectif est déjà atteint** avec le montant initial actuel (aucun horizon nécessaire)"
+        if reuse:
+            pv, pmt, fv, n_years = previous.pv, previous.pmt, previous.fv, previous.n_years
+        elif taxes or events or pauses:
+            solve_fv, solve_pmt, solve_pv, solve_n_years = _solvers(fees, taxes, frequencies, events, pauses)
+            if solved_field == "fv":
+                fv = float(solve_fv(pv, pmt, rate, n_years))
+            elif solved_field == "pmt":
+                pmt = float(solve_pmt(fv, pv, rate, n_years))
+            elif solved_field == "pv":
+                pv = float(solve_pv(fv, pmt, rate, n_years))
             else:
-                years = int(calculated_value)
-                months = int((calculated_value - years) * 12)
-                result_text = f"Horizon de Placement calculé : **{years} ans et {months} mois** ({calculated_value:.2f} années)"
-        
+                n_years = float(solve_n_years(fv, pv, pmt, rate))
+                if math.isfinite(n_years):
+                    # Valeur acquise à l'horizon trouvé (quadruplet cohérent, voir solve_all)
+                    fv = float(solve_fv(pv, pmt, rate, n_years))
         else:
-            st.error("Mode de calcul non reconnu")
-            return
+            known = {"fv": fv, "pv": pv, "pmt": pmt, "n_years": n_years, solved_field: math.nan}
+            solved = solve_all_with_fees(**known, rate=rate, fees=fees, contribution_frequency=contribution_frequency,
+                                         compounding_frequency=compounding_frequency)
+            pv, pmt, fv, n_years = (float(solved[key]) for key in ("pv", "pmt", "fv", "n_years"))
+        calculated_value = {"fv": fv, "pv": pv, "pmt": pmt, "n_years": n_years}[solved_field]
+        result_text = _result_text(calculation_mode, calculated_value, period_label)
+
+        if solved_field == "pmt" and target_probability and math.isfinite(n_years) and n_years > 0:
+            # Rendements aléatoires : les impôts et flux irréguliers ne sont pas modélisés
+            probability = target_probability["probability"]
+            volatility = target_probability["volatility"]
+            kept, monthly_rate = _stochastic_terms(rate, fees, compounding_frequency)
+            deterministic = calculated_value
+            calculated_value = float(calculate_pmt_probability(
+                fv, pv * kept, monthly_rate, volatility, n_years, probability, contribution_frequency
+            )) / kept
+            pmt = calculated_value
+            success = float(probability_of_target(
+                fv, pv * kept, deterministic * kept, monthly_rate, volatility, n_years, contribution_frequency
+            ))
+            result_text = (
+                f"Versement {period_label} pour atteindre l'objectif avec {probability:.0f} % de probabilité : "
+                f"**{fmt_money(calculated_value)}**"
+            )
+            probability_note = (
+                f"Le versement calculé à rendement constant ({fmt_money(deterministic)}) n'atteint l'objectif "
+                f"que dans {success * 100:.0f} % des cas avec une volatilité de {volatility:.1f} %."
+            )
+            # Montant final déterministe de ce versement (l'objectif reste le repère
+            # du graphique) : totaux, TRI et échéancier décrivent le même placement
+            fv = float(_solvers(fees, taxes, frequencies, events, pauses)[0](pv, pmt, rate, n_years))
 
     except Exception as e:
         st.error(f"Erreur lors du calcul : {str(e)}")
         return
     
-    # Store results in session state for use in other pages
-    st.session_state.simulation_results = {
-        'pv': pv,
-        'pmt': pmt,
-        'fv': fv,
-        'rate': rate,
-        'n_years': n_years,
-        'calculation_mode': calculation_mode,
-        'calculated_value': calculated_value
-    }
+    # Résultat unique partagé par le graphique, le rapport PDF et la page Scénarios
+    if reuse:
+        result = previous.with_mode(calculation_mode)
+    else:
+        result = SimulationResult(
+            pv, pmt, fv, rate, n_years, contribution_frequency, compounding_frequency,
+            fees=fees, taxes=taxes, tax_country=inputs.get("tax_country"), events=events, pauses=pauses,
+            calculation_mode=calculation_mode, calculated_value=calculated_value,
+            target_probability=target_probability,
+        )
+    st.session_state.simulation_results = result
 
     # -------- AFFICHAGE DU RÉSULTAT --------
     st.markdown(
@@ -101,15 +211,26 @@ def display_results(inputs: dict, calculation_mode: str):
 
     # Affichage du résultat calculé dans une boîte mise en évidence
     st.success(result_text)
+    if probability_note:
+        st.info(probability_note)
+        if taxes or events or pauses:
+            st.caption("Le versement probabiliste tient compte des frais mais pas des impôts ni des flux irréguliers.")
 
     st.markdown("---")
 
     # ----------- CARTES ESTHÉTIQUES DES MÉTRIQUES -----------
-    # Calcul des valeurs finales
-    total_capital = fv
-    total_invested = pv + (pmt * n_years * 12)
-    total_interest = total_capital - total_invested
+    # Calcul des valeurs finales (dernier point de l'échéancier partagé)
+    totals = result.totals
+    total_capital = totals["capital"]
+    total_invested = totals["invested"]
+    total_interest = totals["interest"]
+    total_fees, total_taxes = totals["fees"], totals["taxes"]
     
+    # Rendement pondéré par les capitaux (net de frais, d'impôts et des flux irréguliers)
+    net_return = math.nan
+    if math.isfinite(n_years) and n_years > 0:
+        net_return = plan_xirr(pv, pmt, n_years, total_capital, events, pauses, contribution_frequency)
+
     # Calcul des pourcentages
     invested_percent = (total_invested / total_capital * 100) if total_capital > 0 else 0
     interest_percent = (total_interest / total_capital * 100) if total_capital > 0 else 0
@@ -129,17 +250,27 @@ def display_results(inputs: dict, calculation_mode: str):
     with col1:
         _display_metric_card("Montant Initial", fmt_money(pv), "💰", PRIMARY_COLOR)
     with col2:
-        _display_metric_card("Versement Mensuel", fmt_money(pmt), "💳", PRIMARY_COLOR)
+        _display_metric_card(f"Versement {period_label}", fmt_money(pmt), "💳", PRIMARY_COLOR)
     with col3:
         _display_metric_card("Rendement Annuel", f"{rate:.2f} %", "📈", ACCENT_COLOR)
     with col4:
         _display_metric_card("Horizon", f"{n_years} ans", "⏱️", ACCENT_COLOR)
     
-    # Affichage des équivalents du versement mensuel
+    # Équivalents du versement aux autres fréquences (mêmes valeurs acquises sur un an)
     if pmt > 0:
-        pmt_quarterly = pmt * 3
-        pmt_semester = pmt * 6
-        pmt_yearly = pmt * 12
+        equivalents = {
+            label: float(equivalent_contribution(pmt, rate, contribution_frequency, frequency, compounding_frequency))
+            for label, frequency in CONTRIBUTION_FREQUENCIES.items()
+            if frequency != contribution_frequency
+        }
+        equivalents_html = "".join(
+            f"""
+                    <div style="text-align: center;">
+                        <div style="color: #666; font-size: 11px; font-weight: 500;">{label}</div>
+                        <div style="color: {PRIMARY_COLOR}; font-size: 15px; font-weight: 700;">{fmt_money(amount)}</div>
+                    </div>"""
+            for label, amount in equivalents.items()
+        )
         
         st.markdown(
             f"""
@@ -152,21 +283,9 @@ def display_results(inputs: dict, calculation_mode: str):
                 box-shadow: 0 2px 4px rgba(0,0,0,0.08);
             ">
                 <div style="color: {PRIMARY_COLOR}; font-size: 14px; font-weight: 600; margin-bottom: 8px;">
-                    💳 Équivalents du versement mensuel
+                    💳 Équivalents du versement {period_label.lower()}
                 </div>
-                <div style="display: flex; justify-content: space-around; flex-wrap: wrap; gap: 10px;">
-                    <div style="text-align: center;">
-                        <div style="color: #666; font-size: 11px; font-weight: 500;">Trimestriel</div>
-                        <div style="color: {PRIMARY_COLOR}; font-size: 15px; font-weight: 700;">{fmt_money(pmt_quarterly)}</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="color: #666; font-size: 11px; font-weight: 500;">Semestriel</div>
-                        <div style="color: {PRIMARY_COLOR}; font-size: 15px; font-weight: 700;">{fmt_money(pmt_semester)}</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="color: #666; font-size: 11px; font-weight: 500;">Annuel</div>
-                        <div style="color: {PRIMARY_COLOR}; font-size: 15px; font-weight: 700;">{fmt_money(pmt_yearly)}</div>
-                    </div>
+                <div style="display: flex; justify-content: space-around; flex-wrap: wrap; gap: 10px;">{equivalents_html}
                 </div>
             </div>
             """,
@@ -176,13 +295,14 @@ def display_results(inputs: dict, calculation_mode: str):
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Deuxième ligne : Résultats financiers en cartes
-    col1, col2, col3 = st.columns(3)
+    columns = st.columns(3 + bool(has_fees) + bool(taxes))
+    col1, col2, col3 = columns[:3]
     
     with col1:
         _display_result_card(
             "Capital Total",
             fmt_money(total_capital),
-            "",
+            f"Rendement net (TRI) : {net_return:.2f} %" if math.isfinite(net_return) else "",
             PRIMARY_COLOR,
             "💎"
         )
@@ -204,6 +324,26 @@ def display_results(inputs: dict, calculation_mode: str):
             ACCENT_COLOR,
             "✨"
         )
+    
+    if has_fees:
+        with columns[3]:
+            _display_result_card(
+                "Frais Payés",
+                fmt_money(total_fees),
+                f"{(total_fees / total_invested * 100) if total_invested > 0 else 0:.1f}% des sommes versées",
+                SECONDARY_COLOR,
+                "💸"
+            )
+    
+    if taxes:
+        with columns[-1]:
+            _display_result_card(
+                "Impôts Payés",
+                fmt_money(total_taxes),
+                f"Fiscalité : {inputs.get('tax_country', '')}",
+                SECONDARY_COLOR,
+                "🏛️"
+            )
 
     st.markdown("---")
 
@@ -216,13 +356,7 @@ def display_results(inputs: dict, calculation_mode: str):
     )
 
     # Graphique principal
-    create_simulation_chart(
-        pv=pv,
-        pmt=pmt,
-        rate=rate,
-        n_years=n_years,
-        fv_target=inputs.get("fv")
-    )
+    create_simulation_chart(result, fv_target=inputs.get("fv"))
 
     st.markdown("---")
     
@@ -234,15 +368,6 @@ def display_results(inputs: dict, calculation_mode: str):
         unsafe_allow_html=True
     )
     
-    # Préparer les données pour l'export
-    updated_inputs = {
-        'pv': pv,
-        'pmt': pmt,
-        'fv': fv,
-        'rate': rate,
-        'n_years': n_years
-    }
-    
     # Récupérer les informations commerciales depuis session_state
     commercial_info = {
         'date': datetime.now().strftime("%d/%m/%Y"),
@@ -259,7 +384,7 @@ def display_results(inputs: dict, calculation_mode: str):
         
         # Générer le PDF
         try:
-            pdf_buffer = create_pdf_report(updated_inputs, calculation_mode, commercial_info)
+            pdf_buffer = create_pdf_report(result, calculation_mode, commercial_info)
             
             st.download_button(
                 label="📥 Télécharger le rapport PDF",
@@ -312,15 +437,17 @@ def display_results(inputs: dict, calculation_mode: str):
                     else:
                         summary = f"""Résumé de la simulation:
 - Montant Initial: {fmt_money(pv)}
-- Versement Mensuel: {fmt_money(pmt)}
+- Versement {period_label}: {fmt_money(pmt)}
 - Rendement Annuel: {rate:.2f}%
 - Horizon: {n_years:.1f} ans
 - Capital Total Attendu: {fmt_money(total_capital)}
-- Intérêts Générés: {fmt_money(total_interest)}"""
+- Intérêts Générés: {fmt_money(total_interest)}
+- Frais Payés: {fmt_money(total_fees)}
+- Impôts Payés: {fmt_money(total_taxes)}"""
                     
                     # Générer le PDF
                     try:
-                        pdf_buffer = create_pdf_report(updated_inputs, calculation_mode, commercial_info)
+                        pdf_buffer = create_pdf_report(result, calculation_mode, commercial_info)
                         
                         # Envoyer l'email
                         with st.spinner("📤 Envoi en cours..."):
@@ -342,6 +469,66 @@ def display_results(inputs: dict, calculation_mode: str):
 
 
 
+@st.fragment
+def display_account_return():
+    """
+    Rendement réel (TRI) d'un compte existant à partir de son historique :
+    versements, retraits et valeur actuelle. Fragment : la saisie ne relance
+    pas la simulation affichée au-dessus.
+    """
+    with st.expander("📈 Rendement réel d'un compte existant (TRI)", expanded=False):
+        st.markdown(
+            "Saisissez les versements et retraits du client puis la valeur actuelle du compte : "
+            "le taux de rendement interne (TRI) est le rendement annuel constant qui, appliqué à "
+            "ces flux, donne la valeur actuelle. Il tient compte des dates et des montants de chaque flux."
+        )
+        history = st.data_editor(
+            pd.DataFrame({
+                "Date": pd.Series(dtype="datetime64[ns]"),
+                "Versement (FCFA)": pd.Series(dtype="float"),
+                "Retrait (FCFA)": pd.Series(dtype="float"),
+            }),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="account_history",
+            column_config={
+                "Date": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                "Versement (FCFA)": st.column_config.NumberColumn(min_value=0, step=10_000, format="%d"),
+                "Retrait (FCFA)": st.column_config.NumberColumn(min_value=0, step=10_000, format="%d"),
+            },
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            current_value = st.number_input(
+                "Valeur actuelle du compte (FCFA)", min_value=0, value=0, step=10_000, format="%d",
+                key="account_current_value",
+            )
+        with col2:
+            valuation_date = st.date_input("Date d'évaluation", value=date.today(), key="account_valuation_date")
+
+        history = history.dropna(subset=["Date"])
+        if history.empty or current_value <= 0:
+            st.caption("Renseignez au moins un versement et la valeur actuelle.")
+            return
+
+        # Convention du TRI : versements négatifs, retraits et valeur actuelle positifs
+        amounts = (history["Retrait (FCFA)"].fillna(0) - history["Versement (FCFA)"].fillna(0)).tolist()
+        dates = history["Date"].tolist()
+        times = year_fractions(dates + [valuation_date])
+        account_return = float(xirr(amounts + [current_value], times))
+
+        contributions = history["Versement (FCFA)"].fillna(0).sum()
+        withdrawals = history["Retrait (FCFA)"].fillna(0).sum()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Sommes versées", fmt_money(contributions))
+        col2.metric("Retraits + valeur actuelle", fmt_money(withdrawals + current_value))
+        if math.isfinite(account_return):
+            col3.metric("Rendement annuel (TRI)", f"{account_return:.2f} %")
+        else:
+            col3.metric("Rendement annuel (TRI)", "—")
+            st.warning("⚠️ TRI indéterminé : vérifiez les dates et les montants (au moins un versement et une valeur positive).")
+
+
 def _display_metric_card(label: str, value: str, icon: str, color: str):
     """
     Affiche une petite carte de métrique avec icône.